@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-element tag dispatch in the validators: string operations versus
+the precomputed tables in validation/tags.py.
+
+Usage:
+    python benchmark_validation.py [--shapes 20000] [--repeat 5]
+
+Builds a slide-like tree in memory, then times each dispatch loop over all of
+its elements and reports the best time per element.
+"""
+
+import argparse
+import time
+
+import lxml.etree
+
+from validation import BaseSchemaValidator, tags
+
+P_NS = tags.PRESENTATIONML_NAMESPACE
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R_NS = tags.OFFICE_RELATIONSHIPS_NAMESPACE
+EXT_NS = "http://schemas.microsoft.com/office/drawing/2014/main"
+
+UNIQUE_ID_REQUIREMENTS = BaseSchemaValidator.UNIQUE_ID_REQUIREMENTS
+OOXML_NAMESPACES = BaseSchemaValidator.OOXML_NAMESPACES
+
+
+def build_tree(shapes):
+    """Return the elements of a slide with the given number of shapes."""
+    nsmap = {"p": P_NS, "a": A_NS, "r": R_NS, "a16": EXT_NS}
+    root = lxml.etree.Element(f"{{{P_NS}}}sld", nsmap=nsmap)
+    tree = lxml.etree.SubElement(root, f"{{{P_NS}}}spTree")
+    for i in range(shapes):
+        sp = lxml.etree.SubElement(tree, f"{{{P_NS}}}sp")
+        nv = lxml.etree.SubElement(sp, f"{{{P_NS}}}cNvPr", id=str(i), name=f"Shape {i}")
+        lxml.etree.SubElement(nv, f"{{{A_NS}}}hlinkClick", {f"{{{R_NS}}}id": "rId1"})
+        lxml.etree.SubElement(
+            nv, f"{{{EXT_NS}}}creationId", id="{5E6F7A8B-1C2D-4E3F-9A0B-1C2D3E4F5A6B}"
+        )
+        run = lxml.etree.SubElement(sp, f"{{{A_NS}}}r")
+        lxml.etree.SubElement(run, f"{{{A_NS}}}rPr", lang="en-US", dirty="0")
+        lxml.etree.SubElement(run, f"{{{A_NS}}}t").text = f"Text {i}"
+    return list(root.iter())
+
+
+# The previous implementations, as they were written in the validators
+
+
+def ids_before(elements):
+    for elem in elements:
+        tag = elem.tag.split("}")[-1].lower() if "}" in elem.tag else elem.tag.lower()
+        UNIQUE_ID_REQUIREMENTS.get(tag)
+
+
+def attributes_before(elements):
+    for elem in elements:
+        for attr in elem.attrib:
+            attr.split("}")[-1].lower()
+
+
+def namespaces_before(elements):
+    for elem in elements:
+        tag_str = str(elem.tag)
+        if tag_str.startswith("{"):
+            tag_str.split("}")[0][1:] not in OOXML_NAMESPACES
+
+
+def rids_before(elements):
+    for elem in elements:
+        if elem.get(f"{{{R_NS}}}id"):
+            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+
+
+# The same loops using validation/tags.py
+
+
+def ids_after(elements):
+    lower_local_name = tags.lower_local_name
+    for elem in elements:
+        UNIQUE_ID_REQUIREMENTS.get(lower_local_name(elem.tag))
+
+
+def attributes_after(elements):
+    lower_local_name = tags.lower_local_name
+    for elem in elements:
+        for attr in elem.attrib:
+            lower_local_name(attr)
+
+
+def namespaces_after(elements):
+    namespace_of = tags.namespace_of
+    for elem in elements:
+        ns = namespace_of(elem.tag)
+        ns and ns not in OOXML_NAMESPACES
+
+
+def rids_after(elements):
+    for elem in elements:
+        if elem.get(tags.R_ID):
+            tags.local_name(elem.tag)
+
+
+BENCHMARKS = [
+    ("unique-id dispatch", ids_before, ids_after),
+    ("attribute names", attributes_before, attributes_after),
+    ("namespace filter", namespaces_before, namespaces_after),
+    ("r:id references", rids_before, rids_after),
+]
+
+
+def best_time(loop, elements, repeat):
+    """Return the best time of repeat runs of loop, in ns per element."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loop(elements)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(elements) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark validator tag dispatch")
+    parser.add_argument(
+        "--shapes", type=int, default=20000, help="Shapes in the generated slide"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per loop")
+    args = parser.parse_args()
+
+    elements = build_tree(args.shapes)
+    print(f"Generated slide with {len(elements)} elements")
+    print(f"  {'loop':20} {'before':>10} {'after':>10}")
+    for name, before, after in BENCHMARKS:
+        before_ns = best_time(before, elements, args.repeat)
+        after_ns = best_time(after, elements, args.repeat)
+        print(
+            f"  {name:20} {before_ns:7.0f} ns {after_ns:7.0f} ns"
+            f"  ({before_ns / after_ns:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark XML condensing and pretty-printing: minidom versus the streaming rewriter.
+
+Usage:
+    python benchmark_xml.py [--size-mb 50]
+
+Generates a worksheet-like part of the requested size, then runs each
+operation in a fresh process and reports wall time and peak memory (RSS).
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import defusedxml.minidom
+
+from xml_rewrite import rewrite_xml
+
+SHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+
+def generate_part(path, size_mb):
+    """Write a pretty-printed worksheet part of roughly size_mb megabytes."""
+    target = size_mb * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+        f.write(f'<worksheet xmlns="{SHEET_NS}">\n  <sheetData>\n')
+        row = 1
+        while f.tell() < target:
+            f.write(f'    <row r="{row}">\n')
+            for col in "ABCDEFGHIJ":
+                f.write(
+                    f'      <c r="{col}{row}" t="inlineStr">\n'
+                    f"        <is>\n          <t>Cell {col}{row}</t>\n        </is>\n"
+                    f"      </c>\n"
+                )
+            f.write("    </row>\n")
+            row += 1
+        f.write("  </sheetData>\n</worksheet>\n")
+
+
+def minidom_condense(content):
+    """The previous pack.py implementation."""
+    dom = defusedxml.minidom.parseString(content)
+    for element in dom.getElementsByTagName("*"):
+        if element.tagName.endswith(":t"):
+            continue
+        for child in list(element.childNodes):
+            if (
+                child.nodeType == child.TEXT_NODE
+                and child.nodeValue
+                and child.nodeValue.strip() == ""
+            ) or child.nodeType == child.COMMENT_NODE:
+                element.removeChild(child)
+    return dom.toxml(encoding="UTF-8")
+
+
+def minidom_pretty(content):
+    """The previous unpack.py implementation."""
+    dom = defusedxml.minidom.parseString(content)
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+def run_operation(name, path):
+    """Run one operation in this process, discarding the output."""
+    if name == "minidom-condense":
+        minidom_condense(Path(path).read_bytes())
+    elif name == "minidom-pretty":
+        minidom_pretty(Path(path).read_bytes())
+    else:
+        with open(path, "rb") as src:
+            rewrite_xml(src, io.BytesIO(), pretty=name == "stream-pretty")
+
+
+def measure(name, path):
+    """Return (seconds, peak RSS in MB) for an operation run in a child process."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, __file__, "--run", name, str(path)],
+        cwd=Path(__file__).parent,
+    )
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        raise RuntimeError(f"{name} failed with status {status}")
+    # ru_maxrss is in kilobytes on Linux
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XML part formatting")
+    parser.add_argument(
+        "--size-mb", type=int, default=50, help="Size of the generated part"
+    )
+    parser.add_argument("--run", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_operation(*args.run)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "sheet1.xml"
+        generate_part(path, args.size_mb)
+        print(f"Generated {path.stat().st_size / 1024 / 1024:.1f} MB worksheet part")
+
+        for name in (
+            "stream-condense",
+            "minidom-condense",
+            "stream-pretty",
+            "minidom-pretty",
+        ):
+            elapsed, peak_mb = measure(name, path)
+            print(f"  {name:18} {elapsed:7.2f} s  {peak_mb:8.0f} MB peak RSS")
+
+
+if __name__ == "__main__":
+    main()
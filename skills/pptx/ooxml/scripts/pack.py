@@ -3,29 +3,67 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--jobs N]
 """
 
 import argparse
-import shutil
+import io
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from xml_rewrite import rewrite_xml
+
+CONTENT_TYPES = "[Content_Types].xml"
+XML_SUFFIXES = (".xml", ".rels")
+# Condensed parts held in memory per worker while waiting to be written in order
+PENDING_PER_JOB = 2
+# Formats that are already compressed and are stored as-is
+STORED_SUFFIXES = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".mp3",
+    ".m4a",
+    ".mp4",
+    ".m4v",
+    ".mov",
+    ".wma",
+    ".wmv",
+    ".docx",
+    ".pptx",
+    ".xlsx",
+    ".zip",
+}
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes used to condense XML parts (default: 1)",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +80,14 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, jobs=1):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        jobs: Number of processes used to condense XML parts (default: 1)
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,32 +100,82 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    # Create final Office file as zip archive, condensing XML while it is
+    # streamed so the input directory is never copied or modified
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        files = package_files(input_dir)
+        if jobs > 1:
+            write_files_parallel(zf, input_dir, files, jobs)
+        else:
+            for f in files:
+                write_file(zf, f, f.relative_to(input_dir).as_posix())
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
+def package_files(input_dir):
+    """Return the files to pack in a stable order, [Content_Types].xml first."""
+    files = sorted(
+        (f for f in input_dir.rglob("*") if f.is_file()),
+        key=lambda f: f.relative_to(input_dir).as_posix(),
+    )
+    files.sort(key=lambda f: f.relative_to(input_dir).as_posix() != CONTENT_TYPES)
+    return files
+
+
+def is_xml_part(f):
+    # Match on the name so "_rels/.rels" counts as XML too
+    return f.name.lower().endswith(XML_SUFFIXES)
+
+
+def write_file(zf, f, arcname, condensed=None):
+    """Add one file to the archive; `condensed` is an already condensed XML part."""
+    if is_xml_part(f):
+        # Take the timestamp from the file, as zf.write does, so repacking
+        # the same directory gives the same archive
+        info = zipfile.ZipInfo.from_file(f, arcname)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        if condensed is not None:
+            zf.writestr(info, condensed)
+        else:
+            with open(f, "rb") as src, zf.open(info, "w") as dst:
+                condense_xml(src, dst)
+    elif f.suffix.lower() in STORED_SUFFIXES:
+        # Already compressed; deflating again only costs time
+        zf.write(f, arcname, compress_type=zipfile.ZIP_STORED)
+    else:
+        zf.write(f, arcname)
+
+
+def write_files_parallel(zf, input_dir, files, jobs):
+    """Condense XML parts in a process pool, writing entries in `files` order.
+
+    At most PENDING_PER_JOB parts per worker are queued or held in memory at
+    once; the archive waits on the oldest part before more are submitted.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for f in files:
+            future = pool.submit(condense_file, f) if is_xml_part(f) else None
+            pending.append((f, future))
+            while len(pending) > jobs * PENDING_PER_JOB:
+                write_pending(zf, input_dir, *pending.popleft())
+        while pending:
+            write_pending(zf, input_dir, *pending.popleft())
+
+
+def write_pending(zf, input_dir, f, future):
+    condensed = future.result() if future is not None else None
+    write_file(zf, f, f.relative_to(input_dir).as_posix(), condensed)
+
+
 def validate_document(doc_path):
     """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
@@ -130,29 +219,17 @@ def validate_document(doc_path):
             return False
 
 
-def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+def condense_xml(src, dst):
+    """Strip unnecessary whitespace and remove comments, streaming src to dst."""
+    rewrite_xml(src, dst)
+
+
+def condense_file(path):
+    """Return the condensed contents of an XML file (run in pool workers)."""
+    dst = io.BytesIO()
+    with open(path, "rb") as src:
+        condense_xml(src, dst)
+    return dst.getvalue()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+import zipfile
+
+import pytest
+
+from unpack import unpack_document
+
+
+def make_archive(path, members):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+
+
+@pytest.mark.parametrize("name", ["../evil.xml", "ppt/../../evil.xml", "../evil.bin"])
+def test_unpack_rejects_paths_outside_output_dir(tmp_path, name):
+    archive = tmp_path / "deck.pptx"
+    make_archive(archive, {name: "<a/>"})
+    output_dir = tmp_path / "out" / "unpacked"
+
+    with pytest.raises(ValueError, match="Unsafe path in archive"):
+        unpack_document(archive, output_dir)
+
+    assert not (tmp_path / "out" / "evil.xml").exists()
+    assert not (tmp_path / "out" / "evil.bin").exists()
+
+
+def test_unpack_writes_parts_inside_output_dir(tmp_path):
+    archive = tmp_path / "deck.pptx"
+    make_archive(
+        archive,
+        {"[Content_Types].xml": "<Types/>", "ppt/media/image1.bin": b"\x00\x01"},
+    )
+    output_dir = tmp_path / "out"
+
+    unpack_document(archive, output_dir)
+
+    assert (output_dir / "[Content_Types].xml").is_file()
+    assert (output_dir / "ppt" / "media" / "image1.bin").read_bytes() == b"\x00\x01"
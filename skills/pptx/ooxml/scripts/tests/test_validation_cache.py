@@ -0,0 +1,174 @@
+import re
+import shutil
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+from validation import (
+    SCHEMAS_DIR,
+    DirectoryPackage,
+    PPTXSchemaValidator,
+    ValidationCache,
+    ZipPackage,
+)
+
+SLIDE1 = "ppt/slides/slide1.xml"
+
+
+@pytest.fixture
+def deck(tmp_path):
+    """An original deck and an unpacked copy of it to validate."""
+    prs = Presentation()
+    for title in ("One", "Two"):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = title
+    original = tmp_path / "deck.pptx"
+    prs.save(str(original))
+    unpacked = tmp_path / "unpacked"
+    with zipfile.ZipFile(original) as zf:
+        zf.extractall(unpacked)
+    return original, unpacked
+
+
+@pytest.fixture
+def schemas_dir(tmp_path):
+    """A stand-in schemas directory; only the cache key is computed from it."""
+    directory = tmp_path / "schemas"
+    directory.mkdir()
+    (directory / "a.xsd").write_text("<schema/>")
+    return directory
+
+
+def run(unpacked, original, cache_path, schemas_dir=SCHEMAS_DIR):
+    """Validate with a cache, the way validate.py does.
+
+    Returns (passed, cache, names of the parts whose results were computed).
+    """
+    with DirectoryPackage(unpacked) as package, ZipPackage(original) as orig:
+        cache = ValidationCache(cache_path, package, original, schemas_dir)
+        computed = set()
+        store = cache.store
+
+        def recording_store(check, name, result):
+            computed.add(name)
+            return store(check, name, result)
+
+        cache.store = recording_store
+        validator = PPTXSchemaValidator(
+            unpacked, original, package=package, original=orig, cache=cache
+        )
+        passed = validator.validate()
+    cache.save()
+    return passed, cache, computed
+
+
+def edit(path, old, new):
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
+
+
+def test_warm_cache_reuses_every_part(deck, tmp_path):
+    original, unpacked = deck
+    cache_path = tmp_path / "cache.json"
+
+    assert run(unpacked, original, cache_path)[0]
+    passed, cache, computed = run(unpacked, original, cache_path)
+
+    assert passed
+    assert computed == set()
+    assert cache.misses == 0
+    assert cache.hits > 0
+
+
+def test_changed_part_is_checked_again(deck, tmp_path, capsys):
+    original, unpacked = deck
+    cache_path = tmp_path / "cache.json"
+    assert run(unpacked, original, cache_path)[0]
+
+    slide1 = unpacked / SLIDE1
+    clean = slide1.read_text(encoding="utf-8")
+    edit(slide1, "</p:sld>", "")
+    capsys.readouterr()
+    passed, _, computed = run(unpacked, original, cache_path)
+
+    assert not passed
+    assert computed == {SLIDE1}
+    assert "slide1.xml: Line" in capsys.readouterr().out
+
+    # Fixing it again is picked up as well
+    slide1.write_text(clean, encoding="utf-8")
+    passed, _, computed = run(unpacked, original, cache_path)
+    assert passed
+    assert computed == {SLIDE1}
+
+
+def test_cache_is_discarded_when_original_changes(deck, tmp_path, schemas_dir):
+    original, unpacked = deck
+    cache_path = tmp_path / "cache.json"
+    run(unpacked, original, cache_path, schemas_dir)
+    with DirectoryPackage(unpacked) as package:
+        assert ValidationCache(cache_path, package, original, schemas_dir).parts
+
+    prs = Presentation(str(original))
+    prs.slides[0].shapes.title.text = "Changed"
+    prs.save(str(original))
+
+    with DirectoryPackage(unpacked) as package:
+        assert ValidationCache(cache_path, package, original, schemas_dir).parts == {}
+    passed, _, computed = run(unpacked, original, cache_path, schemas_dir)
+    assert passed
+    assert {SLIDE1, "ppt/presentation.xml"} <= computed
+
+
+def test_cache_is_discarded_when_schemas_change(deck, tmp_path, schemas_dir):
+    original, unpacked = deck
+    cache_path = tmp_path / "cache.json"
+    run(unpacked, original, cache_path, schemas_dir)
+
+    (schemas_dir / "a.xsd").write_text("<schema><element/></schema>")
+
+    with DirectoryPackage(unpacked) as package:
+        assert ValidationCache(cache_path, package, original, schemas_dir).parts == {}
+
+    # Adding a schema counts as a change too
+    run(unpacked, original, cache_path, schemas_dir)
+    shutil.copy(schemas_dir / "a.xsd", schemas_dir / "b.xsd")
+    with DirectoryPackage(unpacked) as package:
+        assert ValidationCache(cache_path, package, original, schemas_dir).parts == {}
+
+
+def test_warm_cache_still_reports_duplicate_global_ids(deck, tmp_path, capsys):
+    original, unpacked = deck
+    cache_path = tmp_path / "cache.json"
+    assert run(unpacked, original, cache_path)[0]
+
+    # Reuse the master's id (in the cached presentation.xml) for a layout
+    presentation = (unpacked / "ppt/presentation.xml").read_text(encoding="utf-8")
+    master_id = re.search(r'<p:sldMasterId id="(\d+)"', presentation).group(1)
+    master = unpacked / "ppt/slideMasters/slideMaster1.xml"
+    layout_id = re.search(r'<p:sldLayoutId id="(\d+)"', master.read_text()).group(1)
+    edit(master, f'<p:sldLayoutId id="{layout_id}"', f'<p:sldLayoutId id="{master_id}"')
+    capsys.readouterr()
+    passed, _, computed = run(unpacked, original, cache_path)
+
+    assert not passed
+    assert "ppt/presentation.xml" not in computed
+    assert f"Global ID '{master_id}'" in capsys.readouterr().out
+
+
+def test_warm_cache_still_reports_broken_relationships(deck, tmp_path, capsys):
+    original, unpacked = deck
+    cache_path = tmp_path / "cache.json"
+    assert run(unpacked, original, cache_path)[0]
+
+    (unpacked / "ppt/slides/slide2.xml").unlink()
+    capsys.readouterr()
+    passed, _, computed = run(unpacked, original, cache_path)
+
+    assert not passed
+    # presentation.xml.rels still points at slide2.xml and comes from the cache
+    assert "ppt/_rels/presentation.xml.rels" not in computed
+    out = capsys.readouterr().out
+    assert "slide2.xml" in out
@@ -0,0 +1,63 @@
+import zipfile
+
+from pptx import Presentation
+
+from validation import DirectoryPackage, PPTXSchemaValidator, ZipPackage
+from validation.package import part_sort_key
+
+
+def test_part_sort_key_lists_files_before_subdirectories_with_natural_numbers():
+    names = [
+        "ppt/slides/slide10.xml",
+        "ppt/charts/chart3.xml",
+        "[Content_Types].xml",
+        "ppt/slides/_rels/slide2.xml.rels",
+        "ppt/presentation.xml",
+        "ppt/charts/chart2.xml",
+        "ppt/slides/slide2.xml",
+        "_rels/.rels",
+    ]
+
+    assert sorted(names, key=part_sort_key) == [
+        "[Content_Types].xml",
+        "_rels/.rels",
+        "ppt/presentation.xml",
+        "ppt/charts/chart2.xml",
+        "ppt/charts/chart3.xml",
+        "ppt/slides/slide2.xml",
+        "ppt/slides/slide10.xml",
+        "ppt/slides/_rels/slide2.xml.rels",
+    ]
+
+
+def test_directory_and_zip_report_errors_in_the_same_order(tmp_path, capsys):
+    prs = Presentation()
+    for _ in range(10):
+        prs.slides.add_slide(prs.slide_layouts[6])
+    original = tmp_path / "deck.pptx"
+    prs.save(str(original))
+
+    # Break two slides, and zip the unpacked parts in reverse order
+    unpacked = tmp_path / "unpacked"
+    with zipfile.ZipFile(original) as zf:
+        zf.extractall(unpacked)
+        names = zf.namelist()
+    for name in ("ppt/slides/slide2.xml", "ppt/slides/slide10.xml"):
+        path = unpacked / name
+        path.write_text(path.read_text().replace("</p:sld>", ""))
+    packed = tmp_path / "edited.pptx"
+    with zipfile.ZipFile(packed, "w") as zf:
+        for name in reversed(names):
+            zf.write(unpacked / name, name)
+
+    outputs = []
+    for path, package_class in ((unpacked, DirectoryPackage), (packed, ZipPackage)):
+        with package_class(path) as package, ZipPackage(original) as orig:
+            validator = PPTXSchemaValidator(
+                path, original, package=package, original=orig
+            )
+            assert not validator.validate()
+        outputs.append(capsys.readouterr().out)
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0].index("slide2.xml") < outputs[0].index("slide10.xml")
@@ -0,0 +1,135 @@
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PackageModel,
+    PPTXSchemaValidator,
+    ZipPackage,
+)
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"/>"""
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:body>
+<w:p><w:bookmarkStart w:id="0" w:name="start"/><w:r><w:t>Hello</w:t></w:r><w:bookmarkEnd w:id="0"/></w:p>
+<w:p><w:r><w:t>World</w:t></w:r></w:p>
+</w:body>
+</w:document>"""
+
+
+@pytest.fixture
+def pptx_file(tmp_path):
+    prs = Presentation()
+    for title in ("One", "Two"):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = title
+    path = tmp_path / "deck.pptx"
+    prs.save(str(path))
+    return path
+
+
+@pytest.fixture
+def docx_file(tmp_path):
+    path = tmp_path / "document.docx"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+        zf.writestr("_rels/.rels", PACKAGE_RELS)
+        zf.writestr("word/document.xml", DOCUMENT)
+        zf.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS)
+    return path
+
+
+@pytest.fixture
+def walks(monkeypatch):
+    """Record, per part, each element walk and whether it streamed the part."""
+    calls = {}
+    iterelements = PackageModel.iterelements
+
+    def wrapper(self, name):
+        calls.setdefault(name, []).append(self.streams(name))
+        return iterelements(self, name)
+
+    monkeypatch.setattr(PackageModel, "iterelements", wrapper)
+    return calls
+
+
+@pytest.fixture
+def scanned(monkeypatch):
+    """Record the parts whose per-element check results were produced."""
+    calls = {}
+    element_result = BaseSchemaValidator._element_result
+
+    def wrapper(self, check, xml_file):
+        calls.setdefault(check, set()).add(self.package.name_of(xml_file))
+        return element_result(self, check, xml_file)
+
+    monkeypatch.setattr(BaseSchemaValidator, "_element_result", wrapper)
+    return calls
+
+
+def validate(validator_class, path):
+    with ZipPackage(path) as package, ZipPackage(path) as original:
+        validator = validator_class(path, path, package=package, original=original)
+        assert validator.validate()
+        return package
+
+
+@pytest.fixture
+def stream_all(monkeypatch):
+    """Stream every part, however small."""
+    monkeypatch.setattr(PackageModel, "STREAM_MIN_SIZE", 0)
+
+
+def test_pptx_validate_streams_each_part_once(pptx_file, walks, scanned, stream_all):
+    package = validate(PPTXSchemaValidator, pptx_file)
+
+    slide = "ppt/slides/slide1.xml"
+    for check in ("unique_ids", "relationship_ids", "uuid_ids"):
+        assert slide in scanned[check]
+    assert "ppt/slideMasters/slideMaster1.xml" in scanned["slide_layout_ids"]
+    # Every check reuses the well-formedness pass: one stream per part
+    assert walks[slide] == [True]
+    assert all(streamed == [True] for streamed in walks.values())
+    # Trees are dropped once XSD validation is done with them
+    assert not any(name.endswith(".xml") for name in package._trees)
+
+
+def test_docx_validate_keeps_document_tree(docx_file, walks, scanned, stream_all):
+    package = validate(DOCXSchemaValidator, docx_file)
+
+    assert scanned["unique_ids"] == {
+        "[Content_Types].xml",
+        "word/document.xml",
+        "_rels/.rels",
+        "word/_rels/document.xml.rels",
+    }
+    assert walks["word/document.xml"] == [True]
+    # document.xml is kept whole for the checks that run after XSD
+    assert "word/document.xml" in package._trees
+
+
+def test_validate_walks_small_parts_once(pptx_file, walks):
+    package = validate(PPTXSchemaValidator, pptx_file)
+
+    # Below STREAM_MIN_SIZE, one walk of the parsed tree serves every check
+    assert walks["ppt/slides/slide1.xml"] == [False]
+    assert all(streamed == [False] for streamed in walks.values())
+    assert "ppt/slides/slide1.xml" in package._trees
@@ -0,0 +1,91 @@
+"""
+Compare word_diff() with git's own word diff.
+
+The expected outputs in data/word_diff were recorded with the command
+RedliningValidator used to run, keeping the lines after the @@ header:
+
+    git diff --word-diff=plain [--word-diff-regex=.] -U0 --no-index \
+        <case>.original.txt <case>.modified.txt
+
+<case>.chars.txt holds the output with --word-diff-regex=. and
+<case>.words.txt the output without it.
+"""
+
+import hashlib
+import random
+from pathlib import Path
+
+import pytest
+
+from validation.word_diff import CHAR_PATTERN, WORD_PATTERN, diff_blocks, word_diff
+
+DATA_DIR = Path(__file__).parent / "data" / "word_diff"
+
+
+@pytest.mark.parametrize("case", ["paragraphs", "sliding", "heavy", "rewrites"])
+@pytest.mark.parametrize(
+    "suffix, pattern",
+    [("chars", CHAR_PATTERN), ("words", WORD_PATTERN)],
+    ids=["chars", "words"],
+)
+def test_word_diff_matches_git(case, suffix, pattern):
+    original = (DATA_DIR / f"{case}.original.txt").read_text(encoding="utf-8")
+    modified = (DATA_DIR / f"{case}.modified.txt").read_text(encoding="utf-8")
+    expected = (DATA_DIR / f"{case}.{suffix}.txt").read_text(encoding="utf-8")
+
+    assert word_diff(original, modified, pattern) + "\n" == expected
+
+
+def test_word_diff_of_equal_texts_is_empty():
+    assert word_diff("same\ntext\n", "same\ntext\n", CHAR_PATTERN) == ""
+
+
+def test_diff_blocks_separates_changes_by_common_items():
+    a = list("abcdefg")
+    b = list("abXdeYYg")
+
+    assert diff_blocks(a, b) == [(2, 3, 2, 3), (5, 6, 5, 7)]
+
+
+def test_many_edits_are_each_marked_exactly():
+    # One character replaced in each of 5000 paragraphs: far past the cost
+    # cutoffs, yet every edit is still marked on its own, as git does. The
+    # first character is kept, so edits in consecutive paragraphs are not
+    # adjacent tokens, which git would mark as one change.
+    rng = random.Random(0)
+    words = "the quick brown fox jumps over lazy dog while seven wizards".split()
+    paragraphs = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(4, 14)))
+        for _ in range(5000)
+    ]
+    positions = [rng.randrange(1, len(paragraph)) for paragraph in paragraphs]
+    edited = [p[:i] + "X" + p[i + 1 :] for p, i in zip(paragraphs, positions)]
+
+    diff = word_diff(
+        "\n".join(paragraphs) + "\n", "\n".join(edited) + "\n", CHAR_PATTERN
+    )
+
+    assert diff.split("\n") == [
+        f"{p[:i]}[-{p[i]}-]{{+X+}}{p[i + 1 :]}" for p, i in zip(paragraphs, positions)
+    ]
+
+
+def test_lopsided_edits_match_git():
+    # Dense edits followed by a long, sparsely edited stretch: big enough for
+    # the backward snake heuristic. The output is about 58 KB, so only the
+    # SHA-256 of git's output for the same texts is recorded.
+    rng = random.Random(2)
+    dense = [rng.choice("abcdefgh ") for _ in range(2000)]
+    sparse = [rng.choice("abcdefgh ") for _ in range(40000)]
+    new_dense = [c if rng.random() < 0.5 else rng.choice("abcdefgh ") for c in dense]
+    new_sparse = list(sparse)
+    for position in range(15, len(sparse), 30):
+        new_sparse[position] = "Z"
+    original = "".join(dense + sparse) + "\n"
+    modified = "".join(new_dense + new_sparse) + "\n"
+
+    diff = word_diff(original, modified, CHAR_PATTERN)
+
+    assert hashlib.sha256(diff.encode()).hexdigest() == (
+        "d96312e60a25fe92fc7eafd1fbddc0c0398d8bc979f1ef0e8a0e693e75aa50c0"
+    )
@@ -1,29 +1,100 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Usage:
+    python unpack.py <office_file> <output_dir> [--jobs N]
+"""
+
+import argparse
 import random
-import sys
-import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+from xml_rewrite import rewrite_xml
+
+# Archive opened once per pool worker by open_archive
+_archive = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty print its XML parts"
+    )
+    parser.add_argument("office_file", help="Input Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes used to pretty print XML parts (default: 1)",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    unpack_document(args.office_file, args.output_dir, jobs=args.jobs)
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, jobs=1):
+    """Extract an Office file, pretty printing XML parts while they are written."""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    root = output_path.resolve()
+
+    with zipfile.ZipFile(input_file) as zf:
+        xml_parts = []
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            target = (output_path / info.filename).resolve()
+            if not target.is_relative_to(root):
+                raise ValueError(f"Unsafe path in archive: {info.filename}")
+
+            if info.filename.lower().endswith((".xml", ".rels")):
+                target.parent.mkdir(parents=True, exist_ok=True)
+                xml_parts.append((info, target))
+            else:
+                zf.extract(info, output_path)
+
+        if jobs == 1 or len(xml_parts) < 2:
+            for info, target in xml_parts:
+                pretty_print_part(zf, info.filename, target)
+            return
+
+    # Each worker reads its parts from its own handle on the archive and
+    # writes them straight to disk, so only part names cross processes.
+    # Largest parts go first so one big sheet doesn't finish last on its own.
+    xml_parts.sort(key=lambda part: part[0].file_size, reverse=True)
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=open_archive, initargs=(input_file,)
+    ) as pool:
+        for _ in pool.map(
+            pretty_print_archived_part,
+            [info.filename for info, _ in xml_parts],
+            [target for _, target in xml_parts],
+        ):
+            pass
+
+
+def pretty_print_part(zf, name, target):
+    with zf.open(name) as src, open(target, "wb") as dst:
+        rewrite_xml(src, dst, pretty=True)
+
+
+def open_archive(input_file):
+    global _archive
+    _archive = zipfile.ZipFile(input_file)
+
+
+def pretty_print_archived_part(name, target):
+    pretty_print_part(_archive, name, target)
+
+
+if __name__ == "__main__":
+    main()
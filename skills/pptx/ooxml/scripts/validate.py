@@ -3,21 +3,59 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir_or_file> --original <original_file>
+                       [--schema-bundle <bundle.zip>] [--jobs N] [--cache <cache.json>]
+
+<dir_or_file> is either an unpacked document directory or a packed
+.docx/.pptx/.xlsx file. Packed files are read straight from the archive,
+without unpacking them to disk.
+
+--schema-bundle reads the XSD schemas from a single pre-resolved bundle file,
+building it first if it does not exist yet. Delete the bundle to rebuild it
+after the schemas change. --jobs validates parts against the schemas in N
+processes; the output is the same as with a single process.
+
+--cache keeps per-part check results in a JSON file between runs, so only
+the parts that changed since the last run are parsed and checked again. The
+cache is discarded automatically when the original file or the schemas change.
+
+Large parts are streamed for the per-element checks, but XSD validation
+parses each part in full while it runs, and a Word document's
+word/document.xml stays parsed for the tracked-changes checks. Peak memory
+therefore grows with the largest part, and with document.xml for .docx files.
 """
 
 import argparse
 import sys
+import zipfile
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    SCHEMAS_DIR,
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    ValidationCache,
+    ZipPackage,
+    build_schema_bundle,
+    open_package,
+    use_schema_bundle,
+)
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Validate Office document XML files")
+    parser = argparse.ArgumentParser(
+        description="Validate Office document XML files",
+        epilog=(
+            "Memory use grows with the largest part: XSD validation parses "
+            "each part in full, and word/document.xml stays parsed for the "
+            "tracked-changes checks."
+        ),
+    )
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        help="Path to unpacked Office document directory, or to a packed Office file",
     )
     parser.add_argument(
         "--original",
@@ -30,17 +68,37 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "--schema-bundle",
+        help="Path to a pre-resolved schema bundle (created if missing)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes used for XSD validation (default: 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        help="Path to a file caching per-part results between runs",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    assert unpacked_dir.is_dir() or zipfile.is_zipfile(
+        unpacked_dir
+    ), f"Error: {unpacked_dir} is not a directory or an Office file"
     assert original_file.is_file(), f"Error: {original_file} is not a file"
-    assert file_extension in [".docx", ".pptx", ".xlsx"], (
-        f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
-    )
+    assert file_extension in [
+        ".docx",
+        ".pptx",
+        ".xlsx",
+    ], f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
 
     # Run validations
     match file_extension:
@@ -52,12 +110,40 @@ def main():
             print(f"Error: Validation not supported for file type {file_extension}")
             sys.exit(1)
 
-    # Run validators
+    if args.schema_bundle:
+        bundle = Path(args.schema_bundle)
+        if not bundle.is_file():
+            count = build_schema_bundle(
+                SCHEMAS_DIR, BaseSchemaValidator.schema_paths(), bundle
+            )
+            if args.verbose:
+                print(f"Built schema bundle with {count} schemas: {bundle}")
+        use_schema_bundle(bundle, SCHEMAS_DIR)
+
+    # Run validators, sharing the parsed parts of both documents
     success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    with open_package(unpacked_dir) as package, ZipPackage(original_file) as original:
+        cache = None
+        if args.cache:
+            cache = ValidationCache(args.cache, package, original_file, SCHEMAS_DIR)
+        for V in validators:
+            options = {"jobs": args.jobs} if issubclass(V, BaseSchemaValidator) else {}
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                original=original,
+                package=package,
+                cache=cache,
+                **options,
+            )
+            if not validator.validate():
+                success = False
+
+    if cache is not None:
+        cache.save()
+        if args.verbose:
+            print(f"Cache: {cache.hits} results reused, {cache.misses} computed")
 
     if success:
         print("All validations PASSED!")
@@ -2,14 +2,25 @@
 Validation modules for Word document processing.
 """
 
-from .base import BaseSchemaValidator
+from .base import SCHEMAS_DIR, BaseSchemaValidator
+from .cache import ValidationCache
 from .docx import DOCXSchemaValidator
+from .package import DirectoryPackage, PackageModel, ZipPackage, open_package
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .schema_cache import build_schema_bundle, use_schema_bundle
 
 __all__ = [
+    "SCHEMAS_DIR",
     "BaseSchemaValidator",
     "DOCXSchemaValidator",
+    "DirectoryPackage",
+    "PackageModel",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "ValidationCache",
+    "ZipPackage",
+    "build_schema_bundle",
+    "open_package",
+    "use_schema_bundle",
 ]
@@ -2,11 +2,23 @@
 Base validator with common validation logic for document files.
 """
 
+import fnmatch
+import posixpath
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+from . import tags
+from .package import Relationship, ZipPackage, open_package
+from .schema_cache import active_schema_bundle, load_schema, use_schema_bundle
+
+SCHEMAS_DIR = Path(__file__).parent.parent.parent / "schemas"
+
+# Validator used by XSD pool workers, created by _init_xsd_worker
+_xsd_worker = None
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -41,6 +53,12 @@ class BaseSchemaValidator:
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    # File names whose parsed trees are kept after XSD validation, because
+    # checks that run later need the whole tree. The trees of other large
+    # parts are dropped once validated; their per-element checks were
+    # already collected when the part was streamed for well-formedness.
+    RETAINED_TREES = set()
+
     # Unified schema mappings for all Office document types
     SCHEMA_MAPPINGS = {
         # Document type specific schemas
@@ -67,19 +85,13 @@ class BaseSchemaValidator:
     }
 
     # Unified namespace constants
-    MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
-    XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+    MC_NAMESPACE = tags.MC_NAMESPACE
+    XML_NAMESPACE = tags.XML_NAMESPACE
 
     # Common OOXML namespaces used across validators
-    PACKAGE_RELATIONSHIPS_NAMESPACE = (
-        "http://schemas.openxmlformats.org/package/2006/relationships"
-    )
-    OFFICE_RELATIONSHIPS_NAMESPACE = (
-        "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
-    )
-    CONTENT_TYPES_NAMESPACE = (
-        "http://schemas.openxmlformats.org/package/2006/content-types"
-    )
+    PACKAGE_RELATIONSHIPS_NAMESPACE = tags.PACKAGE_RELATIONSHIPS_NAMESPACE
+    OFFICE_RELATIONSHIPS_NAMESPACE = tags.OFFICE_RELATIONSHIPS_NAMESPACE
+    CONTENT_TYPES_NAMESPACE = tags.CONTENT_TYPES_NAMESPACE
 
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
@@ -103,19 +115,35 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        original=None,
+        package=None,
+        jobs=1,
+        cache=None,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        # Number of processes used for XSD validation
+        self.jobs = jobs
+        # Pass the same package models to every validator of a run so each
+        # part of either document is parsed only once
+        self.package = package or open_package(self.unpacked_dir)
+        self.original = original or ZipPackage(self.original_file)
+        # Optional ValidationCache holding per-part results from earlier runs
+        self.cache = cache
+        # Part name -> (scanners, error) of its single element walk, see _element_scan()
+        self._element_scans = {}
 
         # Set schemas directory
-        self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+        self.schemas_dir = SCHEMAS_DIR
 
-        # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
-        self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
-        ]
+        # Get all XML and .rels files, from the package's single directory scan
+        self.xml_files = self._files_matching("*.xml") + self._files_matching("*.rels")
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
@@ -124,24 +152,128 @@ class BaseSchemaValidator:
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _files_matching(self, pattern, directory=None):
+        """Return the files whose name matches pattern, in package part order.
+
+        With a directory (a part name like "ppt/slides"), only files directly
+        inside it are returned, like a non-recursive glob().
+        """
+        return [
+            self.unpacked_dir / name
+            for name in self.package.files
+            if fnmatch.fnmatchcase(posixpath.basename(name), pattern)
+            and (directory is None or posixpath.dirname(name) == directory)
+        ]
+
+    def _tree(self, xml_file):
+        """Return the shared parsed tree of a file in the unpacked directory."""
+        return self.package.tree(self.package.name_of(xml_file))
+
+    def _root(self, xml_file):
+        """Return the root element of a file, reading only its start if not parsed."""
+        return self.package.root(self.package.name_of(xml_file))
+
+    def _release_tree(self, xml_file):
+        """Drop the parsed trees of a large file once the whole-tree checks are done.
+
+        The per-element checks reuse what the well-formedness pass collected,
+        so the file is not read again. Files named in RETAINED_TREES are kept
+        for the checks that run later.
+        """
+        if xml_file.name in self.RETAINED_TREES:
+            return
+        name = self.package.name_of(xml_file)
+        for package in (self.package, self.original):
+            if package.is_large(name):
+                package.release(name)
+
+    def _element_scanners(self, xml_file):
+        """Return {check: (visit, finish)} for the checks that look at every element.
+
+        visit(elem) is called with each element of the file in document
+        order, under the limits of PackageModel.iterelements(). finish(error)
+        then returns the check's per-part result; error is the exception
+        that ended the walk early, or None. Subclasses add their own checks.
+        """
+        return {
+            "unique_ids": self._id_scanner(xml_file),
+            "relationship_ids": self._relationship_scanner(xml_file),
+        }
+
+    @staticmethod
+    def _visit_all(scanners):
+        """Return a visit function feeding each element to every scanner."""
+        visits = [visit for visit, _ in scanners.values()]
+
+        def visit_all(elem):
+            for visit in visits:
+                visit(elem)
+
+        return visit_all
+
+    def _element_result(self, check, xml_file):
+        """Return the result of a check from _element_scanners() for a file.
+
+        Like _part_result(), the result is reused while the file is unchanged.
+        """
+        return self._part_result(
+            check, xml_file, lambda f: self._element_scan(check, f)
+        )
+
+    def _element_scan(self, check, xml_file):
+        """Return the result of one per-element check for a file.
+
+        All checks of _element_scanners() share a single walk over the file's
+        elements, run when the first of them is needed. For a large file it
+        is the well-formedness pass itself (see _well_formed_error), so the
+        file is streamed once, however many checks look at its elements.
+        """
+        name = self.package.name_of(xml_file)
+        if name not in self._element_scans:
+            scanners = self._element_scanners(xml_file)
+            visit = self._visit_all(scanners)
+            error = None
+            try:
+                for elem in self.package.iterelements(name):
+                    visit(elem)
+            except Exception as e:
+                error = e
+            self._element_scans[name] = (scanners, error)
+        scanners, error = self._element_scans[name]
+        _, finish = scanners[check]
+        return finish(error)
+
+    def _part_result(self, check, xml_file, compute):
+        """Return compute(xml_file), reusing a cached result while the part is unchanged.
+
+        compute must return JSON-compatible data; callers must accept lists
+        where compute returned tuples.
+        """
+        if self.cache is None:
+            return compute(xml_file)
+        return self.cache.result(
+            check, self.package.name_of(xml_file), lambda: compute(xml_file)
+        )
+
+    def _relationships(self, rels_file):
+        """Return the Relationship entries of a .rels file in the unpacked directory."""
+        return [
+            Relationship(*rel)
+            for rel in self._part_result(
+                "relationships",
+                rels_file,
+                lambda f: self.package.relationships(self.package.name_of(f)),
+            )
+        ]
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+            error = self._part_result("xml", xml_file, self._well_formed_error)
+            if error:
+                errors.append(error)
 
         if errors:
             print(f"FAILED - Found {len(errors)} XML violations:")
@@ -153,26 +285,38 @@ class BaseSchemaValidator:
                 print("PASSED - All XML files are well-formed")
             return True
 
+    def _well_formed_error(self, xml_file):
+        name = self.package.name_of(xml_file)
+        try:
+            if self.package.streams(name):
+                # Stream the file once, collecting the per-element checks'
+                # results in the same pass; no tree is built unless a later
+                # check needs one
+                scanners = self._element_scanners(xml_file)
+                self.package.check(name, self._visit_all(scanners))
+                self._element_scans[name] = (scanners, None)
+            else:
+                self.package.check(name)
+        except lxml.etree.XMLSyntaxError as e:
+            return (
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Line {e.lineno}: {e.msg}"
+            )
+        except Exception as e:
+            return (
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Unexpected error: {str(e)}"
+            )
+        return None
+
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
+            errors.extend(
+                self._part_result("namespaces", xml_file, self._namespace_errors)
+            )
 
         if errors:
             print(f"FAILED - {len(errors)} namespace issues:")
@@ -183,86 +327,52 @@ class BaseSchemaValidator:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _namespace_errors(self, xml_file):
+        errors = []
+        try:
+            root = self._root(xml_file)
+            declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+            for attr_val in [
+                v for k, v in root.attrib.items() if k.endswith("Ignorable")
+            ]:
+                undeclared = set(attr_val.split()) - declared
+                errors.extend(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                    f"Namespace '{ns}' in Ignorable but not declared"
+                    for ns in undeclared
+                )
+        except lxml.etree.XMLSyntaxError:
+            pass
+        return errors
+
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
         global_ids = {}  # Track globally unique IDs across all files
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+            # File-level errors and global IDs, in document order
+            for entry in self._element_result("unique_ids", xml_file):
+                if entry[0] == "error":
+                    errors.append(entry[1])
+                    continue
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
+                # Check global uniqueness
+                _, id_value, sourceline, tag = entry
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {sourceline}: Global ID '{id_value}' in <{tag}> "
+                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        sourceline,
+                        tag,
                     )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -274,6 +384,67 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _id_scanner(self, xml_file):
+        """Scanner for the ID facts of one file, for validate_unique_ids.
+
+        Its result lists, in document order, ("error", message) for
+        file-level violations and ("global", id, line, tag) for IDs that
+        must be unique across files.
+        """
+        entries = []
+        file_ids = {}  # Track IDs that must be unique within this file
+
+        def visit(elem):
+            # Get the element name without namespace
+            tag = tags.lower_local_name(elem.tag)
+
+            # Check if this element type has ID uniqueness requirements
+            if tag not in self.UNIQUE_ID_REQUIREMENTS:
+                return
+            # IDs inside mc:AlternateContent are skipped; the shared tree
+            # must not be modified, so they are filtered rather than removed
+            if next(elem.iterancestors(tags.MC_ALTERNATE_CONTENT), None) is not None:
+                return
+            attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
+
+            # Look for the specified attribute
+            id_value = None
+            for attr, value in elem.attrib.items():
+                if tags.lower_local_name(attr) == attr_name:
+                    id_value = value
+                    break
+
+            if id_value is None:
+                return
+            if scope == "global":
+                entries.append(("global", id_value, elem.sourceline, tag))
+            elif scope == "file":
+                # Check file-level uniqueness
+                ids = file_ids.setdefault((tag, attr_name), {})
+                if id_value in ids:
+                    entries.append(
+                        (
+                            "error",
+                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                            f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                            f"(first occurrence at line {ids[id_value]})",
+                        )
+                    )
+                else:
+                    ids[id_value] = elem.sourceline
+
+        def finish(error):
+            if error is None:
+                return entries
+            return entries + [
+                (
+                    "error",
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {error}",
+                )
+            ]
+
+        return visit, finish
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
@@ -281,22 +452,21 @@ class BaseSchemaValidator:
         errors = []
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = self._files_matching("*.rels")
 
         if not rels_files:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        # Get all files in the unpacked directory (excluding reference files),
+        # as part names
+        all_files = [
+            name
+            for name in self.package.files
+            if posixpath.basename(name) != "[Content_Types].xml"
+            and not name.endswith(".rels")  # These files are not referenced by .rels
+        ]
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
@@ -309,43 +479,37 @@ class BaseSchemaValidator:
         # Check each .rels file
         for rels_file in rels_files:
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                # Parsed relationships, shared with the other checks
+                relationships = self._relationships(rels_file)
 
                 # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
+                rels_dir = posixpath.dirname(self.package.name_of(rels_file))
 
                 # Find all relationships and their targets
                 referenced_files = set()
                 broken_refs = []
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
+                for rel in relationships:
+                    target = rel.target
                     if target and not target.startswith(
                         ("http", "mailto:")
                     ):  # Skip external URLs
                         # Resolve the target path relative to the .rels file location
                         if rels_file.name == ".rels":
                             # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
+                            target_path = target
                         else:
                             # Other .rels files - targets are relative to their parent's parent
                             # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
+                            base_dir = posixpath.dirname(rels_dir)
+                            target_path = posixpath.join(base_dir, target)
+
+                        # Normalize the path and check it against the file table
+                        target_path = posixpath.normpath(target_path)
+                        if self.package.exists(target_path):
+                            referenced_files.add(target_path)
+                            all_referenced_files.add(target_path)
+                        else:
                             broken_refs.append((target, rel.sourceline))
 
                 # Report broken references
@@ -364,9 +528,11 @@ class BaseSchemaValidator:
         unreferenced_files = set(all_files) - all_referenced_files
 
         if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+            # Sort by path components, as Path objects compare
+            for unref_file in sorted(
+                unreferenced_files, key=lambda name: name.split("/")
+            ):
+                errors.append(f"  Unreferenced file: {unref_file}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -390,8 +556,6 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -406,19 +570,16 @@ class BaseSchemaValidator:
             rels_file = rels_dir / f"{xml_file.name}.rels"
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if not self.package.exists(self.package.name_of(rels_file)):
                 continue
 
             try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                # Valid relationship IDs and their types
                 rid_to_type = {}
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
+                for rel in self._relationships(rels_file):
+                    rid = rel.id
+                    rel_type = rel.type
                     if rid:
                         # Check for duplicate rIds
                         if rid in rid_to_type:
@@ -433,40 +594,34 @@ class BaseSchemaValidator:
                         )
                         rid_to_type[rid] = type_name
 
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
+                # r:id references in the XML file, and the error that ended
+                # the scan early if there was one
+                references, error = self._element_result("relationship_ids", xml_file)
+                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
 
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
+                for rid_attr, elem_name, sourceline in references:
+                    # Check if the ID exists
+                    if rid_attr not in rid_to_type:
+                        errors.append(
+                            f"  {xml_rel_path}: Line {sourceline}: "
+                            f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                        )
+                    # Check if we have type expectations for this element
+                    elif self.ELEMENT_RELATIONSHIP_TYPES:
+                        expected_type = self._get_expected_relationship_type(elem_name)
+                        if expected_type:
+                            actual_type = rid_to_type[rid_attr]
+                            # Check if the actual type matches or contains the expected type
+                            if expected_type not in actual_type.lower():
+                                errors.append(
+                                    f"  {xml_rel_path}: Line {sourceline}: "
+                                    f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship"
+                                )
+
+                if error:
+                    errors.append(f"  Error processing {xml_rel_path}: {error}")
 
             except Exception as e:
                 xml_rel_path = xml_file.relative_to(self.unpacked_dir)
@@ -483,6 +638,23 @@ class BaseSchemaValidator:
                 print("PASSED - All relationship ID references are valid")
             return True
 
+    def _relationship_scanner(self, xml_file):
+        """Scanner whose result is ([(r:id, element name, line)], error) for one file."""
+        references = []
+
+        def visit(elem):
+            # Check for r:id attribute (relationship ID)
+            rid_attr = elem.get(tags.R_ID)
+            if rid_attr:
+                references.append(
+                    (rid_attr, tags.local_name(elem.tag), elem.sourceline)
+                )
+
+        def finish(error):
+            return references, str(error) if error is not None else None
+
+        return visit, finish
+
     def _get_expected_relationship_type(self, element_name):
         """
         Get the expected relationship type for an element.
@@ -525,31 +697,17 @@ class BaseSchemaValidator:
 
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if not self.package.exists("[Content_Types].xml"):
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Get all declared parts and extensions
+            declared_parts, declared_extensions = self._part_result(
+                "content_types", content_types_file, self._declared_content_types
+            )
+            declared_parts = set(declared_parts)
+            declared_extensions = set(declared_extensions)
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -575,9 +733,8 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            # Get all files in the unpacked directory, as part names
+            all_files = self.package.files
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
@@ -593,8 +750,10 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
+                    root_tag = self._part_result(
+                        "root_tag", xml_file, lambda f: self._root(f).tag
+                    )
+                    root_name = tags.local_name(root_tag)
 
                     if root_name in declarable_roots and path_str not in declared_parts:
                         errors.append(
@@ -605,20 +764,21 @@ class BaseSchemaValidator:
                     continue  # Skip unparseable files
 
             # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
+            for relative_path in all_files:
                 # Skip XML files and metadata files (already checked above)
-                if file_path.suffix.lower() in {".xml", ".rels"}:
+                suffix = posixpath.splitext(relative_path)[1]
+                if suffix.lower() in {".xml", ".rels"}:
                     continue
-                if file_path.name == "[Content_Types].xml":
+                if posixpath.basename(relative_path) == "[Content_Types].xml":
                     continue
-                if "_rels" in file_path.parts or "docProps" in file_path.parts:
+                parts = relative_path.split("/")
+                if "_rels" in parts or "docProps" in parts:
                     continue
 
-                extension = file_path.suffix.lstrip(".").lower()
+                extension = suffix.lstrip(".").lower()
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
                             f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
                         )
@@ -638,6 +798,26 @@ class BaseSchemaValidator:
                 )
             return True
 
+    def _declared_content_types(self, content_types_file):
+        """Return (Override part names, Default extensions) in [Content_Types].xml."""
+        root = self._tree(content_types_file).getroot()
+        declared_parts = []
+        declared_extensions = []
+
+        # Get Override declarations (specific files)
+        for override in root.iter(tags.CT_OVERRIDE):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                declared_parts.append(part_name.lstrip("/"))
+
+        # Get Default declarations (by extension)
+        for default in root.iter(tags.CT_DEFAULT):
+            extension = default.get("Extension")
+            if extension is not None:
+                declared_extensions.append(extension.lower())
+
+        return declared_parts, declared_extensions
+
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
 
@@ -653,17 +833,21 @@ class BaseSchemaValidator:
         unpacked_dir = self.unpacked_dir.resolve()
 
         # Validate current file
-        is_valid, current_errors = self._validate_single_file_xsd(
-            xml_file, unpacked_dir
-        )
+        try:
+            is_valid, current_errors = self._validate_single_file_xsd(
+                xml_file, unpacked_dir
+            )
 
-        if is_valid is None:
-            return None, set()  # Skipped
-        elif is_valid:
-            return True, set()  # Valid, no errors
+            if is_valid is None:
+                return None, set()  # Skipped
+            elif is_valid:
+                return True, set()  # Valid, no errors
 
-        # Get errors from original file for this specific file
-        original_errors = self._get_original_file_errors(xml_file)
+            # Get errors from original file for this specific file
+            original_errors = self._get_original_file_errors(xml_file)
+        finally:
+            # XSD is the last pass that needs the whole tree of most files
+            self._release_tree(xml_file)
 
         # Compare with original (both are guaranteed to be sets here)
         assert current_errors is not None
@@ -673,7 +857,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +876,10 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        for xml_file, (is_valid, new_file_errors) in zip(
+            self.xml_files, self._xsd_results()
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +895,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +921,62 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _xsd_results(self):
+        """Return validate_file_against_xsd results for self.xml_files, in order.
+
+        Results are (is_valid, sorted new errors). Parts with a cached result
+        are not validated again. With jobs > 1 the remaining files are
+        validated in a process pool; each worker compiles the schemas it needs
+        once and keeps them for its lifetime.
+        """
+        results = [None] * len(self.xml_files)
+        pending = []
+        for index, xml_file in enumerate(self.xml_files):
+            if self.cache is not None:
+                found, result = self.cache.lookup("xsd", self.package.name_of(xml_file))
+                if found:
+                    results[index] = result
+                    continue
+            pending.append(index)
+
+        pending_files = [self.xml_files[index] for index in pending]
+        if self.jobs <= 1 or len(pending_files) < 2:
+            computed = [
+                self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in pending_files
+            ]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_xsd_worker,
+                initargs=(
+                    type(self),
+                    self.unpacked_dir,
+                    self.original_file,
+                    active_schema_bundle(),
+                ),
+            ) as pool:
+                chunksize = max(1, len(pending_files) // (self.jobs * 4))
+                computed = list(
+                    pool.map(
+                        _validate_xsd_in_worker, pending_files, chunksize=chunksize
+                    )
+                )
+
+        for index, (is_valid, new_errors) in zip(pending, computed):
+            result = (is_valid, sorted(new_errors))
+            if self.cache is not None:
+                result = self.cache.store(
+                    "xsd", self.package.name_of(self.xml_files[index]), result
+                )
+            results[index] = result
+        return results
+
+    @classmethod
+    def schema_paths(cls):
+        """Return every schema this validator can validate against."""
+        return sorted({SCHEMAS_DIR / name for name in cls.SCHEMA_MAPPINGS.values()})
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -774,10 +1013,9 @@ class BaseSchemaValidator:
 
             for attr in elem.attrib:
                 # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
+                ns = tags.namespace_of(attr)
+                if ns and ns not in self.OOXML_NAMESPACES:
+                    attrs_to_remove.append(attr)
 
             # Remove collected attributes
             for attr in attrs_to_remove:
@@ -798,12 +1036,10 @@ class BaseSchemaValidator:
             if not hasattr(elem, "tag") or callable(elem.tag):
                 continue
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
+            ns = tags.namespace_of(elem.tag)
+            if ns and ns not in self.OOXML_NAMESPACES:
+                elements_to_remove.append(elem)
+                continue
 
             # Recursively clean child elements
             self._remove_ignorable_elements(elem)
@@ -818,8 +1054,8 @@ class BaseSchemaValidator:
         root = xml_doc.getroot()
 
         # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+        if tags.MC_IGNORABLE in root.attrib:
+            del root.attrib[tags.MC_IGNORABLE]
 
         return xml_doc
 
@@ -830,23 +1066,27 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self._tree(xml_file)
+        except Exception as e:
+            return False, {str(e)}
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        return self._validate_tree_xsd(
+            xml_doc, schema_path, xml_file.relative_to(base_path)
+        )
+
+    def _validate_tree_xsd(self, xml_doc, schema_path, relative_path):
+        """Validate a parsed XML tree against an XSD schema without modifying it.
+
+        Returns (is_valid, errors_set).
+        """
+        try:
+            # Compiled once per process and shared by every file using it
+            schema = load_schema(schema_path)
 
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
             if (
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
@@ -875,33 +1115,28 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+        # Read the corresponding member straight from the original archive
+        name = relative_path.as_posix()
+        if not self.original.exists(name):
+            # File didn't exist in original, so no original errors
+            return set()
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return set()
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        try:
+            xml_doc = self.original.tree(name)
+        except Exception as e:
+            return {str(e)}
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        is_valid, errors = self._validate_tree_xsd(xml_doc, schema_path, relative_path)
+        return errors if errors else set()
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -937,8 +1172,7 @@ class BaseSchemaValidator:
             # Skip processing if this is a w:t element
             if not hasattr(elem, "tag") or callable(elem.tag):
                 continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
+            if tags.local_name(elem.tag) == "t":
                 continue
 
             elem.text = process_text_content(elem.text, "text content")
@@ -947,5 +1181,16 @@ class BaseSchemaValidator:
         return lxml.etree.ElementTree(xml_copy), warnings
 
 
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, schema_bundle):
+    global _xsd_worker
+    if schema_bundle:
+        use_schema_bundle(*schema_bundle)
+    _xsd_worker = validator_class(unpacked_dir, original_file)
+
+
+def _validate_xsd_in_worker(xml_file):
+    return _xsd_worker.validate_file_against_xsd(xml_file, verbose=False)
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,133 @@
+"""
+Validation results cached between runs, so unchanged parts are not re-checked.
+
+Every check is split into a per-part step and a cross-part merge. The per-part
+results (errors, IDs, relationship references, XSD outcome, ...) are stored
+in a JSON file keyed by part name and content hash. A later run reuses them
+for every part whose content is unchanged and only parses and checks the
+parts that changed. Cross-part checks (global IDs, relationships, content
+types) are then merged again from the per-part results, which is cheap.
+
+The whole cache is discarded when the cache format, the schemas or the
+original document change.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Bump when a check's per-part result changes shape or meaning
+CACHE_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def schemas_digest(schemas_dir):
+    """Hash every schema document, so editing a schema invalidates the cache."""
+    schemas_dir = Path(schemas_dir)
+    digest = hashlib.sha1()
+    for path in sorted(schemas_dir.rglob("*.xsd")):
+        digest.update(path.relative_to(schemas_dir).as_posix().encode("utf-8"))
+        digest.update(file_digest(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """Per-part check results from earlier runs, reused while a part is unchanged."""
+
+    def __init__(self, path, package, original_file, schemas_dir):
+        self.path = Path(path)
+        self.package = package
+        self.key = {
+            "version": CACHE_VERSION,
+            "schemas": schemas_digest(schemas_dir),
+            "original": file_digest(original_file),
+        }
+        self.parts = {}
+        self.original = {}
+        self._digests = {}  # Part name -> content hash, for this run
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # No usable cache yet
+        if data.get("key") == self.key:
+            self.parts = data.get("parts", {})
+            self.original = data.get("original", {})
+
+    def digest(self, name):
+        if name not in self._digests:
+            self._digests[name] = hashlib.sha1(self.package.read(name)).hexdigest()
+        return self._digests[name]
+
+    def lookup(self, check, name):
+        """Return (True, result) if check has a result for the unchanged part.
+
+        Returns (False, None) otherwise.
+        """
+        entry = self.parts.get(name)
+        if (
+            entry is not None
+            and entry["digest"] == self.digest(name)
+            and check in entry["results"]
+        ):
+            self.hits += 1
+            return True, entry["results"][check]
+        self.misses += 1
+        return False, None
+
+    def store(self, check, name, result):
+        """Record a result for a part; returns it as it will be read back later."""
+        entry = self.parts.get(name)
+        if entry is None or entry["digest"] != self.digest(name):
+            entry = self.parts[name] = {"digest": self.digest(name), "results": {}}
+        # Round-trip through JSON so fresh and cached results look the same
+        # (tuples become lists, and so on)
+        result = json.loads(json.dumps(result))
+        entry["results"][check] = result
+        return result
+
+    def result(self, check, name, compute):
+        """Return the cached result of check for a part, computing it if needed.
+
+        Errors raised by compute are not cached, so they are reported again on
+        the next run.
+        """
+        found, result = self.lookup(check, name)
+        if found:
+            return result
+        return self.store(check, name, compute())
+
+    def original_result(self, check, name, compute):
+        """Like result(), for parts of the original document.
+
+        The original document is part of the cache key, so its results stay
+        valid for as long as the cache itself.
+        """
+        results = self.original.setdefault(name, {})
+        if check not in results:
+            results[check] = json.loads(json.dumps(compute()))
+        return results[check]
+
+    def save(self):
+        """Write the cache, dropping parts that no longer exist in the package."""
+        parts = {
+            name: entry for name, entry in self.parts.items() if name in self._digests
+        }
+        data = {"key": self.key, "parts": parts, "original": self.original}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, self.path)
@@ -0,0 +1,346 @@
+"""
+Parsed views of Office packages, shared by all validators of a run.
+"""
+
+import os
+import posixpath
+import re
+import zipfile
+from collections import namedtuple
+from pathlib import Path
+
+import lxml.etree
+
+from . import tags
+
+Relationship = namedtuple(
+    "Relationship", ["id", "type", "target", "target_mode", "sourceline"]
+)
+
+
+def part_sort_key(name):
+    """Sort key putting part names in one canonical order for every package type.
+
+    Like a recursive directory listing, each directory's files come before
+    its subdirectories; names are compared with numbers by value, so
+    chart2.xml sorts before chart10.xml.
+    """
+    *directories, filename = name.split("/")
+
+    def natural(component):
+        return [
+            int(token) if token.isdigit() else token
+            for token in re.split(r"(\d+)", component)
+        ]
+
+    return [(1, natural(d)) for d in directories] + [(0, natural(filename))]
+
+
+class PackageModel:
+    """Parts of an Office package, each parsed at most once.
+
+    Parts are addressed by their path relative to the package root, using
+    forward slashes (e.g. "ppt/slides/slide1.xml"). Parsed trees, parse
+    errors and relationship lists are memoized, so every validation pass
+    reuses the same work. Callers must not modify the returned trees.
+
+    Parts of STREAM_MIN_SIZE bytes or more are not parsed by check(), root()
+    and iterelements(): those stream the part instead, so their memory use
+    does not grow with its size. Trees that are no longer needed are dropped
+    with release(). Checks that need a whole tree (XSD validation, XPath
+    queries) still parse a large part in full while they run.
+    """
+
+    # Smaller parts are parsed: walking a tree is faster than streaming, and
+    # a tree this small is cheap to keep
+    STREAM_MIN_SIZE = 1 << 20
+
+    def __init__(self):
+        self._trees = {}
+        self._relationships = {}
+        self._roots = {}
+        self._names = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release any resources held by the package; parsed trees stay usable."""
+
+    def name_of(self, path):
+        """Return the part name of a path inside the package's root_dir."""
+        name = self._names.get(path)
+        if name is None:
+            name = Path(path).relative_to(self.root_dir).as_posix()
+            self._names[path] = name
+        return name
+
+    def exists(self, name):
+        raise NotImplementedError
+
+    def size(self, name):
+        """Return the uncompressed size of a part in bytes (0 if it is missing)."""
+        raise NotImplementedError
+
+    def read(self, name):
+        raise NotImplementedError
+
+    def open(self, name):
+        raise NotImplementedError
+
+    def _parse(self, name):
+        raise NotImplementedError
+
+    def tree(self, name):
+        """Return the parsed lxml tree of a part, parsing it on first use.
+
+        A part that fails to parse raises the same error on every call.
+        """
+        tree = self._trees.get(name)
+        if tree is None:
+            try:
+                tree = self._parse(name)
+            except Exception as e:
+                tree = e
+            self._trees[name] = tree
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
+    def release(self, name):
+        """Drop the parsed tree of a part; it is parsed again if needed later.
+
+        Parse errors stay memoized.
+        """
+        if not isinstance(self._trees.get(name), Exception):
+            self._trees.pop(name, None)
+
+    def is_large(self, name):
+        """Return True if a part is streamed rather than parsed when possible."""
+        return self.size(name) >= self.STREAM_MIN_SIZE
+
+    def streams(self, name):
+        """Return True if a part is read by streaming: it is large and not parsed."""
+        return name not in self._trees and self.is_large(name)
+
+    def check(self, name, visit=None):
+        """Raise the error a part fails to parse with.
+
+        A large part is streamed without keeping its tree, and its root
+        element is kept for root(). While it is streamed, visit (if given)
+        is called with each element in document order, so per-element checks
+        can share the pass; see iterelements() for what it may use. If
+        streaming fails, the part is parsed in full once, so the error is the
+        same one tree() raises.
+        """
+        if not self.streams(name):
+            self.tree(name)
+            return
+        try:
+            elements = self.iterelements(name)
+            root = next(elements)
+            self._roots[name] = self._copy_root(root)
+            if visit is None:
+                for _ in elements:
+                    pass
+            else:
+                visit(root)
+                for elem in elements:
+                    visit(elem)
+        except Exception:
+            self.tree(name)
+            raise
+
+    @staticmethod
+    def _copy_root(root):
+        """Return a childless copy of a root element, which survives streaming."""
+        return lxml.etree.Element(root.tag, dict(root.attrib), nsmap=root.nsmap)
+
+    def root(self, name):
+        """Return the root element of a part.
+
+        For a large part that has not been parsed, only its start is read:
+        the element has its tag, attributes and namespace map, but no content.
+        """
+        if not self.streams(name):
+            return self.tree(name).getroot()
+        root = self._roots.get(name)
+        if root is None:
+            elements = self.iterelements(name)
+            try:
+                root = self._roots[name] = self._copy_root(next(elements))
+            finally:
+                elements.close()
+        return root
+
+    def iterelements(self, name):
+        """Yield the elements of a part in document order.
+
+        A large part that has not been parsed is streamed with iterparse and
+        every element is cleared as soon as it ends, so memory use does not
+        grow with the part's size; other parts are parsed and their tree is
+        walked. Consumers may only use an element's tag, attributes,
+        sourceline and ancestors while it is current; its content may be
+        discarded later.
+        """
+        if not self.streams(name):
+            yield from self.tree(name).getroot().iter(lxml.etree.Element)
+            return
+
+        with self.open(name) as source:
+            for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+                if event == "start":
+                    yield elem
+                    continue
+                # Drop the finished element and the siblings before it
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    def relationships(self, rels_name):
+        """Return the Relationship entries of a .rels part in document order."""
+        relationships = self._relationships.get(rels_name)
+        if relationships is None:
+            root = self.tree(rels_name).getroot()
+            relationships = [
+                Relationship(
+                    rel.get("Id"),
+                    rel.get("Type", ""),
+                    rel.get("Target"),
+                    rel.get("TargetMode"),
+                    rel.sourceline,
+                )
+                for rel in root.iter(tags.REL_RELATIONSHIP)
+            ]
+            self._relationships[rels_name] = relationships
+        return relationships
+
+    @staticmethod
+    def rels_name(name):
+        """Return the name of the .rels part holding a part's relationships."""
+        directory, filename = posixpath.split(name)
+        return posixpath.join(directory, "_rels", f"{filename}.rels")
+
+
+class DirectoryPackage(PackageModel):
+    """Package model over an unpacked document directory.
+
+    The directory is scanned once, on first use, into a table of every file
+    in it. Existence checks and file listings are answered from that table
+    instead of the filesystem.
+    """
+
+    def __init__(self, root_dir):
+        super().__init__()
+        self.root_dir = Path(root_dir).resolve()
+        self._files = None
+
+    @property
+    def files(self):
+        """Map of part name -> os.stat_result for every file in the directory.
+
+        Names are in part_sort_key() order, the same as ZipPackage.files for
+        the zipped directory, whatever order the filesystem lists them in.
+        """
+        if self._files is None:
+            files = {}
+            self._scan(self.root_dir, "", files)
+            self._files = {
+                name: files[name] for name in sorted(files, key=part_sort_key)
+            }
+        return self._files
+
+    def _scan(self, directory, prefix, files):
+        with os.scandir(directory) as entries:
+            for entry in list(entries):
+                if entry.is_dir(follow_symlinks=False):
+                    self._scan(entry.path, f"{prefix}{entry.name}/", files)
+                elif entry.is_file():
+                    files[prefix + entry.name] = entry.stat()
+
+    def exists(self, name):
+        return name in self.files
+
+    def size(self, name):
+        stat = self.files.get(name)
+        return stat.st_size if stat is not None else 0
+
+    def read(self, name):
+        return (self.root_dir / name).read_bytes()
+
+    def open(self, name):
+        return open(self.root_dir / name, "rb")
+
+    def _parse(self, name):
+        return lxml.etree.parse(str(self.root_dir / name))
+
+
+class ZipPackage(PackageModel):
+    """Lazily opened package model over an Office document's zip archive.
+
+    Members are read straight from the archive when first needed, so a
+    validation run never extracts the document to disk. Member paths are
+    addressed as if the archive were a directory, e.g.
+    deck.pptx/ppt/slides/slide1.xml, so validators can treat both kinds of
+    package alike.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = Path(path)
+        self.root_dir = self.path.resolve()
+        self._zip = None
+        self._files = None
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    @property
+    def zip(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "r")
+        return self._zip
+
+    @property
+    def files(self):
+        """Map of member name -> ZipInfo for every file in the archive.
+
+        Names are in part_sort_key() order, not archive order, so a package
+        lists its parts the same way packed and unpacked.
+        """
+        if self._files is None:
+            infos = [info for info in self.zip.infolist() if not info.is_dir()]
+            infos.sort(key=lambda info: part_sort_key(info.filename))
+            self._files = {info.filename: info for info in infos}
+        return self._files
+
+    def exists(self, name):
+        """Return True if the archive has a member at the relative path name."""
+        return name in self.files
+
+    def size(self, name):
+        info = self.files.get(name)
+        return info.file_size if info is not None else 0
+
+    def read(self, name):
+        """Return the bytes of a member; raises KeyError if it is missing."""
+        return self.zip.read(name)
+
+    def open(self, name):
+        """Return a binary stream over a member, decompressed as it is read."""
+        return self.zip.open(name)
+
+    def _parse(self, name):
+        return lxml.etree.ElementTree(lxml.etree.fromstring(self.read(name)))
+
+
+def open_package(path):
+    """Return the package model for an unpacked directory or an Office file."""
+    if Path(path).is_dir():
+        return DirectoryPackage(path)
+    return ZipPackage(path)
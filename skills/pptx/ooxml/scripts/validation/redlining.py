@@ -2,117 +2,117 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+import copy
 from pathlib import Path
 
+import lxml.etree
+
+from . import tags
+from .package import ZipPackage, open_package
+from .word_diff import CHAR_PATTERN, WORD_PATTERN, word_diff
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_docx,
+        verbose=False,
+        original=None,
+        package=None,
+        cache=None,
+    ):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
-        self.namespaces = {
-            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-        }
+        self.cache = cache
+        self.package = package or open_package(self.unpacked_dir)
+        self.original = original or ZipPackage(self.original_docx)
+        self.namespaces = {"w": tags.WORD_NAMESPACE}
 
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
-        if not modified_file.exists():
+        if not self.package.exists("word/document.xml"):
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
+        # The outcome only depends on document.xml and the original document
+        if self.cache is None:
+            passed, message = self._check_tracked_changes()
+        else:
+            passed, message = self.cache.result(
+                "redlining", "word/document.xml", self._check_tracked_changes
+            )
+
+        if not passed or self.verbose:
+            print(message)
+        return passed
+
+    def _check_tracked_changes(self):
+        """Return (passed, message) for the tracked changes in document.xml."""
         # First, check if there are any tracked changes by Claude to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
+            root = self.package.tree("word/document.xml").getroot()
 
             # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
+            del_elements = root.iter(tags.W_DEL)
+            ins_elements = root.iter(tags.W_INS)
 
             # Filter to only include changes by Claude
             claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
+                elem for elem in del_elements if elem.get(tags.W_AUTHOR) == "Claude"
             ]
             claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
+                elem for elem in ins_elements if elem.get(tags.W_AUTHOR) == "Claude"
             ]
 
             # Redlining validation is only needed if tracked changes by Claude have been used.
             if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
+                return True, "PASSED - No tracked changes by Claude found."
 
         except Exception:
             # If we can't parse the XML, continue with full validation
             pass
 
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
-
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+        if not self.original.exists("word/document.xml"):
+            return (
+                False,
+                f"FAILED - Original document.xml not found in {self.original_docx}",
+            )
+
+        # Work on copies: the parsed trees are shared with the other validators
+        try:
+            modified_root = copy.deepcopy(
+                self.package.tree("word/document.xml").getroot()
+            )
+            original_root = copy.deepcopy(
+                self.original.tree("word/document.xml").getroot()
+            )
+        except lxml.etree.XMLSyntaxError as e:
+            return False, f"FAILED - Error parsing XML files: {e}"
+        except Exception as e:
+            return False, f"FAILED - Error reading original docx: {e}"
+
+        # Remove Claude's tracked changes from both documents
+        self._remove_claude_tracked_changes(original_root)
+        self._remove_claude_tracked_changes(modified_root)
+
+        # Extract and compare text content
+        modified_text = self._extract_text_content(modified_root)
+        original_text = self._extract_text_content(original_root)
+
+        if modified_text != original_text:
+            # Show detailed character-level differences for each paragraph
+            return False, self._generate_detailed_diff(original_text, modified_text)
+
+        return True, "PASSED - All changes by Claude are properly tracked"
 
     def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        """Generate detailed word-level differences between the two texts."""
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -127,98 +127,30 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
+        # Show word diff
+        diff = self._get_word_diff(original_text, modified_text)
+        if diff:
+            error_parts.extend(["Differences:", "============", diff])
         else:
-            error_parts.append("Unable to generate word diff (git not available)")
+            error_parts.append("Unable to generate word diff")
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
+    def _get_word_diff(self, original_text, modified_text):
+        """Generate a word diff with character-level precision."""
+        # Try character-level diff first for precise differences
+        diff = word_diff(original_text, modified_text, CHAR_PATTERN)
+        if diff:
+            return diff
 
-        return None
+        # Fall back to word-level diff
+        return word_diff(original_text, modified_text, WORD_PATTERN) or None
 
     def _remove_claude_tracked_changes(self, root):
         """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
+        ins_tag = tags.W_INS
+        del_tag = tags.W_DEL
+        author_attr = tags.W_AUTHOR
 
         # Remove w:ins elements
         for parent in root.iter():
@@ -230,8 +162,8 @@ class RedliningValidator:
                 parent.remove(elem)
 
         # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
+        deltext_tag = tags.W_DEL_TEXT
+        t_tag = tags.W_T
 
         for parent in root.iter():
             to_process = []
@@ -257,14 +189,11 @@ class RedliningValidator:
         Empty paragraphs are skipped to avoid false positives when tracked
         insertions add only structural elements without text content.
         """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
         paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
+        for p_elem in root.iter(tags.W_P):
             # Get all text elements within this paragraph
             text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
+            for t_elem in p_elem.iter(tags.W_T):
                 if t_elem.text:
                     text_parts.append(t_elem.text)
             paragraph_text = "".join(text_parts)
@@ -0,0 +1,112 @@
+"""
+Compiled XSD schemas shared by all validators in the process.
+
+Compiling a schema such as pml.xsd or wml.xsd (with every schema it imports)
+costs far more than validating a part against it, so each schema is compiled
+once per process and reused for every file, including the original copies.
+
+Schemas can optionally be read from a bundle: a single zip file holding every
+schema document reachable from the mapped schemas through xsd:import,
+xsd:include and xsd:redefine. Imports are then served from memory instead of
+being looked up and read one file at a time.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+XSD_NAMESPACE = "http://www.w3.org/2001/XMLSchema"
+SCHEMA_REFERENCES = tuple(
+    f"{{{XSD_NAMESPACE}}}{name}" for name in ("import", "include", "redefine")
+)
+
+# Schema path -> compiled lxml.etree.XMLSchema
+_compiled_schemas = {}
+# Schema documents from the active bundle: absolute path -> bytes
+_bundle_documents = {}
+# (bundle_path, schemas_dir) of the active bundle, for worker processes
+_bundle_source = None
+
+
+class _BundleResolver(lxml.etree.Resolver):
+    """Serve imported schema documents from the active bundle."""
+
+    def resolve(self, url, pubid, context):
+        content = _bundle_documents.get(_normalize_url(url))
+        if content is None:
+            return None  # Fall back to the default lookup
+        return self.resolve_string(content, context, base_url=url)
+
+
+def _normalize_url(url):
+    if url.startswith("file://"):
+        url = url[len("file://") :]
+    return os.path.normpath(url)
+
+
+def load_schema(schema_path):
+    """Return the compiled schema at schema_path, compiling it on first use."""
+    schema = _compiled_schemas.get(schema_path)
+    if schema is None:
+        # Imports resolve against the base URL, so use the same resolved form
+        # as the bundle keys
+        base_url = str(Path(schema_path).resolve())
+        parser = lxml.etree.XMLParser()
+        parser.resolvers.add(_BundleResolver())
+        content = _bundle_documents.get(base_url)
+        if content is not None:
+            xsd_doc = lxml.etree.fromstring(
+                content, parser=parser, base_url=base_url
+            ).getroottree()
+        else:
+            with open(schema_path, "rb") as xsd_file:
+                xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=base_url)
+        schema = lxml.etree.XMLSchema(xsd_doc)
+        _compiled_schemas[schema_path] = schema
+    return schema
+
+
+def schema_closure(root_paths):
+    """Return every local schema file reachable from root_paths, in a stable order."""
+    found = set()
+    pending = [Path(p).resolve() for p in root_paths]
+    while pending:
+        path = pending.pop()
+        if path in found or not path.is_file():
+            continue
+        found.add(path)
+        for event, element in lxml.etree.iterparse(str(path), tag=SCHEMA_REFERENCES):
+            location = element.get("schemaLocation")
+            # Remote locations (http://...) are left to the default lookup
+            if location and "://" not in location:
+                pending.append((path.parent / location).resolve())
+    return sorted(found)
+
+
+def build_schema_bundle(schemas_dir, root_paths, bundle_path):
+    """Write the schemas reachable from root_paths to a bundle zip file."""
+    schemas_dir = Path(schemas_dir).resolve()
+    bundle_path = Path(bundle_path)
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    paths = schema_closure(root_paths)
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path in paths:
+            zf.write(path, path.relative_to(schemas_dir).as_posix())
+    return len(paths)
+
+
+def use_schema_bundle(bundle_path, schemas_dir):
+    """Read schema documents from a bundle built for schemas_dir from now on."""
+    global _bundle_source
+    _bundle_source = (str(bundle_path), str(schemas_dir))
+    schemas_dir = Path(schemas_dir).resolve()
+    with zipfile.ZipFile(bundle_path) as zf:
+        for name in zf.namelist():
+            _bundle_documents[str(schemas_dir / name)] = zf.read(name)
+
+
+def active_schema_bundle():
+    """Return (bundle_path, schemas_dir) of the bundle in use, or None."""
+    return _bundle_source
@@ -0,0 +1,86 @@
+"""
+Namespaces and Clark-notation tags shared by the validators.
+
+Validators compare element tags and attribute names against the constants
+below instead of formatting "{namespace}name" strings or splitting tags in
+their loops. local_name(), lower_local_name() and namespace_of() remember
+their answer for every name they have seen: a package uses a few hundred
+distinct names across many thousands of elements, so after the first
+element each lookup is a single dict hit.
+"""
+
+import sys
+
+MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+OFFICE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+PRESENTATIONML_NAMESPACE = "http://schemas.openxmlformats.org/presentationml/2006/main"
+
+
+def clark(namespace, name):
+    """Return the interned Clark-notation name {namespace}name."""
+    return sys.intern(f"{{{namespace}}}{name}")
+
+
+# Markup compatibility
+MC_ALTERNATE_CONTENT = clark(MC_NAMESPACE, "AlternateContent")
+MC_IGNORABLE = clark(MC_NAMESPACE, "Ignorable")
+
+# XML
+XML_SPACE = clark(XML_NAMESPACE, "space")
+
+# Package parts
+REL_RELATIONSHIP = clark(PACKAGE_RELATIONSHIPS_NAMESPACE, "Relationship")
+R_ID = clark(OFFICE_RELATIONSHIPS_NAMESPACE, "id")
+CT_DEFAULT = clark(CONTENT_TYPES_NAMESPACE, "Default")
+CT_OVERRIDE = clark(CONTENT_TYPES_NAMESPACE, "Override")
+
+# WordprocessingML
+W_P = clark(WORD_NAMESPACE, "p")
+W_T = clark(WORD_NAMESPACE, "t")
+W_INS = clark(WORD_NAMESPACE, "ins")
+W_DEL = clark(WORD_NAMESPACE, "del")
+W_DEL_TEXT = clark(WORD_NAMESPACE, "delText")
+W_AUTHOR = clark(WORD_NAMESPACE, "author")
+
+# PresentationML
+P_SLD_LAYOUT_ID = clark(PRESENTATIONML_NAMESPACE, "sldLayoutId")
+
+_local_names = {}
+_lower_local_names = {}
+_namespaces = {}
+
+
+def local_name(name):
+    """Return the local part of a tag or attribute name, e.g. "sldId"."""
+    try:
+        return _local_names[name]
+    except KeyError:
+        local = _local_names[name] = sys.intern(name[name.rfind("}") + 1 :])
+        return local
+
+
+def lower_local_name(name):
+    """Return the lowercased local part of a tag or attribute name."""
+    try:
+        return _lower_local_names[name]
+    except KeyError:
+        lower = _lower_local_names[name] = sys.intern(local_name(name).lower())
+        return lower
+
+
+def namespace_of(name):
+    """Return the namespace URI of a tag or attribute name ("" if it has none)."""
+    try:
+        return _namespaces[name]
+    except KeyError:
+        namespace = name[1 : name.find("}")] if name.startswith("{") else ""
+        _namespaces[name] = namespace = sys.intern(namespace)
+        return namespace
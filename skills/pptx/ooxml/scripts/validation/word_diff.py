@@ -0,0 +1,500 @@
+"""
+In-process word diff, formatted like `git diff --word-diff=plain -U0`.
+
+The texts are first compared line by line. Each group of changed lines is
+then compared token by token and printed from the modified side, with removed
+tokens as [-...-] and added tokens as {+...+}.
+
+Both comparisons follow git's xdiff: items with no match on the other side
+are set aside first, the rest is diffed by Myers' algorithm in linear space,
+splitting each region at the middle of its edit path, and changes are then
+slid as far down as they go. Past a cost cutoff, a region is split at the
+most promising point found so far rather than at the exact middle, so large
+diffs stay fast but are still refined down to single tokens. The output is
+the same as git's, except that git's indent heuristic, which only moves
+whole changed lines, is not reproduced.
+"""
+
+import re
+import sys
+
+# git's default word definition: runs of characters that are not isspace()
+WORD_PATTERN = re.compile(r"[^ \t\n\v\f\r]+")
+# --word-diff-regex=. : every character except newlines is a token
+CHAR_PATTERN = re.compile(r"[^\n]")
+
+# Tuning constants of git's xdiff, which the diff below follows
+SNAKE_CNT = 20  # A snake this long is a good place to split
+HEUR_MIN_COST = 256  # Cost after which such snakes are looked for
+MAX_COST_MIN = 256  # Least cost after which the furthest path is taken
+K_HEUR = 4  # How far a path must have got per edit to split at its snake
+SIMSCAN_WINDOW = 100  # Items scanned around a many-matched item
+MAX_EQLIMIT = 1024  # Most matches an item can have before it counts as many
+KPDIS_RUN = 4  # Many-matched items discarded if under 1/KPDIS_RUN of a run
+
+
+def word_diff(original, modified, pattern=WORD_PATTERN):
+    """Return the changed lines of modified, annotated against original.
+
+    Only lines belonging to a change are returned (no context), joined by
+    newlines, without blank lines. Returns "" if the texts are equal.
+    """
+    a = _lines(original)
+    b = _lines(modified)
+    output = []
+    for i1, i2, j1, j2 in diff_blocks(a, b):
+        output.append(_annotate("".join(a[i1:i2]), "".join(b[j1:j2]), pattern))
+    return "\n".join(
+        line for hunk in output for line in hunk.split("\n") if line.strip()
+    )
+
+
+def _lines(text):
+    """Split text into lines, keeping each line's newline."""
+    parts = text.split("\n")
+    lines = [part + "\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines
+
+
+def _annotate(minus, plus, pattern):
+    """Word-diff one group of changed lines, printed from the plus side."""
+    if not plus:
+        return _styled(minus, "[-", "-]")
+
+    minus_tokens = [match.span() for match in pattern.finditer(minus)]
+    plus_tokens = [match.span() for match in pattern.finditer(plus)]
+    blocks = diff_blocks(
+        [minus[start:end] for start, end in minus_tokens],
+        [plus[start:end] for start, end in plus_tokens],
+    )
+
+    output = []
+    current = 0  # Position in plus up to which text has been printed
+    for i1, i2, j1, j2 in blocks:
+        if j2 > j1:
+            plus_begin, plus_end = plus_tokens[j1][0], plus_tokens[j2 - 1][1]
+        else:
+            # Pure removal: it goes right after the preceding plus token
+            plus_begin = plus_end = plus_tokens[j1 - 1][1] if j1 else 0
+        if current != plus_begin:
+            output.append(_styled(plus[current:plus_begin], "", ""))
+        if i2 > i1:
+            removed = minus[minus_tokens[i1][0] : minus_tokens[i2 - 1][1]]
+            output.append(_styled(removed, "[-", "-]"))
+        if j2 > j1:
+            output.append(_styled(plus[plus_begin:plus_end], "{+", "+}"))
+        current = plus_end
+    if current != len(plus):
+        output.append(_styled(plus[current:], "", ""))
+    return "".join(output)
+
+
+def _styled(text, prefix, suffix):
+    """Wrap every non-empty line of text in prefix and suffix."""
+    return "\n".join(
+        prefix + segment + suffix if segment else "" for segment in text.split("\n")
+    )
+
+
+def diff_blocks(a, b):
+    """Return the differing blocks of two sequences as (i1, i2, j1, j2) tuples.
+
+    Each block replaces a[i1:i2] with b[j1:j2]; blocks are in order and
+    separated by at least one common item.
+    """
+    a_changed, b_changed = _xdiff(a, b)
+    _compact(a, a_changed, b_changed)
+    _compact(b, b_changed, a_changed)
+
+    blocks = []
+    i = j = 0
+    while i < len(a) or j < len(b):
+        if i < len(a) and j < len(b) and not a_changed[i] and not b_changed[j]:
+            i += 1
+            j += 1
+            continue
+        i1, j1 = i, j
+        while i < len(a) and a_changed[i]:
+            i += 1
+        while j < len(b) and b_changed[j]:
+            j += 1
+        blocks.append((i1, i, j1, j))
+    return blocks
+
+
+def _bogosqrt(n):
+    """xdiff's power-of-two approximation of sqrt(n)."""
+    i = 1
+    while n > 0:
+        n >>= 2
+        i <<= 1
+    return i
+
+
+def _xdiff(a, b):
+    """Return the changed flags of a and b, found the way xdl_do_diff() does.
+
+    The common prefix and suffix are skipped, items without a match in
+    the other sequence are marked changed up front, and the rest is
+    diffed by _compare().
+    """
+    classes = {}
+    ha = [classes.setdefault(item, len(classes)) for item in a]
+    hb = [classes.setdefault(item, len(classes)) for item in b]
+    a_changed = [False] * len(a)
+    b_changed = [False] * len(b)
+
+    start = 0
+    while start < len(a) and start < len(b) and ha[start] == hb[start]:
+        start += 1
+    a_end, b_end = len(a), len(b)
+    while a_end > start and b_end > start and ha[a_end - 1] == hb[b_end - 1]:
+        a_end -= 1
+        b_end -= 1
+
+    a_index = _cleanup(ha, hb, start, a_end, a_changed)
+    b_index = _cleanup(hb, ha, start, b_end, b_changed)
+    _compare(
+        [ha[i] for i in a_index],
+        [hb[j] for j in b_index],
+        a_index,
+        b_index,
+        a_changed,
+        b_changed,
+    )
+    return a_changed, b_changed
+
+
+def _cleanup(hashes, other_hashes, start, end, changed):
+    """Discard the items of hashes[start:end] that cannot be matched.
+
+    Like xdl_cleanup_records(), an item without a match in the other
+    sequence is marked changed, and so is an item with many matches that
+    sits among such items (see xdl_clean_mmatch()). Returns the indices of
+    the items left to diff.
+    """
+    other_counts = {}
+    for h in other_hashes:
+        other_counts[h] = other_counts.get(h, 0) + 1
+    limit = min(_bogosqrt(len(hashes)), MAX_EQLIMIT)
+    # 0: no match, 1: a few matches, 2: many matches
+    discard = []
+    for i in range(start, end):
+        matches = other_counts.get(hashes[i], 0)
+        discard.append(0 if matches == 0 else 2 if matches >= limit else 1)
+
+    # A many-matched item is judged by the items around it, up to the
+    # nearest item with a few matches and at most SIMSCAN_WINDOW away.
+    # Precompute where those runs start and end, and how many unmatched
+    # items they hold, instead of scanning them for every item.
+    n = len(discard)
+    run_start = [0] * n
+    first = 0
+    for k in range(n):
+        run_start[k] = first
+        if discard[k] == 1:
+            first = k + 1
+    run_end = [0] * n
+    last = n - 1
+    for k in range(n - 1, -1, -1):
+        run_end[k] = last
+        if discard[k] == 1:
+            last = k - 1
+    unmatched_upto = [0]  # Unmatched items in discard[:k]
+    for value in discard:
+        unmatched_upto.append(unmatched_upto[-1] + (value == 0))
+
+    kept = []
+    for k in range(n):
+        keep = discard[k] == 1
+        if discard[k] == 2:
+            lo = max(run_start[k], k - SIMSCAN_WINDOW)
+            hi = min(run_end[k], k + SIMSCAN_WINDOW)
+            unmatched_before = unmatched_upto[k] - unmatched_upto[lo]
+            unmatched_after = unmatched_upto[hi + 1] - unmatched_upto[k + 1]
+            if not unmatched_before or not unmatched_after:
+                keep = True
+            else:
+                unmatched = unmatched_before + unmatched_after
+                # Item k is counted once for either side, as xdiff does
+                multimatch = (hi - lo + 2) - unmatched
+                keep = multimatch * KPDIS_RUN >= multimatch + unmatched
+        if keep:
+            kept.append(start + k)
+        else:
+            changed[start + k] = True
+    return kept
+
+
+def _compare(ha, hb, a_index, b_index, a_changed, b_changed):
+    """Mark the changed items of ha and hb, port of xdl_recs_cmp().
+
+    Each box is split at the middle of an edit path by _split() and both
+    halves are compared in turn. A split that had to give up on finding
+    the middle of a minimal path may make the diff larger than minimal,
+    but every box is still refined down to single items.
+    """
+    ndiags = len(ha) + len(hb) + 3
+    offset = len(hb) + 1  # Diagonal k is at index k + offset
+    # Furthest item of ha reached on each diagonal, forward and backward
+    diagonals = ([0] * (ndiags + 1), [0] * (ndiags + 1), offset)
+    max_cost = max(_bogosqrt(ndiags), MAX_COST_MIN)
+
+    boxes = [(0, len(ha), 0, len(hb), False)]
+    while boxes:
+        a_lo, a_hi, b_lo, b_hi, need_min = boxes.pop()
+        # Shrink the box by walking through the snakes at either end
+        while a_lo < a_hi and b_lo < b_hi and ha[a_lo] == hb[b_lo]:
+            a_lo += 1
+            b_lo += 1
+        while a_lo < a_hi and b_lo < b_hi and ha[a_hi - 1] == hb[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+
+        if a_lo == a_hi:
+            for j in range(b_lo, b_hi):
+                b_changed[b_index[j]] = True
+        elif b_lo == b_hi:
+            for i in range(a_lo, a_hi):
+                a_changed[a_index[i]] = True
+        else:
+            i, j, min_lo, min_hi = _split(
+                ha, hb, (a_lo, a_hi, b_lo, b_hi), need_min, diagonals, max_cost
+            )
+            boxes.append((i, a_hi, j, b_hi, min_hi))
+            boxes.append((a_lo, i, b_lo, j, min_lo))
+
+
+def _split(ha, hb, box, need_min, diagonals, max_cost):
+    """Return (i, j, min_lo, min_hi): where to split a box, port of xdl_split().
+
+    Forward and backward paths are extended one edit at a time until they
+    meet, which is the middle of a minimal edit path. Unless need_min is
+    set, the search stops early once it is expensive: at a long snake far
+    along its path, or at the furthest reaching path when the cost reaches
+    max_cost. min_lo and min_hi tell whether the half before and after
+    the split must then be diffed minimally.
+    """
+    a_lo, a_hi, b_lo, b_hi = box
+    kvdf, kvdb, offset = diagonals
+    dmin, dmax = a_lo - b_hi, a_hi - b_lo
+    fmid, bmid = a_lo - b_lo, a_hi - b_hi
+    odd = (fmid - bmid) & 1
+    fmin = fmax = fmid
+    bmin = bmax = bmid
+    kvdf[fmid + offset] = a_lo
+    kvdb[bmid + offset] = a_hi
+
+    ec = 0
+    while True:
+        ec += 1
+        got_snake = False
+
+        # Extend the forward diagonal range by one, staying inside the box
+        if fmin > dmin:
+            fmin -= 1
+            kvdf[fmin - 1 + offset] = -1
+        else:
+            fmin += 1
+        if fmax < dmax:
+            fmax += 1
+            kvdf[fmax + 1 + offset] = -1
+        else:
+            fmax -= 1
+
+        for d in range(fmax, fmin - 1, -2):
+            if kvdf[d - 1 + offset] >= kvdf[d + 1 + offset]:
+                i1 = kvdf[d - 1 + offset] + 1
+            else:
+                i1 = kvdf[d + 1 + offset]
+            prev = i1
+            i2 = i1 - d
+            while i1 < a_hi and i2 < b_hi and ha[i1] == hb[i2]:
+                i1 += 1
+                i2 += 1
+            if i1 - prev > SNAKE_CNT:
+                got_snake = True
+            kvdf[d + offset] = i1
+            if odd and bmin <= d <= bmax and kvdb[d + offset] <= i1:
+                return i1, i2, True, True
+
+        # Same for the backward diagonal range
+        if bmin > dmin:
+            bmin -= 1
+            kvdb[bmin - 1 + offset] = sys.maxsize
+        else:
+            bmin += 1
+        if bmax < dmax:
+            bmax += 1
+            kvdb[bmax + 1 + offset] = sys.maxsize
+        else:
+            bmax -= 1
+
+        for d in range(bmax, bmin - 1, -2):
+            if kvdb[d - 1 + offset] < kvdb[d + 1 + offset]:
+                i1 = kvdb[d - 1 + offset]
+            else:
+                i1 = kvdb[d + 1 + offset] - 1
+            prev = i1
+            i2 = i1 - d
+            while i1 > a_lo and i2 > b_lo and ha[i1 - 1] == hb[i2 - 1]:
+                i1 -= 1
+                i2 -= 1
+            if prev - i1 > SNAKE_CNT:
+                got_snake = True
+            kvdb[d + offset] = i1
+            if not odd and fmin <= d <= fmax and i1 <= kvdf[d + offset]:
+                return i1, i2, True, True
+
+        if need_min:
+            continue
+
+        # Past HEUR_MIN_COST, settle for a path that got far, ending in a
+        # long snake, if there is one
+        if got_snake and ec > HEUR_MIN_COST:
+            best = 0
+            for d in range(fmax, fmin - 1, -2):
+                i1 = kvdf[d + offset]
+                i2 = i1 - d
+                v = (i1 - a_lo) + (i2 - b_lo) - abs(d - fmid)
+                if (
+                    v > K_HEUR * ec
+                    and v > best
+                    and a_lo + SNAKE_CNT <= i1 < a_hi
+                    and b_lo + SNAKE_CNT <= i2 < b_hi
+                    and ha[i1 - SNAKE_CNT : i1] == hb[i2 - SNAKE_CNT : i2]
+                ):
+                    best, split = v, (i1, i2)
+            if best > 0:
+                return split + (True, False)
+
+            best = 0
+            for d in range(bmax, bmin - 1, -2):
+                i1 = kvdb[d + offset]
+                i2 = i1 - d
+                v = (a_hi - i1) + (b_hi - i2) - abs(d - bmid)
+                if (
+                    v > K_HEUR * ec
+                    and v > best
+                    and a_lo < i1 <= a_hi - SNAKE_CNT
+                    and b_lo < i2 <= b_hi - SNAKE_CNT
+                    and ha[i1 : i1 + SNAKE_CNT] == hb[i2 : i2 + SNAKE_CNT]
+                ):
+                    best, split = v, (i1, i2)
+            if best > 0:
+                return split + (False, True)
+
+        # Enough is enough: split at the furthest reaching path
+        if ec >= max_cost:
+            fbest = fbest1 = -1
+            for d in range(fmax, fmin - 1, -2):
+                i1 = min(kvdf[d + offset], a_hi)
+                i2 = i1 - d
+                if b_hi < i2:
+                    i1, i2 = b_hi + d, b_hi
+                if fbest < i1 + i2:
+                    fbest, fbest1 = i1 + i2, i1
+
+            bbest = bbest1 = sys.maxsize
+            for d in range(bmax, bmin - 1, -2):
+                i1 = max(a_lo, kvdb[d + offset])
+                i2 = i1 - d
+                if i2 < b_lo:
+                    i1, i2 = b_lo + d, b_lo
+                if i1 + i2 < bbest:
+                    bbest, bbest1 = i1 + i2, i1
+
+            if (a_hi + b_hi) - bbest < fbest - (a_lo + b_lo):
+                return fbest1, fbest - fbest1, True, False
+            return bbest1, bbest - bbest1, False, True
+
+
+class _Group:
+    """A run of changed items [start, end) in one sequence; may be empty."""
+
+    def __init__(self, changed):
+        self.changed = changed
+        self.start = self.end = 0
+        while self.end < len(changed) and changed[self.end]:
+            self.end += 1
+
+    def next(self):
+        if self.end == len(self.changed):
+            return False
+        self.start = self.end = self.end + 1
+        while self.end < len(self.changed) and self.changed[self.end]:
+            self.end += 1
+        return True
+
+    def previous(self):
+        if self.start == 0:
+            return False
+        self.start = self.end = self.start - 1
+        while self.start > 0 and self.changed[self.start - 1]:
+            self.start -= 1
+        return True
+
+    def slide_down(self, items):
+        if self.end < len(items) and items[self.start] == items[self.end]:
+            self.changed[self.start] = False
+            self.changed[self.end] = True
+            self.start += 1
+            self.end += 1
+            while self.end < len(self.changed) and self.changed[self.end]:
+                self.end += 1
+            return True
+        return False
+
+    def slide_up(self, items):
+        if self.start > 0 and items[self.start - 1] == items[self.end - 1]:
+            self.start -= 1
+            self.end -= 1
+            self.changed[self.start] = True
+            self.changed[self.end] = False
+            while self.start > 0 and self.changed[self.start - 1]:
+                self.start -= 1
+            return True
+        return False
+
+
+def _compact(items, changed, other_changed):
+    """Slide groups of changes the way xdiff's xdl_change_compact() does.
+
+    Each group is moved as far down as it can go, merging with the groups it
+    meets, unless it can line up with a change in the other sequence.
+    """
+    group = _Group(changed)
+    other = _Group(other_changed)
+    while True:
+        if group.end != group.start:
+            while True:
+                size = group.end - group.start
+                end_matching_other = -1
+
+                # Shift the group up as much as possible
+                while group.slide_up(items):
+                    other.previous()
+                earliest_end = group.end
+                if other.end > other.start:
+                    end_matching_other = group.end
+
+                # Then down as far as possible
+                while group.slide_down(items):
+                    other.next()
+                    if other.end > other.start:
+                        end_matching_other = group.end
+
+                if size == group.end - group.start:
+                    break
+
+            # Line the group up with the last change in the other sequence
+            if group.end != earliest_end and end_matching_other != -1:
+                while other.end == other.start:
+                    group.slide_up(items)
+                    other.previous()
+
+        if not group.next():
+            break
+        other.next()
@@ -0,0 +1,197 @@
+"""Streaming whitespace rewriting for Office XML parts, shared by pack.py and unpack.py.
+
+Parts are read with lxml's iterparse and written out as they are parsed, so
+only the path from the root to the current element is kept in memory.
+Whitespace-only text is dropped everywhere except inside text elements
+(<a:t>, <w:t>, <t>), whose content is preserved exactly. Entities are never
+resolved and DTDs are rejected, so parts cannot pull in external content.
+"""
+
+import io
+
+from lxml import etree
+
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+WRITE_BUFFER_SIZE = 4096  # Strings buffered before writing to the output
+
+
+def local_name(tag):
+    return tag[tag.rfind("}") + 1 :]
+
+
+def escape_text(text):
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value):
+    return (
+        escape_text(value)
+        .replace('"', "&quot;")
+        .replace("\n", "&#10;")
+        .replace("\r", "&#13;")
+        .replace("\t", "&#9;")
+    )
+
+
+def attribute_name(key, node):
+    """Return the attribute name with the prefix in scope on node."""
+    if key[0] != "{":
+        return key
+    namespace, local = key[1:].split("}", 1)
+    if namespace == XML_NS:
+        return f"xml:{local}"
+    # Attributes cannot use the default namespace, so look for a prefix
+    for prefix, uri in node.nsmap.items():
+        if prefix and uri == namespace:
+            return f"{prefix}:{local}"
+    return local
+
+
+def rewrite_xml(source, dest, pretty=False, indent="  "):
+    """Rewrite an XML part from `source` to `dest` (binary file objects).
+
+    By default the part is condensed: whitespace-only text and comments
+    outside text elements are dropped. With pretty=True, comments are kept
+    and elements are indented instead.
+    """
+    out = []
+    write = out.append
+
+    def flush():
+        dest.write("".join(out).encode("utf-8"))
+        out.clear()
+
+    # Per open element: [qualified name, start tag still open, has child nodes,
+    # is a text element]
+    stack = []
+    pending_ns = []
+    names = {}  # (tag, prefix) -> (qualified name, is a text element)
+
+    def open_content():
+        """Close the current start tag before writing content into it."""
+        if stack[-1][1]:
+            write(">")
+            stack[-1][1] = False
+
+    def write_text(text):
+        """Write text into the innermost open element, dropping bare whitespace."""
+        if text and (stack[-1][3] or not text.isspace()):
+            open_content()
+            write(escape_text(text))
+
+    def preceding_text(node):
+        """Text between a node and its previous sibling (or parent start)."""
+        previous = node.getprevious()
+        return previous.tail if previous is not None else node.getparent().text
+
+    def new_line():
+        if pretty and not stack[-1][3]:
+            open_content()
+            write("\n" + indent * len(stack))
+
+    def release(node):
+        """Free nodes that have been written completely."""
+        node.clear(keep_tail=True)
+        parent = node.getparent()
+        if parent is not None:
+            while node.getprevious() is not None:
+                del parent[0]
+
+    parser = etree.iterparse(
+        source,
+        events=("start-ns", "start", "end", "comment", "pi"),
+        resolve_entities=False,
+        load_dtd=False,
+        no_network=True,
+        huge_tree=True,
+        remove_comments=False,
+        remove_pis=False,
+    )
+
+    started = False
+    after_root = False
+    for event, node in parser:
+        if event == "start-ns":
+            pending_ns.append(node)
+            continue
+
+        if not started:
+            started = True
+            docinfo = node.getroottree().docinfo
+            if docinfo.doctype:
+                raise ValueError("DTDs are not allowed in Office XML parts")
+            declaration = '<?xml version="1.0" encoding="UTF-8"'
+            if docinfo.standalone:
+                declaration += ' standalone="yes"'
+            write(declaration + "?>" + ("\n" if pretty else ""))
+
+        if event == "start":
+            if stack:
+                write_text(preceding_text(node))
+                open_content()
+                stack[-1][2] = True
+                new_line()
+
+            key = (node.tag, node.prefix)
+            if key not in names:
+                local = local_name(node.tag)
+                names[key] = (
+                    f"{node.prefix}:{local}" if node.prefix else local,
+                    local == "t",
+                )
+            name, is_text = names[key]
+
+            write(f"<{name}")
+            for prefix, uri in pending_ns:
+                attribute = f"xmlns:{prefix}" if prefix else "xmlns"
+                write(f' {attribute}="{escape_attribute(uri)}"')
+            pending_ns.clear()
+            for key, value in node.attrib.items():
+                write(f' {attribute_name(key, node)}="{escape_attribute(value)}"')
+            stack.append([name, True, False, is_text])
+
+        elif event == "end":
+            last = node[-1] if len(node) else None
+            write_text(last.tail if last is not None else node.text)
+            name, tag_open, has_children, is_text = stack.pop()
+            if tag_open:
+                write("/>")
+            else:
+                if has_children and pretty and not is_text:
+                    write("\n" + indent * len(stack))
+                write(f"</{name}>")
+            release(node)
+            after_root = not stack
+
+        elif not stack:
+            # Comments and processing instructions outside the root element
+            # are kept on their own lines
+            if pretty and after_root:
+                write("\n")
+            write(etree.tostring(node, encoding="unicode", with_tail=False))
+            if pretty and not after_root:
+                write("\n")
+
+        else:
+            write_text(preceding_text(node))
+            if event == "pi" or pretty or stack[-1][3]:
+                open_content()
+                stack[-1][2] = True
+                new_line()
+                write(etree.tostring(node, encoding="unicode", with_tail=False))
+
+        if len(out) >= WRITE_BUFFER_SIZE:
+            flush()
+
+    if pretty:
+        write("\n")
+    flush()
+
+
+def condense_xml_bytes(content):
+    """Condense XML bytes in memory and return the result."""
+    dest = io.BytesIO()
+    rewrite_xml(io.BytesIO(content), dest)
+    return dest.getvalue()
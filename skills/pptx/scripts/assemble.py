@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Assemble a presentation from slides of several source decks.
+
+Used by rearrange.py --manifest:
+    python rearrange.py template.pptx output.pptx --manifest manifest.json
+
+The manifest is a JSON list of {"source": "library.pptx", "slide": 3} entries
+(0-based slide indices, source paths relative to the manifest). The template
+provides the presentation-level parts (slide size, themes, properties); its
+own slides are only included when the manifest lists them.
+
+Packages are handled at the zip level rather than through python-pptx:
+each source is opened once, slide masters and layouts are merged by content
+hash, images and media are copied once per unique blob, and parts are
+streamed into the output zip as they are produced.
+"""
+
+import hashlib
+import json
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+
+from lxml import etree
+
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+# Relationship types (by their last path segment) handled specially
+SHARED_RELTYPES = {"image", "media", "video", "audio", "hdphoto"}
+SKIPPED_RELTYPES = {"notesSlide", "comments"}
+HASH_SKIPPED_RELTYPES = {"slideLayout", "slideMaster", "slide", "notesSlide"}
+
+# Elements removed when the slide they link to is not part of the output
+LINK_TAGS = {f"{{{A_NS}}}hlinkClick", f"{{{A_NS}}}hlinkHover"}
+
+MIN_SLIDE_ID = 256
+MIN_MASTER_ID = 2147483648
+
+
+def reltype_name(reltype):
+    """Return the short name of a relationship type, e.g. 'slideLayout'."""
+    return reltype.rsplit("/", 1)[-1]
+
+
+def rels_path(partname):
+    """Return the zip member holding the relationships of a partname."""
+    directory, name = posixpath.split(partname)
+    return posixpath.join(directory, "_rels", f"{name}.rels").lstrip("/")
+
+
+def partname_template(partname):
+    """Turn '/ppt/media/image12.png' into '/ppt/media/image%d.png'."""
+    return re.sub(r"\d*(\.\w+)$", r"%d\1", partname)
+
+
+def serialize(root):
+    """Serialize an XML part the way PowerPoint writes them."""
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def load_manifest(manifest_path):
+    """Load manifest entries as (source path, slide index) pairs."""
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if not isinstance(data, list):
+        raise ValueError("Manifest must be a JSON list of entries")
+
+    entries = []
+    for i, entry in enumerate(data):
+        if not isinstance(entry, dict) or "source" not in entry or "slide" not in entry:
+            raise ValueError(f'Manifest entry {i} needs "source" and "slide"')
+        if not isinstance(entry["slide"], int):
+            raise ValueError(f"Manifest entry {i}: slide must be an integer")
+        entries.append(
+            ((manifest_path.parent / entry["source"]).resolve(), entry["slide"])
+        )
+    return entries
+
+
+class SourcePackage:
+    """Read-only view of a .pptx zip: parts, relationships and content types."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.zip = zipfile.ZipFile(path)
+        self._rels = {}
+        self._hashes = {}
+
+        types = etree.fromstring(self.zip.read("[Content_Types].xml"))
+        self.defaults = {
+            el.get("Extension").lower(): el.get("ContentType")
+            for el in types.iter(f"{{{CT_NS}}}Default")
+        }
+        self.overrides = {
+            el.get("PartName").lower(): el.get("ContentType")
+            for el in types.iter(f"{{{CT_NS}}}Override")
+        }
+
+        self.presentation = next(
+            target
+            for _, reltype, target, _ in self.rels("/")
+            if reltype_name(reltype) == "officeDocument"
+        )
+
+    def read(self, partname):
+        return self.zip.read(partname.lstrip("/"))
+
+    def content_type(self, partname):
+        """Return the declared content type of a part, or None if it has none."""
+        content_type = self.overrides.get(partname.lower())
+        if content_type:
+            return content_type
+        return self.defaults.get(posixpath.splitext(partname)[1][1:].lower())
+
+    def rels(self, partname):
+        """Return [(rId, reltype, target, is_external)] with absolute targets."""
+        if partname not in self._rels:
+            rels = []
+            try:
+                root = etree.fromstring(self.zip.read(rels_path(partname)))
+            except KeyError:
+                root = None
+            base = posixpath.dirname(partname) if partname != "/" else "/"
+            for rel in root if root is not None else ():
+                target = rel.get("Target")
+                is_external = rel.get("TargetMode") == "External"
+                if not is_external:
+                    target = posixpath.normpath(posixpath.join(base, target))
+                rels.append((rel.get("Id"), rel.get("Type"), target, is_external))
+            self._rels[partname] = rels
+        return self._rels[partname]
+
+    def related(self, partname, name):
+        """Return the targets of a part's relationships of one type, by rId."""
+        return {
+            rId: target
+            for rId, reltype, target, is_external in self.rels(partname)
+            if not is_external and reltype_name(reltype) == name
+        }
+
+    def slide_partnames(self):
+        """Return the slide partnames in presentation order."""
+        if not hasattr(self, "_slides"):
+            root = etree.fromstring(self.read(self.presentation))
+            slide_rels = self.related(self.presentation, "slide")
+            self._slides = [
+                slide_rels[el.get(f"{{{R_NS}}}id")]
+                for el in root.iter(f"{{{P_NS}}}sldId")
+            ]
+        return self._slides
+
+    def content_hash(self, partname):
+        """Hash a part with the content of everything it relates to.
+
+        Back links between masters, layouts and slides are left out so that
+        a layout hashes the same whichever deck it sits in.
+        """
+        if partname not in self._hashes:
+            # Guard against relationship cycles while this part is hashed
+            self._hashes[partname] = ""
+            digest = hashlib.sha256(self.read(partname))
+            for rId, reltype, target, is_external in sorted(self.rels(partname)):
+                name = reltype_name(reltype)
+                if name in HASH_SKIPPED_RELTYPES:
+                    continue
+                digest.update(f"\0{rId}\0{name}\0".encode())
+                digest.update(
+                    target.encode()
+                    if is_external
+                    else self.content_hash(target).encode()
+                )
+            self._hashes[partname] = digest.hexdigest()
+        return self._hashes[partname]
+
+    def family_hash(self, master):
+        """Hash a slide master together with all of its layouts."""
+        digest = hashlib.sha256(self.content_hash(master).encode())
+        for rId, layout in sorted(self.related(master, "slideLayout").items()):
+            digest.update(f"\0{rId}\0{self.content_hash(layout)}".encode())
+        return digest.hexdigest()
+
+    def close(self):
+        self.zip.close()
+
+
+class Assembler:
+    """Streams the parts of the assembled presentation into the output zip."""
+
+    def __init__(self, template, output_path):
+        self.template = template
+        self.zip = zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED)
+        self.used = set()
+        self.next_index = {}
+        self.defaults = dict(template.defaults)
+        self.overrides = {}
+        self.media = {}  # blob hash -> output partname
+        self.shared = {}  # (source path, partname) -> output partname
+        self.families = {}  # family hash -> (master partname, {rId: layout partname})
+        self.new_masters = []  # output partnames of masters copied from sources
+
+        presentation = template.presentation
+        retained, retained_media = self._retained_parts()
+        self.used.update(retained)
+        self.used.add(presentation)
+
+        # Copy the template's presentation-level parts as they are
+        self.zip.writestr(rels_path("/"), template.zip.read(rels_path("/")))
+        for partname in sorted(retained):
+            if partname in retained_media:
+                blob = template.read(partname)
+                self.media.setdefault(hashlib.sha256(blob).hexdigest(), partname)
+                self.shared[(template.path, partname)] = partname
+            self._write(partname, template.read(partname), template, partname)
+            try:
+                self.zip.writestr(
+                    rels_path(partname), template.zip.read(rels_path(partname))
+                )
+            except KeyError:
+                pass
+
+        root = etree.fromstring(template.read(presentation))
+        ids = [int(el.get("id")) for el in root.iter(f"{{{P_NS}}}sldMasterId")]
+        for master in template.related(presentation, "slideMaster").values():
+            self.families[template.family_hash(master)] = (
+                master,
+                template.related(master, "slideLayout"),
+            )
+            master_root = etree.fromstring(template.read(master))
+            ids.extend(
+                int(el.get("id")) for el in master_root.iter(f"{{{P_NS}}}sldLayoutId")
+            )
+        self.next_master_id = max(ids + [MIN_MASTER_ID - 1]) + 1
+
+    def _retained_parts(self):
+        """Return the template parts reachable without going through a slide.
+
+        Returns (parts, the subset of them that are images or media).
+        """
+        template = self.template
+        retained = set()
+        media = set()
+        pending = ["/"]
+        while pending:
+            partname = pending.pop()
+            for _, reltype, target, is_external in template.rels(partname):
+                if is_external or target in retained:
+                    continue
+                if partname == template.presentation and reltype_name(reltype) in (
+                    "slide",
+                    "notesSlide",
+                ):
+                    continue
+                retained.add(target)
+                pending.append(target)
+                if reltype_name(reltype) in SHARED_RELTYPES:
+                    media.add(target)
+        retained.discard(template.presentation)
+        return retained, media
+
+    def allocate(self, partname):
+        """Return an unused output partname of the same kind as partname."""
+        tmpl = partname_template(partname)
+        n = self.next_index.get(tmpl, 1)
+        while tmpl % n in self.used:
+            n += 1
+        self.next_index[tmpl] = n + 1
+        self.used.add(tmpl % n)
+        return tmpl % n
+
+    def _write(self, partname, blob, source, source_partname, rels=None):
+        """Write a part, its relationships and its content type.
+
+        The content type is the one source_partname has in the source package.
+        """
+        content_type = source.content_type(source_partname)
+        if content_type is None:
+            raise ValueError(
+                f"No content type for {source_partname} in {source.path.name}"
+            )
+        self.zip.writestr(partname.lstrip("/"), blob)
+        if rels:
+            root = etree.Element(f"{{{RELS_NS}}}Relationships", nsmap={None: RELS_NS})
+            base = posixpath.dirname(partname)
+            for rId, reltype, target, is_external in rels:
+                rel = etree.SubElement(root, f"{{{RELS_NS}}}Relationship")
+                rel.set("Id", rId)
+                rel.set("Type", reltype)
+                if is_external:
+                    rel.set("Target", target)
+                    rel.set("TargetMode", "External")
+                else:
+                    rel.set("Target", posixpath.relpath(target, base))
+            self.zip.writestr(rels_path(partname), serialize(root))
+
+        extension = posixpath.splitext(partname)[1][1:].lower()
+        if extension not in self.defaults:
+            self.defaults[extension] = content_type
+        elif self.defaults[extension] != content_type:
+            self.overrides[partname] = content_type
+
+    def copy_part(self, source, partname, out_partname, copied, transform=None):
+        """Copy a part and everything it owns from a source package.
+
+        `copied` maps source partnames to output partnames that are already
+        decided (layouts, the master of a family, parts copied earlier for
+        the same slide). Images and media are shared across the output.
+        """
+        copied[partname] = out_partname
+        rels = []
+        dropped = set()
+
+        for rId, reltype, target, is_external in source.rels(partname):
+            name = reltype_name(reltype)
+            if is_external:
+                rels.append((rId, reltype, target, True))
+            elif target in copied:
+                rels.append((rId, reltype, copied[target], False))
+            elif name in SKIPPED_RELTYPES or name == "slide":
+                dropped.add(rId)
+            elif name in SHARED_RELTYPES:
+                rels.append((rId, reltype, self.copy_shared(source, target), False))
+            else:
+                out_target = self.allocate(target)
+                self.copy_part(source, target, out_target, copied)
+                rels.append((rId, reltype, out_target, False))
+
+        blob = source.read(partname)
+        if dropped or transform:
+            root = etree.fromstring(blob)
+            for el in list(root.iter(*LINK_TAGS)):
+                if el.get(f"{{{R_NS}}}id") in dropped:
+                    el.getparent().remove(el)
+            if transform:
+                transform(root)
+            blob = serialize(root)
+
+        self._write(out_partname, blob, source, partname, rels)
+
+    def copy_shared(self, source, partname):
+        """Copy an image or media part once per unique blob."""
+        key = (source.path, partname)
+        if key not in self.shared:
+            blob = source.read(partname)
+            digest = hashlib.sha256(blob).hexdigest()
+            if digest not in self.media:
+                out_partname = self.allocate(partname)
+                self._write(out_partname, blob, source, partname)
+                self.media[digest] = out_partname
+            self.shared[key] = self.media[digest]
+        return self.shared[key]
+
+    def layout_for(self, source, layout):
+        """Return the output layout for a source layout, merging its master."""
+        master = next(iter(source.related(layout, "slideMaster").values()))
+        family = source.family_hash(master)
+
+        if family not in self.families:
+            out_master = self.allocate(master)
+            layouts = {
+                rId: self.allocate(partname)
+                for rId, partname in source.related(master, "slideLayout").items()
+            }
+            copied = {master: out_master}
+            copied.update(
+                (partname, layouts[rId])
+                for rId, partname in source.related(master, "slideLayout").items()
+            )
+
+            def renumber_layouts(root):
+                # Layout ids share one id space with master ids across the deck
+                for el in root.iter(f"{{{P_NS}}}sldLayoutId"):
+                    el.set("id", str(self.next_master_id))
+                    self.next_master_id += 1
+
+            self.copy_part(source, master, out_master, copied, renumber_layouts)
+            for rId, partname in source.related(master, "slideLayout").items():
+                self.copy_part(source, partname, layouts[rId], copied)
+
+            self.families[family] = (out_master, layouts)
+            self.new_masters.append(out_master)
+
+        out_master, layouts = self.families[family]
+        rId = next(
+            rId
+            for rId, partname in source.related(master, "slideLayout").items()
+            if partname == layout
+        )
+        return layouts[rId]
+
+    def reserve_slides(self, count):
+        """Reserve output partnames for the slides, in presentation order."""
+        slides = []
+        for _ in range(count):
+            slides.append(self.allocate("/ppt/slides/slide1.xml"))
+        return slides
+
+    def add_slide(self, source, partname, out_partname, slide_links):
+        """Copy one slide from a source package.
+
+        `slide_links` maps source slides that are also in the output to their
+        output partnames; links to other slides are removed.
+        """
+        copied = dict(slide_links)
+        copied.update(
+            (layout, self.layout_for(source, layout))
+            for layout in source.related(partname, "slideLayout").values()
+        )
+        self.copy_part(source, partname, out_partname, copied)
+
+    def finish(self, slides):
+        """Write the presentation part and content types, then close the zip."""
+        template = self.template
+        presentation = template.presentation
+
+        rels = [
+            rel
+            for rel in template.rels(presentation)
+            if reltype_name(rel[1]) not in ("slide", "notesSlide")
+        ]
+        rIds = {rel[0] for rel in rels}
+
+        def next_rId():
+            n = len(rIds) + 1
+            while f"rId{n}" in rIds:
+                n += 1
+            rIds.add(f"rId{n}")
+            return f"rId{n}"
+
+        root = etree.fromstring(template.read(presentation))
+
+        # Sections and custom shows refer to the template's slides
+        for el in list(root.iter(f"{{{P_NS}}}custShowLst")):
+            el.getparent().remove(el)
+        for el in list(root.iter("{*}sectionLst")):
+            ext = el.getparent()
+            ext.getparent().remove(ext)
+
+        master_lst = root.find(f"{{{P_NS}}}sldMasterIdLst")
+        for out_master in self.new_masters:
+            rId = next_rId()
+            rels.append((rId, f"{R_NS}/slideMaster", out_master, False))
+            el = etree.SubElement(master_lst, f"{{{P_NS}}}sldMasterId")
+            el.set("id", str(self.next_master_id))
+            el.set(f"{{{R_NS}}}id", rId)
+            self.next_master_id += 1
+
+        sld_lst = root.find(f"{{{P_NS}}}sldIdLst")
+        if sld_lst is None:
+            sld_lst = etree.Element(f"{{{P_NS}}}sldIdLst")
+            root.find(f"{{{P_NS}}}sldSz").addprevious(sld_lst)
+        for el in list(sld_lst):
+            sld_lst.remove(el)
+        for i, out_slide in enumerate(slides):
+            rId = next_rId()
+            rels.append((rId, f"{R_NS}/slide", out_slide, False))
+            el = etree.SubElement(sld_lst, f"{{{P_NS}}}sldId")
+            el.set("id", str(MIN_SLIDE_ID + i))
+            el.set(f"{{{R_NS}}}id", rId)
+
+        self._write(presentation, serialize(root), template, presentation, rels)
+
+        types = etree.Element(f"{{{CT_NS}}}Types", nsmap={None: CT_NS})
+        for extension, content_type in sorted(self.defaults.items()):
+            el = etree.SubElement(types, f"{{{CT_NS}}}Default")
+            el.set("Extension", extension)
+            el.set("ContentType", content_type)
+        for partname, content_type in sorted(self.overrides.items()):
+            el = etree.SubElement(types, f"{{{CT_NS}}}Override")
+            el.set("PartName", partname)
+            el.set("ContentType", content_type)
+        self.zip.writestr("[Content_Types].xml", serialize(types))
+        self.zip.close()
+
+
+def assemble_presentation(template_path, output_path, entries):
+    """
+    Create a presentation from (source path, slide index) entries.
+
+    Each source is opened once and processed while it is open; slides keep
+    their manifest order in the output.
+
+    Args:
+        template_path: Path to the PPTX providing presentation-level parts
+        output_path: Path for output PPTX file
+        entries: List of (source path, 0-based slide index) pairs
+    """
+    template_path = Path(template_path).resolve()
+    template = SourcePackage(template_path)
+    assembler = Assembler(template, output_path)
+
+    # Group entries by source, keeping the manifest order within the output
+    by_source = {}
+    for position, (source_path, index) in enumerate(entries):
+        by_source.setdefault(Path(source_path).resolve(), []).append((position, index))
+
+    slides = assembler.reserve_slides(len(entries))
+    try:
+        for source_path, positions in by_source.items():
+            print(f"Reading {len(positions)} slide(s) from {source_path.name}...")
+            source = (
+                template if source_path == template_path else SourcePackage(source_path)
+            )
+            try:
+                partnames = source.slide_partnames()
+                for _, index in positions:
+                    if index < 0 or index >= len(partnames):
+                        raise ValueError(
+                            f"Slide index {index} out of range for {source_path.name} "
+                            f"(0-{len(partnames) - 1})"
+                        )
+
+                # Links between slides of this source follow the first copy
+                slide_links = {}
+                for position, index in positions:
+                    slide_links.setdefault(partnames[index], slides[position])
+
+                for position, index in positions:
+                    assembler.add_slide(
+                        source, partnames[index], slides[position], slide_links
+                    )
+            finally:
+                if source is not template:
+                    source.close()
+
+        assembler.finish(slides)
+    except Exception:
+        assembler.zip.close()
+        Path(output_path).unlink(missing_ok=True)
+        raise
+    finally:
+        template.close()
+
+    print(f"\nSaved assembled presentation to: {output_path}")
+    print(f"Final presentation has {len(slides)} slides")
+    print(f"  - Slide masters added: {len(assembler.new_masters)}")
+    print(f"  - Unique media parts: {len(assembler.media)}")
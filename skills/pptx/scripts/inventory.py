@@ -9,13 +9,16 @@ This module provides functionality to:
 - Sort shapes by visual position on slides
 - Filter out slide numbers and non-content placeholders
 - Export to JSON with clean, structured data
+- Extract layout only (shape rectangles) without text measurement
 
 Classes:
     ParagraphData: Represents a text paragraph with formatting
     ShapeData: Represents a shape with position and text content
+    ShapeGeometry: Represents a shape's absolute rectangle only
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    extract_shape_geometry: Extract text shape rectangles only
     save_inventory: Save extracted data to JSON
 
 Usage:
@@ -32,6 +35,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.enum.dml import MSO_FILL
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
 
@@ -45,6 +49,9 @@ InventoryData = Dict[
     str, Dict[str, "ShapeData"]
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
+GeometryData = Dict[
+    str, Dict[str, "ShapeGeometry"]
+]  # Dict of slide_id -> {shape_id -> ShapeGeometry}
 
 
 def main():
@@ -60,6 +67,9 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py presentation.pptx layout.json --geometry-only
+    Extracts only the position and size of each text shape (fast, no text measurement)
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -71,11 +81,17 @@ The output JSON includes:
 
     parser.add_argument("input", help="Input PowerPoint file (.pptx)")
     parser.add_argument("output", help="Output JSON file for inventory")
-    parser.add_argument(
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
         "--issues-only",
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    mode.add_argument(
+        "--geometry-only",
+        action="store_true",
+        help="Include only shape positions and sizes, skipping text measurement",
+    )
 
     args = parser.parse_args()
 
@@ -94,7 +110,10 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        if args.geometry_only:
+            inventory = extract_shape_geometry(input_path)
+        else:
+            inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -134,6 +153,46 @@ class ShapeWithPosition:
     absolute_top: int  # in EMUs
 
 
+@dataclass
+class ShapeGeometry:
+    """Absolute rectangle of a text shape, without text or formatting data.
+
+    Positions are in EMUs; the inch properties are rounded like ShapeData's.
+    """
+
+    shape: BaseShape
+    left_emu: int
+    top_emu: int
+    width_emu: int
+    height_emu: int
+    shape_id: str = ""  # Will be set after sorting
+
+    @property
+    def left(self) -> float:
+        return round(ShapeData.emu_to_inches(self.left_emu), 2)
+
+    @property
+    def top(self) -> float:
+        return round(ShapeData.emu_to_inches(self.top_emu), 2)
+
+    @property
+    def width(self) -> float:
+        return round(ShapeData.emu_to_inches(self.width_emu), 2)
+
+    @property
+    def height(self) -> float:
+        return round(ShapeData.emu_to_inches(self.height_emu), 2)
+
+    def to_dict(self) -> ShapeDict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "left": self.left,
+            "top": self.top,
+            "width": self.width,
+            "height": self.height,
+        }
+
+
 class ParagraphData:
     """Data structure for paragraph properties extracted from a PowerPoint paragraph."""
 
@@ -207,17 +266,20 @@ class ParagraphData:
                     self.underline = font.underline
 
                 # Handle color - both RGB and theme colors
-                try:
-                    # Try RGB color first
-                    if font.color.rgb:
-                        self.color = str(font.color.rgb)
-                except (AttributeError, TypeError):
-                    # Fall back to theme color
+                # (font.color adds a <a:solidFill/> to runs without one, so
+                # only read it when the run already has a solid fill)
+                if font.fill.type == MSO_FILL.SOLID:
                     try:
-                        if font.color.theme_color:
-                            self.theme_color = font.color.theme_color.name
+                        # Try RGB color first
+                        if font.color.rgb:
+                            self.color = str(font.color.rgb)
                     except (AttributeError, TypeError):
-                        pass
+                        # Fall back to theme color
+                        try:
+                            if font.color.theme_color:
+                                self.theme_color = font.color.theme_color.name
+                        except (AttributeError, TypeError):
+                            pass
 
         # Add line spacing if set
         if hasattr(paragraph, "line_spacing") and paragraph.line_spacing is not None:
@@ -974,6 +1036,54 @@ def extract_text_inventory(
     return inventory
 
 
+def extract_shape_geometry(pptx_path: Path, prs: Optional[Any] = None) -> GeometryData:
+    """Extract the absolute rectangles of all text shapes in a presentation.
+
+    Uses the same shape selection, ordering and shape IDs as
+    extract_text_inventory, but skips text measurement, formatting parsing
+    and overlap detection, for callers that only need the layout.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        prs: Optional Presentation object to use. If not provided, will load from pptx_path.
+
+    Returns a nested dictionary: {slide-N: {shape-N: ShapeGeometry}}
+    """
+    if prs is None:
+        prs = Presentation(str(pptx_path))
+    geometry: GeometryData = {}
+
+    for slide_idx, slide in enumerate(prs.slides):
+        shapes_with_positions = []
+        for shape in slide.shapes:  # type: ignore
+            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+        if not shapes_with_positions:
+            continue
+
+        shape_geometries = [
+            ShapeGeometry(
+                swp.shape,
+                swp.absolute_left,
+                swp.absolute_top,
+                swp.shape.width if hasattr(swp.shape, "width") else 0,
+                swp.shape.height if hasattr(swp.shape, "height") else 0,
+            )
+            for swp in shapes_with_positions
+        ]
+
+        # Sort and number exactly like extract_text_inventory
+        sorted_shapes = sort_shapes_by_position(shape_geometries)  # type: ignore
+        for idx, shape_geometry in enumerate(sorted_shapes):
+            shape_geometry.shape_id = f"shape-{idx}"
+
+        geometry[f"slide-{slide_idx}"] = {
+            shape_geometry.shape_id: shape_geometry for shape_geometry in sorted_shapes
+        }
+
+    return geometry
+
+
 def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
@@ -1000,10 +1110,12 @@ def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> Invento
     return dict_inventory
 
 
-def save_inventory(inventory: InventoryData, output_path: Path) -> None:
+def save_inventory(
+    inventory: Union[InventoryData, GeometryData], output_path: Path
+) -> None:
     """Save inventory to JSON file with proper formatting.
 
-    Converts ShapeData objects to dictionaries for JSON serialization.
+    Converts ShapeData (or ShapeGeometry) objects to dictionaries for JSON serialization.
     """
     # Convert ShapeData objects to dictionaries
     json_inventory: InventoryDict = {}
@@ -4,19 +4,41 @@ Rearrange PowerPoint slides based on a sequence of indices.
 
 Usage:
     python rearrange.py template.pptx output.pptx 0,34,34,50,52
+    python rearrange.py template.pptx output.pptx --manifest manifest.json
 
 This will create output.pptx using slides from template.pptx in the specified order.
 Slides can be repeated (e.g., 34 appears twice).
+
+With --manifest, slides are assembled from several source decks instead
+(see assemble.py for the manifest format).
 """
 
 import argparse
+import re
 import shutil
 import sys
 from copy import deepcopy
 from pathlib import Path
 
-import six
+from assemble import assemble_presentation, load_manifest
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import XmlPart, _Relationship
+from pptx.opc.packuri import PackURI
+from pptx.parts.slide import SlidePart
+
+# Relationship targets shared between a slide and its duplicates
+SHARED_RELTYPES = {
+    RT.IMAGE,
+    RT.MEDIA,
+    RT.VIDEO,
+    RT.AUDIO,
+    RT.SLIDE_LAYOUT,
+    RT.SLIDE,
+}
+
+# Relationships not carried over to duplicates
+SKIPPED_RELTYPES = {RT.NOTES_SLIDE}
 
 
 def main():
@@ -31,6 +53,10 @@ Examples:
   python rearrange.py template.pptx output.pptx 5,3,1,2,4
     Creates output.pptx with slides reordered as specified
 
+  python rearrange.py template.pptx output.pptx --manifest manifest.json
+    Assembles output.pptx from the slides listed in manifest.json, e.g.
+    [{"source": "library-a.pptx", "slide": 3}, {"source": "library-b.pptx", "slide": 0}]
+
 Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
         """,
     )
@@ -38,19 +64,29 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
     parser.add_argument("template", help="Path to template PPTX file")
     parser.add_argument("output", help="Path for output PPTX file")
     parser.add_argument(
-        "sequence", help="Comma-separated sequence of slide indices (0-based)"
+        "sequence",
+        nargs="?",
+        help="Comma-separated sequence of slide indices (0-based)",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="JSON list of {source, slide} entries to assemble from several decks",
     )
 
     args = parser.parse_args()
 
+    if (args.sequence is None) == (args.manifest is None):
+        parser.error("give either a slide sequence or --manifest")
+
     # Parse the slide sequence
-    try:
-        slide_sequence = [int(x.strip()) for x in args.sequence.split(",")]
-    except ValueError:
-        print(
-            "Error: Invalid sequence format. Use comma-separated integers (e.g., 0,34,34,50,52)"
-        )
-        sys.exit(1)
+    if args.sequence is not None:
+        try:
+            slide_sequence = [int(x.strip()) for x in args.sequence.split(",")]
+        except ValueError:
+            print(
+                "Error: Invalid sequence format. Use comma-separated integers (e.g., 0,34,34,50,52)"
+            )
+            sys.exit(1)
 
     # Check template exists
     template_path = Path(args.template)
@@ -63,7 +99,14 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        rearrange_presentation(template_path, output_path, slide_sequence)
+        if args.manifest:
+            entries = load_manifest(args.manifest)
+            for source_path, _ in entries:
+                if not source_path.exists():
+                    raise ValueError(f"Source file not found: {source_path}")
+            assemble_presentation(template_path, output_path, entries)
+        else:
+            rearrange_presentation(template_path, output_path, slide_sequence)
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -72,84 +115,99 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
         sys.exit(1)
 
 
-def duplicate_slide(pres, index):
-    """Duplicate a slide in the presentation."""
-    source = pres.slides[index]
-
-    # Use source's layout to preserve formatting
-    new_slide = pres.slides.add_slide(source.slide_layout)
-
-    # Collect all image and media relationships from the source slide
-    image_rels = {}
-    for rel_id, rel in six.iteritems(source.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
-
-    # CRITICAL: Clear placeholder shapes to avoid duplicates
-    for shape in new_slide.shapes:
-        sp = shape.element
-        sp.getparent().remove(sp)
-
-    # Copy all shapes from source
-    for shape in source.shapes:
-        el = shape.element
-        new_el = deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-
-        # Handle picture shapes - need to update the blip reference
-        # Look for all blip elements (they can be in pic or other contexts)
-        # Using the element's own xpath method without namespaces argument
-        blips = new_el.xpath(".//a:blip[@r:embed]")
-        for blip in blips:
-            old_rId = blip.get(
-                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-            )
-            if old_rId in image_rels:
-                # Create a new relationship in the destination slide for this image
-                old_rel = image_rels[old_rId]
-                # get_or_add returns the rId directly, or adds and returns new rId
-                new_rId = new_slide.part.rels.get_or_add(
-                    old_rel.reltype, old_rel._target
-                )
-                # Update the blip's embed reference to use the new relationship ID
-                blip.set(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                    new_rId,
-                )
-
-    # Copy any additional image/media relationships that might be referenced elsewhere
-    for rel_id, rel in image_rels.items():
-        try:
-            new_slide.part.rels.get_or_add(rel.reltype, rel._target)
-        except Exception:
-            pass  # Relationship might already exist
+class PartNames:
+    """Free partname lookup for a package whose parts are scanned only once."""
+
+    def __init__(self, package):
+        self.used = {str(part.partname) for part in package.iter_parts()}
+        self.next_index = {}
+
+    def allocate(self, tmpl):
+        """Return the next unused partname for a '%d' template like '/ppt/charts/chart%d.xml'."""
+        n = self.next_index.get(tmpl, 1)
+        while tmpl % n in self.used:
+            n += 1
+        self.next_index[tmpl] = n + 1
+        self.used.add(tmpl % n)
+        return PackURI(tmpl % n)
+
 
-    return new_slide
+def duplicate_slide(pres, index, partnames=None):
+    """Duplicate a slide in the presentation at the part level.
 
+    The slide XML is copied once and keeps its rIds, so nothing inside it
+    needs rewriting. Images, media and the layout are shared with the source
+    slide; other parts it owns (charts, tags, ...) are copied. The notes slide
+    is not carried over.
+
+    Pass the same PartNames to repeated calls to avoid rescanning the package.
+    """
+    source_part = pres.slides[index].part
+    if partnames is None:
+        partnames = PartNames(source_part.package)
+
+    new_part = SlidePart(
+        pres.part._next_slide_partname,
+        source_part.content_type,
+        source_part.package,
+        deepcopy(source_part._element),
+    )
+    rId = pres.part.relate_to(new_part, RT.SLIDE)
+    pres.slides._sldIdLst.add_sldId(rId)
+
+    copy_part_rels(source_part, new_part, partnames, {})
+
+    return new_part.slide
 
-def delete_slide(pres, index):
-    """Delete a slide from the presentation."""
-    rId = pres.slides._sldIdLst[index].rId
-    pres.part.drop_rel(rId)
-    del pres.slides._sldIdLst[index]
 
+def copy_part_rels(source_part, new_part, partnames, copied):
+    """Give new_part the relationships of source_part under the same rIds.
 
-def reorder_slides(pres, slide_index, target_index):
-    """Move a slide from one position to another."""
-    slides = pres.slides._sldIdLst
+    Shared and external targets are linked as they are; owned parts are
+    copied once each (tracked in `copied`) along with their own relationships.
+    """
+    rels = new_part.rels._rels
+    base_uri = new_part.partname.baseURI
+
+    for rId, rel in source_part.rels.items():
+        if rel.reltype in SKIPPED_RELTYPES:
+            continue
+
+        if rel.is_external or rel.reltype in SHARED_RELTYPES:
+            rels[rId] = _Relationship(
+                base_uri, rId, rel.reltype, rel._target_mode, rel._target
+            )
+            continue
+
+        target = rel.target_part
+        is_new = target not in copied
+        if is_new:
+            copied[target] = copy_part(target, partnames)
+        rels[rId] = _Relationship(
+            base_uri, rId, rel.reltype, rel._target_mode, copied[target]
+        )
 
-    # Remove slide element from current position
-    slide_element = slides[slide_index]
-    slides.remove(slide_element)
+        if is_new:
+            copy_part_rels(target, copied[target], partnames, copied)
 
-    # Insert at target position
-    slides.insert(target_index, slide_element)
+
+def copy_part(part, partnames):
+    """Return a copy of part under the next free partname of the same kind."""
+    package = part.package
+    partname = partnames.allocate(re.sub(r"\d*(\.\w+)$", r"%d\1", str(part.partname)))
+    if isinstance(part, XmlPart):
+        return type(part)(partname, part.content_type, package, deepcopy(part._element))
+    return type(part)(partname, part.content_type, package, part.blob)
 
 
 def rearrange_presentation(template_path, output_path, slide_sequence):
     """
     Create a new presentation with slides from template in specified order.
 
+    The final slide list is built in a single pass over the sequence: the
+    first use of a slide keeps the original, later uses get a duplicate,
+    unused slides are dropped and the slide id list is rewritten once.
+
     Args:
         template_path: Path to template PPTX file
         output_path: Path for output PPTX file
@@ -162,64 +220,43 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
     else:
         prs = Presentation(template_path)
 
-    total_slides = len(prs.slides)
+    sldIdLst = prs.slides._sldIdLst
+    original_ids = list(sldIdLst)
+    total_slides = len(original_ids)
 
     # Validate indices
     for idx in slide_sequence:
         if idx < 0 or idx >= total_slides:
             raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
 
-    # Track original slides and their duplicates
-    slide_map = []  # List of actual slide indices for final presentation
-    duplicated = {}  # Track duplicates: original_idx -> [duplicate_indices]
-
-    # Step 1: DUPLICATE repeated slides
+    # Step 1: PICK the original or a duplicate for each position
     print(f"Processing {len(slide_sequence)} slides from template...")
+    final_ids = []
+    used = set()
+    partnames = PartNames(prs.part.package)
     for i, template_idx in enumerate(slide_sequence):
-        if template_idx in duplicated and duplicated[template_idx]:
-            # Already duplicated this slide, use the duplicate
-            slide_map.append(duplicated[template_idx].pop(0))
-            print(f"  [{i}] Using duplicate of slide {template_idx}")
-        elif slide_sequence.count(template_idx) > 1 and template_idx not in duplicated:
-            # First occurrence of a repeated slide - create duplicates
-            slide_map.append(template_idx)
-            duplicates = []
-            count = slide_sequence.count(template_idx) - 1
-            print(
-                f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
-            )
-            for _ in range(count):
-                duplicate_slide(prs, template_idx)
-                duplicates.append(len(prs.slides) - 1)
-            duplicated[template_idx] = duplicates
-        else:
-            # Unique slide or first occurrence already handled, use original
-            slide_map.append(template_idx)
+        if template_idx not in used:
+            used.add(template_idx)
+            final_ids.append(original_ids[template_idx])
             print(f"  [{i}] Using original slide {template_idx}")
+        else:
+            # New slides are appended to the end of the slide id list
+            duplicate_slide(prs, template_idx, partnames)
+            final_ids.append(sldIdLst[-1])
+            print(f"  [{i}] Using duplicate of slide {template_idx}")
 
-    # Step 2: DELETE unwanted slides (work backwards)
-    slides_to_keep = set(slide_map)
-    print(f"\nDeleting {len(prs.slides) - len(slides_to_keep)} unused slides...")
-    for i in range(len(prs.slides) - 1, -1, -1):
-        if i not in slides_to_keep:
-            delete_slide(prs, i)
-            # Update slide_map indices after deletion
-            slide_map = [idx - 1 if idx > i else idx for idx in slide_map]
-
-    # Step 3: REORDER to final sequence
-    print(f"Reordering {len(slide_map)} slides to final sequence...")
-    for target_pos in range(len(slide_map)):
-        # Find which slide should be at target_pos
-        current_pos = slide_map[target_pos]
-        if current_pos != target_pos:
-            reorder_slides(prs, current_pos, target_pos)
-            # Update slide_map: the move shifts other slides
-            for i in range(len(slide_map)):
-                if slide_map[i] > current_pos and slide_map[i] <= target_pos:
-                    slide_map[i] -= 1
-                elif slide_map[i] < current_pos and slide_map[i] >= target_pos:
-                    slide_map[i] += 1
-            slide_map[target_pos] = target_pos
+    # Step 2: DROP unused slides
+    unused = [sldId for idx, sldId in enumerate(original_ids) if idx not in used]
+    print(f"\nDeleting {len(unused)} unused slides...")
+    for sldId in unused:
+        prs.part.drop_rel(sldId.rId)
+
+    # Step 3: WRITE the final sequence
+    print(f"Reordering {len(final_ids)} slides to final sequence...")
+    for sldId in list(sldIdLst):
+        sldIdLst.remove(sldId)
+    for sldId in final_ids:
+        sldIdLst.append(sldId)
 
     # Save the presentation
     prs.save(output_path)
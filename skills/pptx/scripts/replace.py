@@ -3,18 +3,45 @@
 
 Usage:
     python replace.py <input.pptx> <replacements.json> <output.pptx>
+    python replace.py --diff <input.pptx> <replacements.json> <output.pptx>
+    python replace.py --batch [--jobs N] <input.pptx> <records.jsonl> <output_dir>
 
 The replacements JSON should have the structure output by inventory.py.
 ALL text shapes identified by inventory.py will have their text cleared
 unless "paragraphs" is specified in the replacements for that shape.
+
+With --diff, shapes listed in the replacements are compared with their
+current paragraphs: identical paragraphs are left as they are, text-only
+changes are written into the existing run, and only paragraphs whose
+formatting changed are rebuilt. Change statistics are printed at the end.
+
+With --batch, each line of the JSONL stream is one record:
+    {"output": "alice.pptx", "replacements": {"slide-0": {...}}}
+The template and its inventory are parsed once per worker process, each
+valid record is saved to <output_dir>/<output>, and a per-record report
+(status, overflow errors, warnings) is written to <output_dir>/report.jsonl.
+Outputs must stay inside <output_dir>; records that share an output are
+reported as invalid and not saved.
 """
 
+import argparse
 import json
+import os
+import re
 import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from copy import deepcopy
 from pathlib import Path
-from typing import Any, Dict, List
-
-from inventory import InventoryData, extract_text_inventory
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from inventory import (
+    InventoryData,
+    ParagraphData,
+    ShapeData,
+    extract_text_inventory,
+    is_valid_shape,
+)
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.dml import MSO_THEME_COLOR
@@ -22,6 +49,23 @@ from pptx.enum.text import PP_ALIGN
 from pptx.oxml.xmlchemy import OxmlElement
 from pptx.util import Pt
 
+DEFAULT_JOBS = os.cpu_count() or 1  # Worker processes for --batch
+BATCH_QUEUE_FACTOR = 4  # Records kept in flight per worker
+STREAM_CHUNK_SIZE = 1 << 16  # Characters read at a time from the replacement JSON
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+JSON_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+BATCH_REPORT_NAME = "report.jsonl"  # Per-record report written by --batch
+
+# Change statistics reported by diff mode
+DIFF_STATS = (
+    "shapes_unchanged",
+    "paragraphs_unchanged",
+    "paragraphs_text_updated",
+    "paragraphs_rebuilt",
+    "paragraphs_added",
+    "paragraphs_removed",
+)
+
 
 def clear_paragraph_bullets(paragraph):
     """Clear bullet formatting from a paragraph."""
@@ -159,45 +203,104 @@ def detect_frame_overflow(inventory: InventoryData) -> Dict[str, Dict[str, float
     return overflow_map
 
 
-def validate_replacements(inventory: InventoryData, replacements: Dict) -> List[str]:
-    """Validate that all shapes in replacements exist in inventory.
+def remeasure_replaced_shapes(
+    prs, inventory: InventoryData, replaced: Set[Tuple[str, str]]
+) -> InventoryData:
+    """Build the post-replacement inventory without re-extracting the deck.
+
+    Only shapes in replaced (slide_key, shape_key) pairs are measured again;
+    other shapes that still have text keep their original ShapeData. Shapes
+    left without text are dropped, as extract_text_inventory would. Shape
+    keys are those of the original inventory.
+    """
+    updated_inventory: InventoryData = {}
+
+    for slide_key, shapes_dict in inventory.items():
+        slide = None
+        for shape_key, shape_data in shapes_dict.items():
+            if not is_valid_shape(shape_data.shape):
+                continue
+
+            if (slide_key, shape_key) in replaced:
+                if slide is None:
+                    slide = prs.slides[int(slide_key.split("-")[1])]
+                new_shape_data = ShapeData(
+                    shape_data.shape, shape_data.left_emu, shape_data.top_emu, slide
+                )
+                new_shape_data.shape_id = shape_key
+            else:
+                new_shape_data = shape_data
+
+            updated_inventory.setdefault(slide_key, {})[shape_key] = new_shape_data
+
+    return updated_inventory
+
+
+def build_inventory_index(inventory: InventoryData) -> Dict[str, Dict[str, str]]:
+    """Index the inventory as slide_key -> shape_key -> label for validation.
+
+    Labels carry a preview of the shape's first paragraph so error messages
+    can point at the shapes that are still missing a replacement.
+    """
+    index = {}
+    for slide_key, shapes_dict in inventory.items():
+        index[slide_key] = {}
+        for shape_key, shape_data in shapes_dict.items():
+            # Get text from paragraphs as preview
+            paragraphs = shape_data.paragraphs
+            if paragraphs and paragraphs[0].text:
+                first_text = paragraphs[0].text[:50]
+                if len(paragraphs[0].text) > 50:
+                    first_text += "..."
+                index[slide_key][shape_key] = f"{shape_key} ('{first_text}')"
+            else:
+                index[slide_key][shape_key] = shape_key
+    return index
+
+
+def validate_slide_replacements(
+    index: Dict[str, Dict[str, str]], slide_key: str, shapes_data: Any
+) -> List[str]:
+    """Validate the replacements of one slide against the inventory index.
 
     Returns list of error messages.
     """
-    errors = []
+    if not slide_key.startswith("slide-"):
+        return []
 
-    for slide_key, shapes_data in replacements.items():
-        if not slide_key.startswith("slide-"):
-            continue
+    # Check if slide exists
+    if slide_key not in index:
+        return [f"Slide '{slide_key}' not found in inventory"]
 
-        # Check if slide exists
-        if slide_key not in inventory:
-            errors.append(f"Slide '{slide_key}' not found in inventory")
-            continue
+    if not isinstance(shapes_data, dict):
+        return [f"Slide '{slide_key}' must map shape keys to replacements"]
 
-        # Check each shape
-        for shape_key in shapes_data.keys():
-            if shape_key not in inventory[slide_key]:
-                # Find shapes without replacements defined and show their content
-                unused_with_content = []
-                for k in inventory[slide_key].keys():
-                    if k not in shapes_data:
-                        shape_data = inventory[slide_key][k]
-                        # Get text from paragraphs as preview
-                        paragraphs = shape_data.paragraphs
-                        if paragraphs and paragraphs[0].text:
-                            first_text = paragraphs[0].text[:50]
-                            if len(paragraphs[0].text) > 50:
-                                first_text += "..."
-                            unused_with_content.append(f"{k} ('{first_text}')")
-                        else:
-                            unused_with_content.append(k)
-
-                errors.append(
-                    f"Shape '{shape_key}' not found on '{slide_key}'. "
-                    f"Shapes without replacements: {', '.join(sorted(unused_with_content)) if unused_with_content else 'none'}"
-                )
+    # Check each shape
+    slide_index = index[slide_key]
+    missing = [k for k in shapes_data if k not in slide_index]
+    if not missing:
+        return []
 
+    # Find shapes without replacements defined and show their content
+    unused = sorted(label for k, label in slide_index.items() if k not in shapes_data)
+    unused_text = ", ".join(unused) if unused else "none"
+    return [
+        f"Shape '{shape_key}' not found on '{slide_key}'. "
+        f"Shapes without replacements: {unused_text}"
+        for shape_key in missing
+    ]
+
+
+def validate_replacements(
+    index: Dict[str, Dict[str, str]], replacements: Dict
+) -> List[str]:
+    """Validate that all shapes in replacements exist in the inventory index.
+
+    Returns list of error messages.
+    """
+    errors = []
+    for slide_key, shapes_data in replacements.items():
+        errors.extend(validate_slide_replacements(index, slide_key, shapes_data))
     return errors
 
 
@@ -211,9 +314,137 @@ def check_duplicate_keys(pairs):
     return result
 
 
-def apply_replacements(pptx_file: str, json_file: str, output_file: str):
-    """Apply text replacements from JSON to PowerPoint presentation."""
+def iter_json_object(f, object_pairs_hook=None, chunk_size: int = STREAM_CHUNK_SIZE):
+    """Yield the (key, value) pairs of a top-level JSON object one at a time.
+
+    Only one member value is held in memory at once, so large replacement
+    files are never decoded as a whole. Raises ValueError on malformed JSON.
+    """
+    decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+    state = {"buf": "", "pos": 0, "offset": 0, "eof": False}
+
+    def fill(size):
+        chunk = f.read(size)
+        if not chunk:
+            state["eof"] = True
+        # Drop what was already consumed before appending the new chunk
+        state["offset"] += state["pos"]
+        state["buf"] = state["buf"][state["pos"] :] + chunk
+        state["pos"] = 0
+
+    def fail(message):
+        raise ValueError(
+            f"Invalid JSON: {message} (char {state['offset'] + state['pos']})"
+        )
+
+    def next_char():
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            buf = state["buf"]
+            pos = JSON_WHITESPACE.match(buf, state["pos"]).end()
+            state["pos"] = pos
+            if pos < len(buf) or state["eof"]:
+                return buf[pos : pos + 1]
+            fill(chunk_size)
+
+    def decode():
+        """Decode one JSON value, reading more input until it is complete."""
+        size = chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(state["buf"], state["pos"])
+            except json.JSONDecodeError as e:
+                if state["eof"]:
+                    state["pos"] = e.pos
+                    fail(e.msg)
+            else:
+                # A number running up to the end of the buffer may continue in
+                # the next chunk ("123." or "1.5e" decode as a shorter number)
+                buf = state["buf"]
+                if state["eof"] or JSON_NUMBER_TAIL.match(buf, end).end() < len(buf):
+                    state["pos"] = end
+                    return value
+            # Grow reads geometrically so large values are decoded in linear time
+            fill(size)
+            size *= 2
+
+    if next_char() != "{":
+        fail("expected '{'")
+    state["pos"] += 1
+
+    if next_char() == "}":
+        return
+    while True:
+        if next_char() != '"':
+            fail("expected property name")
+        key = decode()
+        if next_char() != ":":
+            fail("expected ':'")
+        state["pos"] += 1
+        next_char()
+        yield key, decode()
+
+        char = next_char()
+        state["pos"] += 1
+        if char == "}":
+            break
+        if char != ",":
+            fail("expected ',' or '}'")
+
+    if next_char():
+        fail("extra data after top-level object")
+
+
+def load_replacements(
+    json_file: str,
+    index: Dict[str, Dict[str, str]],
+    apply_slide: Callable[[str, Dict], None],
+) -> List[str]:
+    """Stream the replacement JSON and validate it slide by slide.
+
+    Each valid slide is handed to apply_slide(slide_key, shapes_data) as
+    soon as it has been read, so only one slide's replacements are held in
+    memory at a time. Every validation error, including duplicate keys, is
+    collected in one pass; slides with errors are not applied.
+
+    Returns the list of errors.
+    """
+    errors = []
+    duplicates = []
+    seen = set()
+
+    def collect_duplicates(pairs):
+        result = {}
+        for key, value in pairs:
+            if key in result:
+                duplicates.append(f"Duplicate key found in JSON: '{key}'")
+            result[key] = value
+        return result
+
+    with open(json_file, "r", encoding="utf-8") as f:
+        try:
+            for slide_key, shapes_data in iter_json_object(f, collect_duplicates):
+                slide_errors = duplicates[:]
+                duplicates.clear()
+                if slide_key in seen:
+                    slide_errors.append(f"Duplicate key found in JSON: '{slide_key}'")
+                seen.add(slide_key)
+                slide_errors.extend(
+                    validate_slide_replacements(index, slide_key, shapes_data)
+                )
+
+                if slide_errors:
+                    errors.extend(slide_errors)
+                elif slide_key.startswith("slide-"):
+                    apply_slide(slide_key, shapes_data)
+        except ValueError as e:
+            errors.append(str(e))
+
+    return errors
+
 
+def load_template(pptx_file: str) -> Tuple[Any, InventoryData, Dict]:
+    """Load a presentation with its inventory and original overflow measurements."""
     # Load presentation
     prs = Presentation(pptx_file)
 
@@ -224,84 +455,195 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     # Detect text overflow in original presentation
     original_overflow = detect_frame_overflow(inventory)
 
-    # Load replacement data with duplicate key detection
-    with open(json_file, "r") as f:
-        replacements = json.load(f, object_pairs_hook=check_duplicate_keys)
+    return prs, inventory, original_overflow
 
-    # Validate replacements
-    errors = validate_replacements(inventory, replacements)
-    if errors:
-        print("ERROR: Invalid shapes in replacement JSON:")
-        for error in errors:
-            print(f"  - {error}")
-        print("\nPlease check the inventory and update your replacement JSON.")
-        print(
-            "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
-        )
-        raise ValueError(f"Found {len(errors)} validation error(s)")
 
-    # Track statistics
-    shapes_processed = 0
-    shapes_cleared = 0
-    shapes_replaced = 0
+def set_paragraph_text(paragraph, text: str) -> bool:
+    """Replace a paragraph's text in place, keeping its first run's formatting.
+
+    Returns False if the paragraph has no run to carry the text.
+    """
+    if not paragraph.runs:
+        return False
+
+    first_run = paragraph.runs[0]
+    first_run.text = text
+    # Drop the remaining runs, line breaks and fields
+    for elm in paragraph._p.content_children:
+        if elm is not first_run._r:
+            paragraph._p.remove(elm)
+    return True
+
+
+def diff_paragraphs(text_frame, paragraphs: List[Dict[str, Any]], stats: Dict) -> bool:
+    """Bring a text frame's paragraphs in line with the requested ones.
+
+    Requested paragraphs are matched by position with the frame's non-empty
+    paragraphs (the ones inventory.py reports). Identical paragraphs are left
+    untouched, text-only changes rewrite the first run in place, and only
+    paragraphs whose formatting changed are rebuilt.
+
+    Returns True if the text frame was modified.
+    """
+    all_paragraphs = text_frame.paragraphs
+    existing = [p for p in all_paragraphs if p.text.strip()]
+    existing_data = [ParagraphData(p).to_dict() for p in existing]
+
+    if existing_data == paragraphs:
+        stats["paragraphs_unchanged"] += len(paragraphs)
+        return False
+
+    # Empty paragraphs are not part of the inventory, so a changed shape
+    # loses them just as it would with a full replacement
+    for p in all_paragraphs:
+        if not p.text.strip():
+            text_frame._txBody.remove(p._p)
+
+    # Paragraphs without a requested counterpart are removed, keeping one
+    # paragraph so the text frame stays valid
+    for p in existing[len(paragraphs) :]:
+        if len(text_frame._txBody.p_lst) > 1:
+            text_frame._txBody.remove(p._p)
+            stats["paragraphs_removed"] += 1
+        else:
+            p.clear()
+
+    for i, para_data in enumerate(paragraphs):
+        if i >= len(existing):
+            p = text_frame.add_paragraph()
+            apply_paragraph_properties(p, para_data)
+            stats["paragraphs_added"] += 1
+            continue
+
+        p = existing[i]
+        if para_data == existing_data[i]:
+            stats["paragraphs_unchanged"] += 1
+            continue
+
+        same_format = {k: v for k, v in para_data.items() if k != "text"} == {
+            k: v for k, v in existing_data[i].items() if k != "text"
+        }
+        if same_format and set_paragraph_text(p, para_data.get("text", "")):
+            stats["paragraphs_text_updated"] += 1
+            continue
+
+        p.clear()
+        apply_paragraph_properties(p, para_data)
+        stats["paragraphs_rebuilt"] += 1
+
+    return True
+
+
+def new_replace_stats() -> Dict[str, Any]:
+    """Return empty statistics for replace_text and replace_slide_text."""
+    return {
+        "shapes_processed": 0,
+        "shapes_cleared": 0,
+        "shapes_replaced": 0,
+        "shapes_unchanged": 0,
+        "paragraphs_unchanged": 0,
+        "paragraphs_text_updated": 0,
+        "paragraphs_rebuilt": 0,
+        "paragraphs_added": 0,
+        "paragraphs_removed": 0,
+        "replaced": set(),
+    }
+
+
+def replace_text(
+    prs, inventory: InventoryData, replacements: Dict, diff: bool = False
+) -> Dict[str, Any]:
+    """Clear every inventory shape and add the replacement paragraphs.
+
+    With diff=True, shapes named in the replacements are compared with their
+    current paragraphs and only the paragraphs that changed are rewritten.
+
+    Returns statistics, including the set of replaced (slide_key, shape_key) pairs.
+    """
+    stats = new_replace_stats()
 
     # Process each slide from inventory
     for slide_key, shapes_dict in inventory.items():
         if not slide_key.startswith("slide-"):
             continue
+        replace_slide_text(
+            prs, slide_key, shapes_dict, replacements.get(slide_key, {}), diff, stats
+        )
+
+    return stats
+
 
-        slide_index = int(slide_key.split("-")[1])
+def replace_slide_text(
+    prs,
+    slide_key: str,
+    shapes_dict: Dict[str, ShapeData],
+    slide_replacements: Dict,
+    diff: bool,
+    stats: Dict[str, Any],
+) -> None:
+    """Clear the inventory shapes of one slide and add its replacement paragraphs.
 
-        if slide_index >= len(prs.slides):
-            print(f"Warning: Slide {slide_index} not found")
+    Statistics are added to stats (see new_replace_stats).
+    """
+    slide_index = int(slide_key.split("-")[1])
+
+    if slide_index >= len(prs.slides):
+        print(f"Warning: Slide {slide_index} not found")
+        return
+
+    # Process each shape from inventory
+    for shape_key, shape_data in shapes_dict.items():
+        stats["shapes_processed"] += 1
+
+        # Get the shape directly from ShapeData
+        shape = shape_data.shape
+        if not shape:
+            print(f"Warning: {shape_key} has no shape reference")
             continue
 
-        # Process each shape from inventory
-        for shape_key, shape_data in shapes_dict.items():
-            shapes_processed += 1
+        # ShapeData already validates text_frame in __init__
+        text_frame = shape.text_frame  # type: ignore
 
-            # Get the shape directly from ShapeData
-            shape = shape_data.shape
-            if not shape:
-                print(f"Warning: {shape_key} has no shape reference")
-                continue
+        # Check for replacement paragraphs
+        replacement_shape_data = slide_replacements.get(shape_key, {})
 
-            # ShapeData already validates text_frame in __init__
-            text_frame = shape.text_frame  # type: ignore
+        if diff and "paragraphs" in replacement_shape_data:
+            if diff_paragraphs(text_frame, replacement_shape_data["paragraphs"], stats):
+                stats["shapes_replaced"] += 1
+                stats["replaced"].add((slide_key, shape_key))
+            else:
+                stats["shapes_unchanged"] += 1
+            continue
 
-            text_frame.clear()  # type: ignore
-            shapes_cleared += 1
+        text_frame.clear()  # type: ignore
+        stats["shapes_cleared"] += 1
 
-            # Check for replacement paragraphs
-            replacement_shape_data = replacements.get(slide_key, {}).get(shape_key, {})
-            if "paragraphs" not in replacement_shape_data:
-                continue
+        if "paragraphs" not in replacement_shape_data:
+            continue
 
-            shapes_replaced += 1
+        stats["shapes_replaced"] += 1
+        stats["replaced"].add((slide_key, shape_key))
 
-            # Add replacement paragraphs
-            for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
-                if i == 0:
-                    p = text_frame.paragraphs[0]  # type: ignore
-                else:
-                    p = text_frame.add_paragraph()  # type: ignore
+        # Add replacement paragraphs
+        for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
+            if i == 0:
+                p = text_frame.paragraphs[0]  # type: ignore
+            else:
+                p = text_frame.add_paragraph()  # type: ignore
 
-                apply_paragraph_properties(p, para_data)
+            apply_paragraph_properties(p, para_data)
 
-    # Check for issues after replacements
-    # Save to a temporary file and reload to avoid modifying the presentation during inventory
-    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
-    import tempfile
 
-    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        prs.save(str(tmp_path))
+def find_replacement_issues(
+    prs, inventory: InventoryData, original_overflow: Dict, replaced: Set
+) -> Tuple[List[str], List[str]]:
+    """Check replaced text for worsened overflow and formatting warnings.
 
-    try:
-        updated_inventory = extract_text_inventory(tmp_path)
-        updated_overflow = detect_frame_overflow(updated_inventory)
-    finally:
-        tmp_path.unlink()  # Clean up temp file
+    Returns (overflow_errors, warnings).
+    """
+    # Only replaced shapes are measured again; the rest keep their original measurements
+    updated_inventory = remeasure_replaced_shapes(prs, inventory, replaced)
+    updated_overflow = detect_frame_overflow(updated_inventory)
 
     # Check if any text overflow got worse
     overflow_errors = []
@@ -326,6 +668,50 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
                 for warning in shape_data.warnings:
                     warnings.append(f"{slide_key}/{shape_key}: {warning}")
 
+    return overflow_errors, warnings
+
+
+def apply_replacements(
+    pptx_file: str, json_file: str, output_file: str, diff: bool = False
+):
+    """Apply text replacements from JSON to PowerPoint presentation.
+
+    With diff=True, only paragraphs that differ from the current text are rewritten.
+    """
+
+    prs, inventory, original_overflow = load_template(pptx_file)
+    stats = new_replace_stats()
+    applied = set()
+
+    def apply_slide(slide_key, shapes_data):
+        replace_slide_text(
+            prs, slide_key, inventory[slide_key], shapes_data, diff, stats
+        )
+        applied.add(slide_key)
+
+    # Stream the replacement data, validating each slide against the
+    # inventory and applying it in memory; nothing is saved if any fail
+    errors = load_replacements(json_file, build_inventory_index(inventory), apply_slide)
+    if errors:
+        print("ERROR: Invalid shapes in replacement JSON:")
+        for error in errors:
+            print(f"  - {error}")
+        print("\nPlease check the inventory and update your replacement JSON.")
+        print(
+            "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
+        )
+        raise ValueError(f"Found {len(errors)} validation error(s)")
+
+    # Shapes on slides without replacements are cleared
+    for slide_key, shapes_dict in inventory.items():
+        if slide_key.startswith("slide-") and slide_key not in applied:
+            replace_slide_text(prs, slide_key, shapes_dict, {}, diff, stats)
+
+    # Check for issues after replacements
+    overflow_errors, warnings = find_replacement_issues(
+        prs, inventory, original_overflow, stats["replaced"]
+    )
+
     # Fail if there are any issues
     if overflow_errors or warnings:
         print("\nERROR: Issues detected in replacement output:")
@@ -348,20 +734,271 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     # Report results
     print(f"Saved updated presentation to: {output_file}")
     print(f"Processed {len(prs.slides)} slides")
-    print(f"  - Shapes processed: {shapes_processed}")
-    print(f"  - Shapes cleared: {shapes_cleared}")
-    print(f"  - Shapes replaced: {shapes_replaced}")
+    print(f"  - Shapes processed: {stats['shapes_processed']}")
+    print(f"  - Shapes cleared: {stats['shapes_cleared']}")
+    print(f"  - Shapes replaced: {stats['shapes_replaced']}")
+    if diff:
+        print(f"  - Shapes unchanged: {stats['shapes_unchanged']}")
+        print(
+            f"  - Paragraphs unchanged: {stats['paragraphs_unchanged']}, "
+            f"text updated: {stats['paragraphs_text_updated']}, "
+            f"rebuilt: {stats['paragraphs_rebuilt']}, "
+            f"added: {stats['paragraphs_added']}, "
+            f"removed: {stats['paragraphs_removed']}"
+        )
+
+
+def snapshot_text_frames(inventory: InventoryData) -> Dict[Tuple[str, str], Any]:
+    """Copy the <p:txBody> of every inventory shape so it can be restored later."""
+    return {
+        (slide_key, shape_key): deepcopy(shape_data.shape.text_frame._txBody)
+        for slide_key, shapes_dict in inventory.items()
+        for shape_key, shape_data in shapes_dict.items()
+    }
+
+
+def restore_text_frames(inventory: InventoryData, snapshot: Dict) -> None:
+    """Put back the <p:txBody> elements saved by snapshot_text_frames."""
+    for (slide_key, shape_key), txBody in snapshot.items():
+        current = inventory[slide_key][shape_key].shape.text_frame._txBody
+        current.getparent().replace(current, deepcopy(txBody))
+
+
+# Template state of a batch worker:
+# (prs, inventory, inventory index, original_overflow, snapshot)
+_batch_template = None
+
+
+def init_batch_worker(pptx_file: str):
+    """Parse the template and its inventory once per batch worker."""
+    global _batch_template
+    prs, inventory, original_overflow = load_template(pptx_file)
+    _batch_template = (
+        prs,
+        inventory,
+        build_inventory_index(inventory),
+        original_overflow,
+        snapshot_text_frames(inventory),
+    )
+
+
+def apply_batch_record(
+    line_no: int, line: str, output_dir: str, diff: bool = False
+) -> Dict[str, Any]:
+    """Apply one JSONL record to the worker's template and save its output.
+
+    The template's text frames are restored afterwards, so the next record
+    starts from the original deck. Returns a report dict for the record.
+    """
+    prs, inventory, index, original_overflow, snapshot = _batch_template  # type: ignore
+    report: Dict[str, Any] = {"line": line_no, "output": None, "status": "ok"}
+
+    try:
+        record = json.loads(line, object_pairs_hook=check_duplicate_keys)
+        if not isinstance(record, dict) or "replacements" not in record:
+            raise ValueError('Record must be an object with a "replacements" key')
+
+        output_path = resolve_batch_output(output_dir, record, line_no)
+        report["output"] = str(output_path)
+
+        errors = validate_replacements(index, record["replacements"])
+        if errors:
+            report.update(status="invalid", errors=errors)
+            return report
+
+        stats = replace_text(prs, inventory, record["replacements"], diff)
+        overflow_errors, warnings = find_replacement_issues(
+            prs, inventory, original_overflow, stats["replaced"]
+        )
+        report["shapes_replaced"] = stats["shapes_replaced"]
+        if diff:
+            report["changes"] = {key: stats[key] for key in DIFF_STATS}
+        if overflow_errors or warnings:
+            report.update(
+                status="failed", overflow_errors=overflow_errors, warnings=warnings
+            )
+            return report
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        prs.save(str(output_path))
+    except Exception as e:
+        report.update(status="error", errors=[str(e)])
+    finally:
+        restore_text_frames(inventory, snapshot)
+
+    return report
+
+
+def resolve_batch_output(output_dir: str, record: Dict[str, Any], line_no: int) -> Path:
+    """Return the output path of a batch record, resolved inside output_dir.
+
+    Raises ValueError if "output" is not a string, points outside output_dir
+    (absolute paths, "..") or would overwrite the batch report.
+    """
+    name = record.get("output", f"record-{line_no}.pptx")
+    if not isinstance(name, str) or not name:
+        raise ValueError('"output" must be a non-empty string')
+
+    root = Path(output_dir).resolve()
+    output_path = (root / name).resolve()
+    if not output_path.is_relative_to(root) or output_path == root:
+        raise ValueError(f"Output path is outside the output directory: {name}")
+    if output_path == root / BATCH_REPORT_NAME:
+        raise ValueError(f"Output path would overwrite the batch report: {name}")
+    return output_path
+
+
+def find_output_conflicts(records_file: str, output_dir: str) -> Dict[int, str]:
+    """Find batch records that write the same output as another record.
+
+    Returns a dict mapping line number to an error message. Records that
+    cannot be parsed or have an invalid output are left to apply_batch_record,
+    which reports them.
+    """
+    lines_by_output: Dict[Path, List[int]] = {}
+    with open(records_file, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                output_path = resolve_batch_output(output_dir, record, line_no)
+            except (ValueError, AttributeError):
+                continue
+            lines_by_output.setdefault(output_path, []).append(line_no)
+
+    conflicts = {}
+    for output_path, line_nos in lines_by_output.items():
+        if len(line_nos) < 2:
+            continue
+        for line_no in line_nos:
+            others = ", ".join(str(other) for other in line_nos if other != line_no)
+            conflicts[line_no] = (
+                f"Output {output_path} is also written by line(s) {others}"
+            )
+    return conflicts
+
+
+def apply_batch(
+    pptx_file: str,
+    records_file: str,
+    output_dir: str,
+    jobs: int = DEFAULT_JOBS,
+    diff: bool = False,
+) -> int:
+    """Apply every record of a JSONL stream to one template.
+
+    Each line is {"output": "name.pptx", "replacements": {...}}; "output" is
+    relative to output_dir and defaults to record-<line>.pptx. Outputs must
+    stay inside output_dir, and records sharing an output are all reported
+    as invalid instead of overwriting each other. Records are processed in
+    a pool of `jobs` processes, each parsing the template once. Reports are
+    written to output_dir/report.jsonl in input order.
+
+    Returns the number of records that were not saved.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    report_path = Path(output_dir) / BATCH_REPORT_NAME
+    counts = {"ok": 0, "invalid": 0, "failed": 0, "error": 0}
+    conflicts = find_output_conflicts(records_file, output_dir)
+
+    def conflict_report(line_no, line):
+        record = json.loads(line)
+        return {
+            "line": line_no,
+            "output": str(resolve_batch_output(output_dir, record, line_no)),
+            "status": "invalid",
+            "errors": [conflicts[line_no]],
+        }
+
+    def records():
+        with open(records_file, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_no, line
+
+    def write_report(report, report_file):
+        counts[report["status"]] += 1
+        report_file.write(json.dumps(report, ensure_ascii=False) + "\n")
+        if report["status"] != "ok":
+            print(f"  - line {report['line']}: {report['status']}")
+
+    with open(report_path, "w", encoding="utf-8") as report_file:
+        if jobs <= 1:
+            init_batch_worker(pptx_file)
+            for line_no, line in records():
+                if line_no in conflicts:
+                    report = conflict_report(line_no, line)
+                else:
+                    report = apply_batch_record(line_no, line, output_dir, diff)
+                write_report(report, report_file)
+        else:
+            # Keep a bounded window of records in flight so the stream is
+            # never loaded fully, and collect results in input order
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=init_batch_worker,
+                initargs=(pptx_file,),
+            ) as pool:
+                pending = deque()
+                for line_no, line in records():
+                    if line_no in conflicts:
+                        future = Future()
+                        future.set_result(conflict_report(line_no, line))
+                    else:
+                        future = pool.submit(
+                            apply_batch_record, line_no, line, output_dir, diff
+                        )
+                    pending.append(future)
+                    if len(pending) >= jobs * BATCH_QUEUE_FACTOR:
+                        write_report(pending.popleft().result(), report_file)
+                while pending:
+                    write_report(pending.popleft().result(), report_file)
+
+    total = sum(counts.values())
+    print(f"Processed {total} record(s): {counts['ok']} saved to {output_dir}")
+    for status in ("invalid", "failed", "error"):
+        if counts[status]:
+            print(f"  - {status.capitalize()}: {counts[status]}")
+    print(f"Report written to: {report_path}")
+    return total - counts["ok"]
 
 
 def main():
     """Main entry point for command-line usage."""
-    if len(sys.argv) != 4:
-        print(__doc__)
-        sys.exit(1)
-
-    input_pptx = Path(sys.argv[1])
-    replacements_json = Path(sys.argv[2])
-    output_pptx = Path(sys.argv[3])
+    parser = argparse.ArgumentParser(
+        description="Apply text replacements to PowerPoint presentation.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("input", help="Input PowerPoint file (.pptx)")
+    parser.add_argument(
+        "replacements", help="Replacements JSON file (JSONL stream with --batch)"
+    )
+    parser.add_argument(
+        "output", help="Output PowerPoint file (output directory with --batch)"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Apply every record of a JSONL stream, writing one output per record",
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Only rewrite paragraphs that differ from the current text",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Worker processes for --batch (default: {DEFAULT_JOBS})",
+    )
+    args = parser.parse_args()
+
+    input_pptx = Path(args.input)
+    replacements_json = Path(args.replacements)
+    output_pptx = Path(args.output)
 
     if not input_pptx.exists():
         print(f"Error: Input file '{input_pptx}' not found")
@@ -371,8 +1008,24 @@ def main():
         print(f"Error: Replacements JSON file '{replacements_json}' not found")
         sys.exit(1)
 
+    if args.batch:
+        try:
+            failed = apply_batch(
+                str(input_pptx),
+                str(replacements_json),
+                str(output_pptx),
+                args.jobs,
+                args.diff,
+            )
+        except Exception as e:
+            print(f"Error applying batch replacements: {e}")
+            sys.exit(1)
+        sys.exit(1 if failed else 0)
+
     try:
-        apply_replacements(str(input_pptx), str(replacements_json), str(output_pptx))
+        apply_replacements(
+            str(input_pptx), str(replacements_json), str(output_pptx), args.diff
+        )
     except Exception as e:
         print(f"Error applying replacements: {e}")
         import traceback
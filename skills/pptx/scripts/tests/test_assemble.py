@@ -0,0 +1,182 @@
+import io
+import zipfile
+
+import pytest
+from lxml import etree
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from assemble import CT_NS, P_NS, R_NS, assemble_presentation
+
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+
+def png(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color=color).save(buffer, "PNG")
+    buffer.seek(0)
+    return buffer
+
+
+def make_deck(path, titles, master_name=None, image_color=None, link_last=False):
+    """Save a deck with one titled slide per title.
+
+    master_name renames the slide master, which gives the deck its own
+    master/layout family; image_color adds the same picture to every slide;
+    link_last makes the first slide's title link to the last slide.
+    """
+    prs = Presentation()
+    if master_name:
+        prs.slide_master.element.cSld.set("name", master_name)
+    for title in titles:
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = title
+        if image_color:
+            slide.shapes.add_picture(png(image_color), Inches(1), Inches(2))
+    if link_last:
+        prs.slides[0].shapes.title.click_action.target_slide = prs.slides[-1]
+    prs.save(str(path))
+    return path
+
+
+def read_xml(zf, name):
+    return etree.fromstring(zf.read(name.lstrip("/")))
+
+
+def slide_titles(path):
+    return [slide.shapes.title.text for slide in Presentation(str(path)).slides]
+
+
+@pytest.fixture
+def decks(tmp_path):
+    template = tmp_path / "template.pptx"
+    Presentation().save(str(template))
+    return {
+        "template": template,
+        "a": make_deck(tmp_path / "a.pptx", ["A0", "A1"], image_color="red"),
+        "b": make_deck(
+            tmp_path / "b.pptx", ["B0", "B1"], master_name="B", image_color="red"
+        ),
+        "c": make_deck(tmp_path / "c.pptx", ["C0"]),
+    }
+
+
+def test_assemble_merges_masters_and_keeps_manifest_order(tmp_path, decks):
+    output = tmp_path / "out.pptx"
+    entries = [(decks["b"], 1), (decks["a"], 0), (decks["c"], 0), (decks["b"], 0)]
+
+    assemble_presentation(decks["template"], output, entries)
+
+    assert slide_titles(output) == ["B1", "A0", "C0", "B0"]
+    prs = Presentation(str(output))
+    # a and c share the template's master family; b brings its own
+    assert len(prs.slide_masters) == 2
+    assert [len(master.slide_layouts) for master in prs.slide_masters] == [11, 11]
+    with zipfile.ZipFile(output) as zf:
+        names = zf.namelist()
+    assert len([n for n in names if n.startswith("ppt/slideMasters/slide")]) == 2
+    assert len([n for n in names if n.startswith("ppt/slideLayouts/slide")]) == 22
+    # a and b use the same picture, which is stored once
+    assert len([n for n in names if n.startswith("ppt/media/")]) == 1
+
+
+def test_assemble_ids_are_unique(tmp_path, decks):
+    output = tmp_path / "out.pptx"
+    entries = [(decks["a"], 0), (decks["b"], 0), (decks["b"], 1), (decks["a"], 1)]
+
+    assemble_presentation(decks["template"], output, entries)
+
+    with zipfile.ZipFile(output) as zf:
+        presentation = read_xml(zf, "ppt/presentation.xml")
+        master_ids = [
+            int(el.get("id")) for el in presentation.iter(f"{{{P_NS}}}sldMasterId")
+        ]
+        layout_ids = []
+        for name in zf.namelist():
+            if name.startswith("ppt/slideMasters/slide"):
+                master = read_xml(zf, name)
+                layout_ids += [
+                    int(el.get("id")) for el in master.iter(f"{{{P_NS}}}sldLayoutId")
+                ]
+        slide_ids = [int(el.get("id")) for el in presentation.iter(f"{{{P_NS}}}sldId")]
+        slide_rids = [el.get(f"{{{R_NS}}}id") for el in presentation.iter()]
+
+    # Master and layout ids share one id space
+    ids = master_ids + layout_ids
+    assert len(ids) == len(set(ids)) == 2 + 22
+    assert min(ids) >= 2147483648
+    assert len(slide_ids) == len(set(slide_ids)) == 4
+    rids = [rid for rid in slide_rids if rid]
+    assert len(rids) == len(set(rids))
+
+
+def test_assemble_declares_a_content_type_for_every_part(tmp_path, decks):
+    output = tmp_path / "out.pptx"
+    entries = [(decks["a"], 0), (decks["b"], 1), (decks["c"], 0)]
+
+    assemble_presentation(decks["template"], output, entries)
+
+    with zipfile.ZipFile(output) as zf:
+        types = read_xml(zf, "[Content_Types].xml")
+        names = set(zf.namelist())
+    defaults = {
+        el.get("Extension"): el.get("ContentType")
+        for el in types.iter(f"{{{CT_NS}}}Default")
+    }
+    overrides = {
+        el.get("PartName"): el.get("ContentType")
+        for el in types.iter(f"{{{CT_NS}}}Override")
+    }
+    assert all(partname.lstrip("/") in names for partname in overrides)
+    for name in names - {"[Content_Types].xml"}:
+        extension = name.rsplit(".", 1)[-1]
+        assert f"/{name}" in overrides or extension in defaults, name
+    slides = [n for n in names if n.startswith("ppt/slides/slide")]
+    for name in slides:
+        assert overrides[f"/{name}"].endswith("presentationml.slide+xml")
+    assert defaults["png"] == "image/png"
+
+
+def test_assemble_drops_links_to_omitted_slides(tmp_path, decks):
+    linked = make_deck(tmp_path / "linked.pptx", ["L0", "L1"], link_last=True)
+    output = tmp_path / "out.pptx"
+
+    assemble_presentation(decks["template"], output, [(linked, 0)])
+
+    with zipfile.ZipFile(output) as zf:
+        slide = read_xml(zf, "ppt/slides/slide1.xml")
+        rels = zf.read("ppt/slides/_rels/slide1.xml.rels")
+    assert slide.find(f".//{{{A_NS}}}hlinkClick") is None
+    assert b'relationships/slide"' not in rels
+
+
+def test_assemble_keeps_links_to_included_slides(tmp_path, decks):
+    linked = make_deck(tmp_path / "linked.pptx", ["L0", "L1"], link_last=True)
+    output = tmp_path / "out.pptx"
+
+    assemble_presentation(decks["template"], output, [(linked, 1), (linked, 0)])
+
+    prs = Presentation(str(output))
+    title = prs.slides[1].shapes.title
+    assert title.click_action.target_slide.shapes.title.text == "L1"
+
+
+def test_assemble_rejects_part_without_content_type(tmp_path, decks):
+    # Drop the png Default from b.pptx, leaving its picture without a content type
+    broken = tmp_path / "broken.pptx"
+    with zipfile.ZipFile(decks["b"]) as src, zipfile.ZipFile(broken, "w") as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == "[Content_Types].xml":
+                types = etree.fromstring(data)
+                for el in types.findall(f"{{{CT_NS}}}Default[@Extension='png']"):
+                    types.remove(el)
+                data = etree.tostring(types)
+            dst.writestr(info, data)
+    output = tmp_path / "out.pptx"
+
+    with pytest.raises(ValueError, match=r"No content type for /ppt/media/\S+ in"):
+        assemble_presentation(decks["template"], output, [(broken, 0)])
+
+    assert not output.exists()
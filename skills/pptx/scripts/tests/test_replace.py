@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+from replace import apply_batch
+
+
+@pytest.fixture
+def template(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(6), Inches(1))
+    box.text_frame.text = "Hello"
+    path = tmp_path / "template.pptx"
+    prs.save(str(path))
+    return path
+
+
+def write_records(path, outputs):
+    with open(path, "w", encoding="utf-8") as f:
+        for output in outputs:
+            f.write(json.dumps({"output": output, "replacements": {}}) + "\n")
+    return path
+
+
+def read_report(output_dir):
+    with open(output_dir / "report.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_rejects_outputs_outside_output_dir(tmp_path, template, jobs):
+    output_dir = tmp_path / "out"
+    records = write_records(
+        tmp_path / "records.jsonl",
+        ["../escaped.pptx", str(tmp_path / "absolute.pptx"), "report.jsonl", "ok.pptx"],
+    )
+
+    failed = apply_batch(str(template), str(records), str(output_dir), jobs)
+
+    report = read_report(output_dir)
+    assert failed == 3
+    assert [entry["status"] for entry in report] == ["error", "error", "error", "ok"]
+    assert not (tmp_path / "escaped.pptx").exists()
+    assert not (tmp_path / "absolute.pptx").exists()
+    assert (output_dir / "ok.pptx").is_file()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_reports_duplicate_outputs(tmp_path, template, jobs):
+    output_dir = tmp_path / "out"
+    records = write_records(
+        tmp_path / "records.jsonl", ["a.pptx", "b.pptx", "./a.pptx", "sub/../b.pptx"]
+    )
+
+    failed = apply_batch(str(template), str(records), str(output_dir), jobs)
+
+    report = read_report(output_dir)
+    assert failed == 4
+    assert [entry["status"] for entry in report] == ["invalid"] * 4
+    assert "line(s) 3" in report[0]["errors"][0]
+    assert "line(s) 1" in report[2]["errors"][0]
+    assert not (output_dir / "a.pptx").exists()
+    assert not (output_dir / "b.pptx").exists()
@@ -0,0 +1,94 @@
+import pytest
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from inventory import ParagraphData
+from replace import diff_paragraphs, new_replace_stats
+
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+
+@pytest.fixture
+def text_frame():
+    """A text box with three formatted paragraphs, the middle one in two runs."""
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(6), Inches(3))
+    frame = box.text_frame
+
+    def add_run(paragraph, text, size, bold):
+        run = paragraph.add_run()
+        run.text = text
+        run.font.size = Pt(size)
+        run.font.bold = bold
+
+    add_run(frame.paragraphs[0], "Keep me", 24, True)
+    add_run(frame.add_paragraph(), "Old ", 18, False)
+    add_run(frame.paragraphs[1], "text", 18, True)
+    add_run(frame.add_paragraph(), "Restyle me", 14, False)
+    return frame
+
+
+def xml(element):
+    return etree.tostring(element)
+
+
+def current_data(frame):
+    # Like inventory.py, this adds an empty <a:pPr/> to paragraphs without one
+    # (python-pptx creates it when alignment is read), so XML is snapshotted after
+    return [ParagraphData(p).to_dict() for p in frame.paragraphs]
+
+
+def test_diff_leaves_unchanged_paragraphs_alone(text_frame):
+    requested = current_data(text_frame)
+    before = [xml(p._p) for p in text_frame.paragraphs]
+    stats = new_replace_stats()
+
+    changed = diff_paragraphs(text_frame, requested, stats)
+
+    assert changed is False
+    assert [xml(p._p) for p in text_frame.paragraphs] == before
+    assert stats["paragraphs_unchanged"] == 3
+
+
+def test_diff_writes_text_change_into_existing_run(text_frame):
+    requested = current_data(text_frame)
+    requested[1]["text"] = "New text"
+    keep_before = xml(text_frame.paragraphs[0]._p)
+    first_run = text_frame.paragraphs[1].runs[0]._r
+    rpr_before = xml(first_run.rPr)
+    stats = new_replace_stats()
+
+    assert diff_paragraphs(text_frame, requested, stats)
+
+    paragraph = text_frame.paragraphs[1]
+    runs = paragraph._p.findall(f"{A}r")
+    # The first run carries the new text with its original properties
+    assert len(runs) == 1
+    assert runs[0] is first_run
+    assert xml(runs[0].rPr) == rpr_before
+    assert runs[0].findtext(f"{A}t") == "New text"
+    assert xml(text_frame.paragraphs[0]._p) == keep_before
+    assert stats["paragraphs_text_updated"] == 1
+    assert stats["paragraphs_unchanged"] == 2
+    assert stats["paragraphs_rebuilt"] == 0
+
+
+def test_diff_rebuilds_paragraph_when_formatting_changes(text_frame):
+    requested = current_data(text_frame)
+    requested[2].update(text="Restyled", bold=True, font_size=20.0)
+    stats = new_replace_stats()
+
+    assert diff_paragraphs(text_frame, requested, stats)
+
+    paragraph = text_frame.paragraphs[2]
+    runs = paragraph._p.findall(f"{A}r")
+    assert len(runs) == 1
+    assert runs[0].findtext(f"{A}t") == "Restyled"
+    assert runs[0].rPr.get("b") == "1"
+    assert runs[0].rPr.get("sz") == "2000"
+    # Rebuilt paragraphs get the explicit properties apply_paragraph_properties sets
+    assert paragraph._p.pPr.find(f"{A}buNone") is not None
+    assert stats["paragraphs_rebuilt"] == 1
+    assert stats["paragraphs_unchanged"] == 2
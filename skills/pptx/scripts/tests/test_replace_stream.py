@@ -0,0 +1,79 @@
+import io
+import json
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+from replace import STREAM_CHUNK_SIZE, apply_replacements, iter_json_object
+
+DOCUMENTS = [
+    "{}",
+    '{"a":123.5e3, "b": true}',
+    '{"a": -0.5E-7, "b": [1, 2.25, -3e+2], "c": null, "d": false}',
+    '{"n": 123, "m": 4.0}',
+    '{"s": "caf\\u00e9 \\"quoted\\" 12.5", "o": {"x": {"y": [{}]}}}',
+    ' \n{ "slide-0" : { "shape-0" : { "paragraphs" : [ { "text" : "Hi" } ] } } } \n',
+]
+
+
+def parse(text, chunk_size):
+    return list(iter_json_object(io.StringIO(text), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_iter_json_object_at_every_chunk_boundary(text):
+    expected = list(json.loads(text).items())
+    for chunk_size in range(1, len(text) + 2):
+        assert parse(text, chunk_size) == expected, f"chunk_size={chunk_size}"
+
+
+def test_iter_json_object_number_split_at_default_chunk_size():
+    # Place "18.5" so that the default chunk ends right after "18."
+    head = '{"slide-0": {}, "slide-x": "'
+    tail = '", "slide-1": 18.5}'
+    padding = STREAM_CHUNK_SIZE - len(head) - len('", "slide-1": 18.')
+    text = head + "x" * padding + tail
+    assert text[:STREAM_CHUNK_SIZE].endswith("18.")
+
+    assert parse(text, STREAM_CHUNK_SIZE) == list(json.loads(text).items())
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ('{"a": 1.}', "expected ',' or '}'"),
+        ('{"a": 1', "expected ',' or '}'"),
+        ('{"a" 1}', "expected ':'"),
+        ('{"a": 1} x', "extra data"),
+        ("[1]", "expected '{'"),
+    ],
+)
+def test_iter_json_object_rejects_malformed_json(text, message):
+    for chunk_size in range(1, len(text) + 2):
+        with pytest.raises(ValueError, match=message):
+            parse(text, chunk_size)
+
+
+def test_apply_replacements_streams_slides(tmp_path, capsys):
+    prs = Presentation()
+    for text in ("First", "Second"):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(6), Inches(1))
+        box.text_frame.text = text
+    template = tmp_path / "template.pptx"
+    prs.save(str(template))
+
+    replacements = tmp_path / "replacements.json"
+    replacements.write_text(
+        json.dumps({"slide-1": {"shape-0": {"paragraphs": [{"text": "Replaced"}]}}})
+    )
+    output = tmp_path / "output.pptx"
+
+    apply_replacements(str(template), str(replacements), str(output))
+
+    texts = [
+        slide.shapes[0].text_frame.text for slide in Presentation(str(output)).slides
+    ]
+    assert texts == ["", "Replaced"]
+    assert "Shapes replaced: 1" in capsys.readouterr().out
@@ -0,0 +1,149 @@
+from datetime import date
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+import thumbnail
+from thumbnail import (
+    RenderPlan,
+    create_grids,
+    deck_output_paths,
+    render_images,
+    slide_cache_key,
+    split_page_ranges,
+)
+
+
+def make_slides(directory, count):
+    paths = []
+    for i in range(count):
+        path = directory / f"slide-{i}.jpg"
+        Image.new("RGB", (160, 90), color="white").save(path, "JPEG")
+        paths.append(path)
+    return paths
+
+
+def test_create_grids_multiple_grids_with_dotted_prefix(tmp_path):
+    # cols=1 allows 2 images per grid, so 3 slides give 2 grids
+    slides = make_slides(tmp_path, 3)
+    output_path = tmp_path / "out" / "review-deck.final.jpg"
+
+    files = create_grids(slides, 1, 100, output_path, formats=["jpg", "png"])
+
+    expected = [
+        output_path.parent / "review-deck.final-1.jpg",
+        output_path.parent / "review-deck.final-1.png",
+        output_path.parent / "review-deck.final-2.jpg",
+        output_path.parent / "review-deck.final-2.png",
+    ]
+    assert files == [str(path) for path in expected]
+    assert all(path.is_file() for path in expected)
+
+
+def test_create_grids_single_grid_with_dotted_prefix(tmp_path):
+    slides = make_slides(tmp_path, 2)
+    output_path = tmp_path / "out.v2.jpg"
+
+    files = create_grids(slides, 1, 100, output_path)
+
+    assert files == [str(tmp_path / "out.v2.jpg")]
+    assert (tmp_path / "out.v2.jpg").is_file()
+
+
+@pytest.mark.parametrize(
+    "pages, jobs",
+    [
+        ([1, 3, 5, 7, 9], 2),
+        ([1, 3, 5, 7, 9], 1),
+        (list(range(1, 41)), 4),
+        ([1, 2, 3, 10, 11, 12, 30, 31, 50], 3),
+        ([5], 8),
+    ],
+)
+def test_split_page_ranges_respects_jobs(pages, jobs):
+    ranges = split_page_ranges(pages, jobs)
+
+    assert len(ranges) <= jobs
+    covered = {page for first, last in ranges for page in range(first, last + 1)}
+    assert covered >= set(pages)
+    assert ranges == sorted(ranges)
+    assert all(ranges[i][1] < ranges[i + 1][0] for i in range(len(ranges) - 1))
+
+
+def test_split_page_ranges_merges_closest_ranges():
+    assert split_page_ranges([1, 2, 3, 10, 11, 12, 30, 31], 2) == [(1, 12), (30, 31)]
+
+
+def test_render_images_labels_skip_missing_slides(tmp_path):
+    slides = make_slides(tmp_path, 2)
+    plan = RenderPlan(
+        pptx_path=tmp_path / "deck.pptx",
+        temp_dir=tmp_path,
+        total_slides=4,
+        hidden_slides={4},
+        selected=[1, 2, 3, 4],
+        cached={1: slides[0], 3: slides[1]},
+    )
+
+    images = render_images(plan, 100)
+
+    assert list(images) == [0, 2, 3]
+    assert images[0] == slides[0]
+    assert images[2] == slides[1]
+
+
+def test_deck_output_paths_names_grids_by_deck(tmp_path):
+    decks = [tmp_path / "a" / "intro.pptx", tmp_path / "b" / "outro.pptx"]
+
+    paths = deck_output_paths(decks, tmp_path / "review", "jpg")
+
+    assert paths == [tmp_path / "review-intro.jpg", tmp_path / "review-outro.jpg"]
+
+
+@pytest.mark.parametrize(
+    "names", [["a/deck.pptx", "b/deck.pptx"], ["deck.pptx", "other.pptx", "deck.pptx"]]
+)
+def test_deck_output_paths_rejects_shared_grids(tmp_path, names):
+    decks = [tmp_path / name for name in names]
+
+    with pytest.raises(ValueError, match="would both write"):
+        deck_output_paths(decks, tmp_path / "review", "jpg")
+
+
+def slide_with_field(field_type):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+    run = box.text_frame.paragraphs[0].add_run()
+    run.text = "01/01/2024"
+    # Turn the run into a field: <a:fld id=... type=...><a:t>...</a:t></a:fld>
+    run._r.tag = run._r.tag.replace("}r", "}fld")
+    run._r.set("id", "{B6F15528-21DE-4FAA-801E-634DDDAF4B2B}")
+    run._r.set("type", field_type)
+    return slide
+
+
+class FixedDate(date):
+    today_value = date(2024, 1, 1)
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+def test_slide_cache_key_includes_render_date_for_date_fields(monkeypatch):
+    monkeypatch.setattr(thumbnail, "date", FixedDate)
+    slide = slide_with_field("datetime1")
+
+    first = slide_cache_key(slide, 1, "100dpi")
+    assert slide_cache_key(slide, 1, "100dpi") == first
+
+    monkeypatch.setattr(FixedDate, "today_value", date(2024, 1, 2))
+    assert slide_cache_key(slide, 1, "100dpi") != first
+
+
+@pytest.mark.parametrize("field_type", ["datetime10", "datetime13"])
+def test_slide_cache_key_skips_slides_with_time_fields(field_type):
+    assert slide_cache_key(slide_with_field(field_type), 1, "100dpi") is None
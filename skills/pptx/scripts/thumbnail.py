@@ -11,6 +11,7 @@ The program outputs the names of all files created.
 Output:
 - Single grid: {prefix}.jpg (if slides fit in one grid)
 - Multiple grids: {prefix}-1.jpg, {prefix}-2.jpg, etc.
+- --format png,webp (or any mix with jpg) writes each grid once per format
 
 Grid limits by column count:
 - 3 cols: max 12 slides per grid (3×4)
@@ -18,8 +19,29 @@ Grid limits by column count:
 - 5 cols: max 30 slides per grid (5×6) [default]
 - 6 cols: max 42 slides per grid (6×7)
 
+When several decks are given, PDF conversion goes through a pool of warm
+headless LibreOffice instances (see RenderService) so LibreOffice startup is
+paid only once for the whole batch. Each deck's grids are then named
+{prefix}-{deck_stem}.jpg (or {prefix}-{deck_stem}-N.jpg); decks that would
+write the same grid (same file name in two folders, or one deck given twice)
+are rejected before anything is rendered.
+
+Rendered slide images are kept in a content-addressed cache keyed on the
+slide XML, its related media and its layout/master (see RenderCache), so
+only slides that changed since the last run go through LibreOffice and
+pdftoppm. Clean slides are hidden in the copy handed to LibreOffice. Slides
+showing a date field are cached for the day they were rendered; slides
+showing a time field are always rendered.
+
+Rasterization is split into page ranges that run in parallel (--jobs), can
+be limited to a subset of slides (--slides) and can render straight at
+thumbnail width (--thumbnail-resolution) instead of CONVERSION_DPI.
+
 Usage:
-    python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders]
+    python thumbnail.py input.pptx [more.pptx ...] [output_prefix] [--cols N]
+        [--outline-placeholders] [--render-workers N] [--slides RANGES]
+        [--jobs N] [--thumbnail-resolution] [--cache-dir DIR] [--cache-size MB]
+        [--no-cache] [--format jpg,png,webp]
 
 Examples:
     python thumbnail.py presentation.pptx
@@ -38,17 +60,45 @@ Examples:
 
     python thumbnail.py template.pptx analysis --outline-placeholders
     # Creates thumbnail grids with red outlines around text placeholders
+
+    python thumbnail.py deck-a.pptx deck-b.pptx deck-c.pptx review --render-workers 2
+    # Creates: review-deck-a.jpg, review-deck-b.jpg, review-deck-c.jpg
+    # using two warm LibreOffice instances for the PDF conversions
+
+    python thumbnail.py large-deck.pptx section --slides 10-20 --thumbnail-resolution
+    # Creates: section.jpg with slides 10 to 20 rasterized at thumbnail width
 """
 
 import argparse
+import hashlib
+import os
+import queue
+import re
+import shutil
+import socket
 import subprocess
 import sys
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
 from pathlib import Path
+from typing import Dict, List, Optional, Set
 
-from inventory import extract_text_inventory
+from inventory import extract_shape_geometry
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+# The UNO bridge ships with LibreOffice (python3-uno) and is optional; without it
+# every deck is converted by a cold `soffice --convert-to pdf` subprocess.
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+except ImportError:
+    uno = None
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
@@ -56,6 +106,16 @@ CONVERSION_DPI = 100  # DPI for PDF to image conversion
 MAX_COLS = 6  # Maximum number of columns
 DEFAULT_COLS = 5  # Default number of columns
 JPEG_QUALITY = 95  # JPEG compression quality
+WEBP_QUALITY = 90  # WebP compression quality
+REDUCING_GAP = 2.0  # Integer reduce before resampling, see Image.thumbnail()
+
+# Save options per grid output format
+GRID_SAVE_OPTIONS = {
+    "jpg": {"format": "JPEG", "quality": JPEG_QUALITY},
+    "png": {"format": "PNG"},
+    "webp": {"format": "WEBP", "quality": WEBP_QUALITY, "method": 4},
+}
+DEFAULT_FORMAT = "jpg"
 
 # Grid layout constants
 GRID_PADDING = 20  # Padding between thumbnails
@@ -63,17 +123,38 @@ BORDER_WIDTH = 2  # Border width around thumbnails
 FONT_SIZE_RATIO = 0.12  # Font size as fraction of thumbnail width
 LABEL_PADDING_RATIO = 0.4  # Label padding as fraction of font size
 
+# Render service constants
+DEFAULT_RENDER_WORKERS = 1  # Warm LibreOffice instances kept for a batch
+SOFFICE_START_TIMEOUT = 60  # Seconds to wait for an instance to accept connections
+SOFFICE_STOP_TIMEOUT = 10  # Seconds to wait for an instance to exit
+
+# Rasterization constants
+DEFAULT_JOBS = os.cpu_count() or 1  # Parallel pdftoppm processes
+MIN_PAGES_PER_JOB = 4  # Smaller chunks cost more in pdftoppm startup than they save
+
+# Render cache constants
+CACHE_VERSION = 1  # Bump to invalidate cached images after rendering changes
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pptx-thumbnails"
+)
+DEFAULT_CACHE_SIZE_MB = 512  # Total size kept before LRU eviction
+# Relationships that do not affect how a slide renders
+CACHE_SKIP_RELTYPES = {RT.NOTES_SLIDE, RT.SLIDE, RT.COMMENTS, RT.COMMENT_AUTHORS}
+# Date/time field types ("datetime", "datetime1".."datetime13", "datetimeFigureOut")
+DATETIME_FIELD_PATTERN = re.compile(rb'type="datetime(\w*)"')
+TIME_FIELD_FORMATS = {b"10", b"11", b"12", b"13"}  # h:mm, h:mm:ss (24h and AM/PM)
+
 
 def main():
     parser = argparse.ArgumentParser(
         description="Create thumbnail grids from PowerPoint slides."
     )
-    parser.add_argument("input", help="Input PowerPoint file (.pptx)")
     parser.add_argument(
-        "output_prefix",
-        nargs="?",
-        default="thumbnails",
-        help="Output prefix for image files (default: thumbnails, will create prefix.jpg or prefix-N.jpg)",
+        "inputs",
+        nargs="+",
+        metavar="input",
+        help="Input PowerPoint file(s) (.pptx), optionally followed by an output prefix "
+        "(default: thumbnails, will create prefix.jpg or prefix-N.jpg)",
     )
     parser.add_argument(
         "--cols",
@@ -86,64 +167,385 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=DEFAULT_RENDER_WORKERS,
+        help=f"Warm LibreOffice instances used for a batch of decks (default: {DEFAULT_RENDER_WORKERS})",
+    )
+    parser.add_argument(
+        "--slides",
+        help="Only render these slides (0-based), e.g. 10-20 or 0,3,5-8",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Parallel rasterization processes (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--thumbnail-resolution",
+        action="store_true",
+        help="Rasterize straight at thumbnail width instead of full DPI",
+    )
+    parser.add_argument(
+        "--format",
+        default=DEFAULT_FORMAT,
+        help=f"Comma-separated grid formats: {', '.join(GRID_SAVE_OPTIONS)} (default: {DEFAULT_FORMAT})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory for cached slide images (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help=f"Maximum cache size in MB (default: {DEFAULT_CACHE_SIZE_MB})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Render every slide without reading or writing the cache",
+    )
 
     args = parser.parse_args()
 
+    # Split positional arguments into input decks and the optional output prefix
+    inputs = list(args.inputs)
+    output_prefix = "thumbnails"
+    if len(inputs) > 1 and Path(inputs[-1]).suffix.lower() != ".pptx":
+        output_prefix = inputs.pop()
+
     # Validate columns
     cols = min(args.cols, MAX_COLS)
     if args.cols > MAX_COLS:
         print(f"Warning: Columns limited to {MAX_COLS} (requested {args.cols})")
 
-    # Validate input
-    input_path = Path(args.input)
-    if not input_path.exists() or input_path.suffix.lower() != ".pptx":
-        print(f"Error: Invalid PowerPoint file: {args.input}")
+    # Validate slide selection
+    slides = None
+    if args.slides:
+        try:
+            slides = parse_slide_ranges(args.slides)
+        except ValueError:
+            print(
+                f"Error: Invalid slide selection: {args.slides} (use e.g. 10-20 or 0,3,5-8)"
+            )
+            sys.exit(1)
+
+    # Validate output formats
+    formats = [fmt.strip().lower() for fmt in args.format.split(",")]
+    formats = ["jpg" if fmt == "jpeg" else fmt for fmt in formats]
+    unknown = [fmt for fmt in formats if fmt not in GRID_SAVE_OPTIONS]
+    if unknown:
+        print(f"Error: Unsupported format: {unknown[0]}")
         sys.exit(1)
 
-    # Construct output path (always JPG)
-    output_path = Path(f"{args.output_prefix}.jpg")
+    # Validate input
+    input_paths = [Path(p) for p in inputs]
+    for input_path in input_paths:
+        if not input_path.exists() or input_path.suffix.lower() != ".pptx":
+            print(f"Error: Invalid PowerPoint file: {input_path}")
+            sys.exit(1)
 
-    print(f"Processing: {args.input}")
+    # Construct output paths (suffix follows the first format)
+    try:
+        output_paths = deck_output_paths(input_paths, output_prefix, formats[0])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
+    cache = (
+        None if args.no_cache else open_render_cache(args.cache_dir, args.cache_size)
+    )
+    width = THUMBNAIL_WIDTH if args.thumbnail_resolution else None
+    render_key = f"{width}px" if width else f"{CONVERSION_DPI}dpi"
+
+    renderer = None
     try:
         with tempfile.TemporaryDirectory() as temp_dir:
-            # Get placeholder regions if outlining is enabled
-            placeholder_regions = None
-            slide_dimensions = None
-            if args.outline_placeholders:
-                print("Extracting placeholder regions...")
-                placeholder_regions, slide_dimensions = get_placeholder_regions(
-                    input_path
+            # Work out which slides of each deck actually need rendering
+            plans = []
+            for deck_idx, input_path in enumerate(input_paths):
+                print(f"Processing: {input_path}")
+                deck_dir = Path(temp_dir) / f"deck-{deck_idx}"
+                deck_dir.mkdir()
+                plans.append(
+                    plan_render(input_path, deck_dir, slides, cache, render_key)
                 )
-                if placeholder_regions:
-                    print(f"Found placeholders on {len(placeholder_regions)} slides")
-
-            # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
-            if not slide_images:
-                print("Error: No slides found")
-                sys.exit(1)
-
-            print(f"Found {len(slide_images)} slides")
-
-            # Create grids (max cols×(cols+1) images per grid)
-            grid_files = create_grids(
-                slide_images,
-                cols,
-                THUMBNAIL_WIDTH,
-                output_path,
-                placeholder_regions,
-                slide_dimensions,
-            )
 
-            # Print saved files
-            print(f"Created {len(grid_files)} grid(s):")
-            for grid_file in grid_files:
-                print(f"  - {grid_file}")
+            # Keep LibreOffice warm when a batch of decks has to be converted,
+            # and queue every PDF conversion up front so warm instances stay busy
+            dirty_plans = [plan for plan in plans if plan.dirty]
+            if len(dirty_plans) > 1:
+                renderer = start_render_service(args.render_workers)
+            pdf_jobs = [
+                (
+                    renderer.submit(plan.source_path, plan.pdf_path)
+                    if renderer and plan.dirty
+                    else None
+                )
+                for plan in plans
+            ]
+
+            for input_path, output_path, plan, job in zip(
+                input_paths, output_paths, plans, pdf_jobs
+            ):
+                if job is not None:
+                    job.result()
+
+                # Get placeholder regions if outlining is enabled
+                placeholder_regions = None
+                slide_dimensions = None
+                if args.outline_placeholders:
+                    print("Extracting placeholder regions...")
+                    placeholder_regions, slide_dimensions = get_placeholder_regions(
+                        input_path
+                    )
+                    if placeholder_regions:
+                        print(
+                            f"Found placeholders on {len(placeholder_regions)} slides"
+                        )
+
+                # Convert slides to images
+                images = render_images(
+                    plan,
+                    CONVERSION_DPI,
+                    converted=job is not None,
+                    jobs=args.jobs,
+                    width=width,
+                    cache=cache,
+                )
+                if not images:
+                    print("Error: No slides found")
+                    sys.exit(1)
+
+                print(f"Found {len(images)} slides")
+                # Label each image with the slide it was actually rendered from
+                slide_numbers = list(images)
+                slide_images = list(images.values())
+
+                # Create grids (max cols×(cols+1) images per grid)
+                grid_files = create_grids(
+                    slide_images,
+                    cols,
+                    THUMBNAIL_WIDTH,
+                    output_path,
+                    placeholder_regions,
+                    slide_dimensions,
+                    slide_numbers,
+                    formats,
+                    args.jobs,
+                )
+
+                # Print saved files
+                print(f"Created {len(grid_files)} grid(s):")
+                for grid_file in grid_files:
+                    print(f"  - {grid_file}")
 
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if renderer:
+            renderer.close()
+        if cache:
+            cache.evict()
+
+
+def start_render_service(workers):
+    """Start a RenderService, or return None to fall back to cold conversions."""
+    if uno is None:
+        print(
+            "Warning: LibreOffice UNO bridge not available, converting each deck separately"
+        )
+        return None
+
+    print(f"Starting {workers} LibreOffice render worker(s)...")
+    try:
+        return RenderService(workers)
+    except Exception as e:
+        print(
+            f"Warning: Could not start render service ({e}), converting each deck separately"
+        )
+        return None
+
+
+class SofficeInstance:
+    """A headless LibreOffice process listening on a UNO socket.
+
+    Each instance uses its own user profile so several can run side by side.
+    """
+
+    def __init__(self):
+        self.port = None
+        self.process = None
+        self.desktop = None
+        self.profile_dir = Path(tempfile.mkdtemp(prefix="soffice-profile-"))
+
+    def start(self):
+        """Launch soffice and connect to its desktop over the UNO bridge."""
+        self.port = find_free_port()
+        self.process = subprocess.Popen(
+            [
+                "soffice",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + SOFFICE_START_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+                )
+                break
+            except NoConnectException:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError("LibreOffice instance failed to start")
+                time.sleep(0.25)
+
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def is_alive(self):
+        """Check whether the soffice process is still running."""
+        return self.process is not None and self.process.poll() is None
+
+    def convert(self, pptx_path, pdf_path):
+        """Convert a presentation to PDF inside this instance."""
+        document = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(Path(pptx_path).resolve())),
+            "_blank",
+            0,
+            (make_property("Hidden", True),),
+        )
+        if document is None:
+            raise RuntimeError(f"LibreOffice could not open {pptx_path}")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(Path(pdf_path).resolve())),
+                (make_property("FilterName", "impress_pdf_Export"),),
+            )
+        finally:
+            document.close(True)
+
+    def stop(self):
+        """Shut the instance down, killing it if it does not exit in time."""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass  # Bridge is already gone if the process crashed
+            self.desktop = None
+
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=SOFFICE_STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+    def close(self):
+        """Stop the instance and remove its user profile."""
+        self.stop()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class RenderService:
+    """Pool of warm headless LibreOffice instances that convert decks to PDF.
+
+    Conversions are queued and handed to the next idle instance. An instance
+    that crashes is restarted and the conversion is retried once.
+    """
+
+    def __init__(self, workers=DEFAULT_RENDER_WORKERS):
+        workers = max(1, workers)
+        self.instances = []
+        self.idle = queue.Queue()
+        try:
+            for _ in range(workers):
+                instance = SofficeInstance()
+                self.instances.append(instance)
+                instance.start()
+                self.idle.put(instance)
+        except Exception:
+            self.close()
+            raise
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, pptx_path, pdf_path):
+        """Queue a conversion and return a Future resolving to pdf_path."""
+        return self.executor.submit(self.convert, pptx_path, pdf_path)
+
+    def convert(self, pptx_path, pdf_path):
+        """Convert a presentation to PDF on the next idle instance."""
+        instance = self.idle.get()
+        try:
+            for attempt in range(2):
+                if not instance.is_alive():
+                    print("Restarting crashed LibreOffice instance...")
+                    instance.stop()
+                    instance.start()
+                try:
+                    instance.convert(pptx_path, pdf_path)
+                    break
+                except Exception:
+                    # Only a crash is worth a retry; a bad deck fails the same way twice
+                    if attempt or instance.is_alive():
+                        raise
+        finally:
+            self.idle.put(instance)
+
+        if not Path(pdf_path).exists():
+            raise RuntimeError("PDF conversion failed")
+        return pdf_path
+
+    def close(self):
+        """Stop all instances."""
+        if getattr(self, "executor", None):
+            self.executor.shutdown(wait=True)
+        for instance in self.instances:
+            instance.close()
+        self.instances = []
+
+
+def make_property(name, value):
+    """Build a UNO PropertyValue."""
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+def find_free_port():
+    """Ask the OS for an unused local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
 
 
 def create_hidden_slide_placeholder(size):
@@ -165,20 +567,20 @@ def get_placeholder_regions(pptx_path):
     slide_dimensions is a tuple of (width_inches, height_inches).
     """
     prs = Presentation(str(pptx_path))
-    inventory = extract_text_inventory(pptx_path, prs)
+    geometry = extract_shape_geometry(pptx_path, prs)
     placeholder_regions = {}
 
     # Get actual slide dimensions in inches (EMU to inches conversion)
     slide_width_inches = (prs.slide_width or 9144000) / 914400.0
     slide_height_inches = (prs.slide_height or 5143500) / 914400.0
 
-    for slide_key, shapes in inventory.items():
+    for slide_key, shapes in geometry.items():
         # Extract slide index from "slide-N" format
         slide_idx = int(slide_key.split("-")[1])
         regions = []
 
         for shape_key, shape_data in shapes.items():
-            # The inventory only contains shapes with text, so all shapes should be highlighted
+            # Geometry only covers shapes with text, so all shapes should be highlighted
             regions.append(
                 {
                     "left": shape_data.left,
@@ -194,8 +596,99 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
+def parse_slide_ranges(spec):
+    """Parse a selection like "10-20" or "0,3,5-8" into sorted 0-based indices."""
+    slides = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+            if start < 0 or end < start:
+                raise ValueError(f"Invalid slide range: {part}")
+            slides.update(range(start, end + 1))
+        else:
+            index = int(part)
+            if index < 0:
+                raise ValueError(f"Invalid slide index: {part}")
+            slides.add(index)
+    return sorted(slides)
+
+
+def deck_output_paths(input_paths, output_prefix, suffix):
+    """Return the grid output path of each deck.
+
+    A single deck writes {prefix}.{suffix}; several decks write
+    {prefix}-{deck_stem}.{suffix}. Raises ValueError if two decks would write
+    the same grid, e.g. a/deck.pptx and b/deck.pptx or one deck given twice.
+    """
+    if len(input_paths) == 1:
+        return [Path(f"{output_prefix}.{suffix}")]
+
+    output_paths = []
+    seen = {}
+    for input_path in input_paths:
+        output_path = Path(f"{output_prefix}-{input_path.stem}.{suffix}")
+        previous = seen.setdefault(output_path.resolve(), input_path)
+        if previous is not input_path:
+            raise ValueError(
+                f"{previous} and {input_path} would both write {output_path}; "
+                "rename one of the decks"
+            )
+        output_paths.append(output_path)
+    return output_paths
+
+
+@dataclass
+class RenderPlan:
+    """Which slides of a deck must be rendered, and which come from the cache.
+
+    Slide numbers are 1-based, like the PDF pages LibreOffice produces.
+    """
+
+    pptx_path: Path
+    temp_dir: Path
+    total_slides: int
+    hidden_slides: Set[int]
+    selected: List[int]  # Slides to return images for, in order
+    dirty: List[int] = field(default_factory=list)  # Visible slides to render
+    cached: Dict[int, Path] = field(default_factory=dict)  # Slide -> cached image
+    keys: Dict[int, str] = field(default_factory=dict)  # Dirty slide -> cache key
+    source_path: Optional[Path] = None  # Deck handed to LibreOffice
+
+    @property
+    def pdf_path(self):
+        return self.temp_dir / f"{self.source_path.stem}.pdf"
+
+
+def convert_to_images(
+    pptx_path,
+    temp_dir,
+    dpi,
+    slides=None,
+    jobs=DEFAULT_JOBS,
+    width=None,
+    cache=None,
+):
+    """Convert PowerPoint to images via PDF, handling hidden slides.
+
+    If slides is given, only those 0-based slide indices are rasterized and the
+    returned images follow that order. If width is given, pages are rendered
+    straight at that width instead of at dpi. With a RenderCache, unchanged
+    slides are taken from the cache instead of being rendered.
+    """
+    render_key = f"{width}px" if width else f"{dpi}dpi"
+    plan = plan_render(pptx_path, temp_dir, slides, cache, render_key)
+    images = render_images(plan, dpi, jobs=jobs, width=width, cache=cache)
+    return list(images.values())
+
+
+def plan_render(pptx_path, temp_dir, slides=None, cache=None, render_key=""):
+    """Decide which slides need LibreOffice and prepare the deck to convert.
+
+    When only some visible slides are dirty, a copy of the deck with every
+    other slide hidden is written to temp_dir, so LibreOffice only exports
+    the dirty ones while slide numbering stays intact.
+    """
     # Detect hidden slides
     print("Analyzing presentation...")
     prs = Presentation(str(pptx_path))
@@ -212,65 +705,308 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
+    # Slide numbers to render (1-based, like hidden_slides)
+    if slides is None:
+        selected = list(range(1, total_slides + 1))
+    else:
+        out_of_range = [idx for idx in slides if idx >= total_slides]
+        if out_of_range:
+            raise ValueError(
+                f"Slide index {out_of_range[0]} out of range (0-{total_slides - 1})"
+            )
+        selected = [idx + 1 for idx in slides]
+
+    plan = RenderPlan(pptx_path, temp_dir, total_slides, hidden_slides, selected)
+
+    # Look up visible slides in the cache
+    render_key = f"{render_key}|{prs.slide_width}x{prs.slide_height}"
+    for slide_num in sorted(set(selected) - hidden_slides):
+        if cache is None:
+            plan.dirty.append(slide_num)
+            continue
+        key = slide_cache_key(prs.slides[slide_num - 1], slide_num, render_key)
+        cached_path = cache.get(key) if key else None
+        if cached_path:
+            plan.cached[slide_num] = cached_path
+        else:
+            plan.dirty.append(slide_num)
+            if key:
+                plan.keys[slide_num] = key
+
+    if plan.cached:
+        print(f"Reusing {len(plan.cached)} cached slide image(s)")
+
+    # Hide clean slides so LibreOffice only exports the dirty ones
+    visible_slides = set(range(1, total_slides + 1)) - hidden_slides
+    if plan.dirty and set(plan.dirty) != visible_slides:
+        for slide_num in visible_slides - set(plan.dirty):
+            prs.slides[slide_num - 1].element.set("show", "0")
+        plan.source_path = temp_dir / f"subset-{pptx_path.stem}.pptx"
+        prs.save(str(plan.source_path))
+    else:
+        plan.source_path = pptx_path
 
-    # Convert to PDF
-    print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
+    return plan
 
-    # Convert PDF to images
-    print(f"Converting to images at {dpi} DPI...")
-    result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError("Image conversion failed")
 
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
+def render_images(
+    plan, dpi, converted=False, jobs=DEFAULT_JOBS, width=None, cache=None
+):
+    """Render the dirty slides of a RenderPlan and return images for all selected slides.
 
-    # Create full list with placeholders for hidden slides
-    all_images = []
-    visible_idx = 0
+    Returns a dict mapping 0-based slide index to image path, in the order of
+    plan.selected; slides whose page could not be rendered are left out.
+    If converted is True, plan.pdf_path already exists (e.g. produced by a
+    RenderService) and the soffice step is skipped. Newly rendered images
+    are stored in the cache.
+    """
+    temp_dir = plan.temp_dir
+    slide_images = dict(plan.cached)
+
+    if plan.dirty:
+        # Convert to PDF
+        if not converted:
+            convert_to_pdf(plan.source_path, temp_dir)
+        if not plan.pdf_path.exists():
+            raise RuntimeError("PDF conversion failed")
+
+        # Convert PDF to images (the PDF holds exactly the dirty slides, in order)
+        pages = list(range(1, len(plan.dirty) + 1))
+        if width:
+            print(f"Converting {len(pages)} page(s) to images at {width}px width...")
+        else:
+            print(f"Converting {len(pages)} page(s) to images at {dpi} DPI...")
+        page_images = rasterize_pages(
+            plan.pdf_path, temp_dir / "slide", pages, dpi, jobs, width
+        )
+
+        for page, slide_num in zip(pages, plan.dirty):
+            if page in page_images:
+                slide_images[slide_num] = page_images[page]
+                if cache and slide_num in plan.keys:
+                    cache.put(plan.keys[slide_num], page_images[page])
 
     # Get placeholder dimensions from first visible slide
-    if visible_images:
-        with Image.open(visible_images[0]) as img:
+    if slide_images:
+        with Image.open(next(iter(slide_images.values()))) as img:
             placeholder_size = img.size
     else:
         placeholder_size = (1920, 1080)
 
-    for slide_num in range(1, total_slides + 1):
-        if slide_num in hidden_slides:
+    # Create full list with placeholders for hidden slides
+    all_images = {}
+    for slide_num in plan.selected:
+        if slide_num in plan.hidden_slides:
             # Create placeholder image for hidden slide
             placeholder_path = temp_dir / f"hidden-{slide_num:03d}.jpg"
             placeholder_img = create_hidden_slide_placeholder(placeholder_size)
             placeholder_img.save(placeholder_path, "JPEG")
-            all_images.append(placeholder_path)
-        else:
+            all_images[slide_num - 1] = placeholder_path
+        elif slide_num in slide_images:
             # Use the actual visible slide image
-            if visible_idx < len(visible_images):
-                all_images.append(visible_images[visible_idx])
-                visible_idx += 1
+            all_images[slide_num - 1] = slide_images[slide_num]
+        else:
+            print(f"Warning: No image rendered for slide {slide_num - 1}")
 
     return all_images
 
 
+def slide_cache_key(slide, slide_num, render_key):
+    """Hash everything that affects how a slide renders.
+
+    Covers the slide XML, its media, and its layout, master and theme along
+    with their media. The slide number is included only when a slide number
+    field appears in any of those parts, and today's date only when a date
+    field does. Returns None when a time field appears, since such a slide
+    renders differently from one minute to the next and must not be cached.
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}|{render_key}".encode())
+    has_slide_number = False
+    has_date = False
+    visited = set()
+    pending = [slide.part]
+    while pending:
+        part = pending.pop()
+        if part.partname in visited:
+            continue
+        visited.add(part.partname)
+
+        blob = part.blob
+        digest.update(str(part.partname).encode())
+        digest.update(hashlib.sha256(blob).digest())
+        has_slide_number = has_slide_number or b'type="slidenum"' in blob
+        for field_format in DATETIME_FIELD_PATTERN.findall(blob):
+            if field_format in TIME_FIELD_FORMATS:
+                return None
+            has_date = True
+
+        for rel in part.rels.values():
+            if rel.is_external:
+                digest.update(rel.target_ref.encode())
+                continue
+            if rel.reltype in CACHE_SKIP_RELTYPES:
+                continue
+            # A master lists all of its layouts; only the slide's own layout matters
+            if rel.reltype == RT.SLIDE_LAYOUT and part is not slide.part:
+                continue
+            pending.append(rel.target_part)
+
+    if has_slide_number:
+        digest.update(f"|slide{slide_num}".encode())
+    if has_date:
+        digest.update(f"|{date.today().isoformat()}".encode())
+    return digest.hexdigest()
+
+
+def open_render_cache(cache_dir, size_mb):
+    """Open a RenderCache, or return None if the directory is unusable."""
+    try:
+        return RenderCache(cache_dir, size_mb * 1024 * 1024)
+    except OSError as e:
+        print(f"Warning: Render cache disabled ({e})")
+        return None
+
+
+class RenderCache:
+    """Content-addressed store of rendered slide images.
+
+    Images are stored as {key}.jpg. A hit refreshes the file's mtime, and
+    evict() removes the least recently used images until the total size is
+    below the limit.
+    """
+
+    def __init__(
+        self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_SIZE_MB * 1024 * 1024
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key):
+        """Return the cached image path for key, or None."""
+        path = self.cache_dir / f"{key}.jpg"
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, image_path):
+        """Store a copy of image_path under key."""
+        path = self.cache_dir / f"{key}.jpg"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(image_path, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache slide image ({e})")
+            tmp_path.unlink(missing_ok=True)
+
+    def evict(self):
+        """Delete least recently used images until the cache fits max_bytes."""
+        entries = []
+        for path in self.cache_dir.glob("*.jpg"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def split_page_ranges(pages, jobs):
+    """Split sorted page numbers into at most `jobs` (first, last) ranges.
+
+    Pages are first grouped into contiguous runs, then long runs are cut so the
+    work is spread evenly, without going below MIN_PAGES_PER_JOB per range.
+    While there are more ranges than jobs, the two ranges with the smallest
+    gap between them are merged, so a range may cover pages that were not
+    asked for; callers pick the wanted pages from the output.
+    """
+    if not pages:
+        return []
+
+    chunk_size = max(MIN_PAGES_PER_JOB, -(-len(pages) // max(1, jobs)))
+    ranges = []
+    first = prev = pages[0]
+    count = 1
+    for page in pages[1:]:
+        if page == prev + 1 and count < chunk_size:
+            prev = page
+            count += 1
+            continue
+        ranges.append((first, prev))
+        first = prev = page
+        count = 1
+    ranges.append((first, prev))
+
+    while len(ranges) > max(1, jobs):
+        i = min(range(len(ranges) - 1), key=lambda i: ranges[i + 1][0] - ranges[i][1])
+        ranges[i : i + 2] = [(ranges[i][0], ranges[i + 1][1])]
+    return ranges
+
+
+def rasterize_pages(pdf_path, output_root, pages, dpi, jobs=DEFAULT_JOBS, width=None):
+    """Rasterize PDF pages with pdftoppm, running page ranges in parallel.
+
+    Returns a dict mapping page number to image path.
+    """
+    if width:
+        scale_args = ["-scale-to-x", str(width), "-scale-to-y", "-1"]
+    else:
+        scale_args = ["-r", str(dpi)]
+
+    def run_range(page_range):
+        first, last = page_range
+        result = subprocess.run(
+            ["pdftoppm", "-jpeg", *scale_args, "-f", str(first), "-l", str(last)]
+            + [str(pdf_path), str(output_root)],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("Image conversion failed")
+
+    ranges = split_page_ranges(pages, jobs)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(ranges) or 1))) as pool:
+        list(pool.map(run_range, ranges))
+
+    # pdftoppm names pages {root}-N.jpg, zero-padded to the document's page count
+    wanted = set(pages)
+    page_images = {}
+    for image_path in output_root.parent.glob(f"{output_root.name}-*.jpg"):
+        page = int(image_path.stem.rsplit("-", 1)[1])
+        if page in wanted:
+            page_images[page] = image_path
+    return page_images
+
+
+def convert_to_pdf(pptx_path, temp_dir):
+    """Convert a presentation to PDF with a cold soffice subprocess."""
+    print("Converting to PDF...")
+    result = subprocess.run(
+        [
+            "soffice",
+            "--headless",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            str(temp_dir),
+            str(pptx_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError("PDF conversion failed")
+
+
 def create_grids(
     image_paths,
     cols,
@@ -278,44 +1014,61 @@ def create_grids(
     output_path,
     placeholder_regions=None,
     slide_dimensions=None,
+    slide_numbers=None,
+    formats=None,
+    jobs=DEFAULT_JOBS,
 ):
-    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid."""
+    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid.
+
+    slide_numbers gives the slide index of each image (default: 0, 1, 2, ...).
+    Each grid is saved once per entry in formats (default: the suffix of
+    output_path). Grids are assembled in parallel across `jobs` threads.
+    """
     # Maximum images per grid is cols × (cols + 1) for better proportions
     max_images_per_grid = cols * (cols + 1)
-    grid_files = []
+    formats = formats or [output_path.suffix.lstrip(".").lower()]
 
     print(
         f"Creating grids with {cols} columns (max {max_images_per_grid} images per grid)"
     )
 
-    # Split images into chunks
-    for chunk_idx, start_idx in enumerate(
-        range(0, len(image_paths), max_images_per_grid)
-    ):
+    def build_chunk(chunk_idx):
+        start_idx = chunk_idx * max_images_per_grid
         end_idx = min(start_idx + max_images_per_grid, len(image_paths))
         chunk_images = image_paths[start_idx:end_idx]
 
         # Create grid for this chunk
         grid = create_grid(
-            chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
+            chunk_images,
+            cols,
+            width,
+            start_idx,
+            placeholder_regions,
+            slide_dimensions,
+            slide_numbers[start_idx:end_idx] if slide_numbers else None,
         )
 
-        # Generate output filename
+        # Generate output filename (built as a string: the stem may contain dots)
         if len(image_paths) <= max_images_per_grid:
             # Single grid - use base filename without suffix
-            grid_filename = output_path
+            grid_stem = output_path.stem
         else:
             # Multiple grids - insert index before extension with dash
-            stem = output_path.stem
-            suffix = output_path.suffix
-            grid_filename = output_path.parent / f"{stem}-{chunk_idx + 1}{suffix}"
+            grid_stem = f"{output_path.stem}-{chunk_idx + 1}"
 
-        # Save grid
-        grid_filename.parent.mkdir(parents=True, exist_ok=True)
-        grid.save(str(grid_filename), quality=JPEG_QUALITY)
-        grid_files.append(str(grid_filename))
+        # Save grid in each requested format
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        chunk_files = []
+        for fmt in formats:
+            grid_filename = output_path.parent / f"{grid_stem}.{fmt}"
+            grid.save(str(grid_filename), **GRID_SAVE_OPTIONS[fmt])
+            chunk_files.append(str(grid_filename))
+        grid.close()
+        return chunk_files
 
-    return grid_files
+    chunk_count = -(-len(image_paths) // max_images_per_grid)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, chunk_count))) as pool:
+        return [f for files in pool.map(build_chunk, range(chunk_count)) for f in files]
 
 
 def create_grid(
@@ -325,8 +1078,18 @@ def create_grid(
     start_slide_num=0,
     placeholder_regions=None,
     slide_dimensions=None,
+    slide_numbers=None,
 ):
-    """Create thumbnail grid from slide images with optional placeholder outlining."""
+    """Create thumbnail grid from slide images with optional placeholder outlining.
+
+    Images are labelled with slide_numbers if given, otherwise consecutively
+    from start_slide_num. Each slide is downsampled while it is decoded and
+    outlined at thumbnail scale, so only one thumbnail-sized slide is held
+    in memory at a time.
+    """
+    if slide_numbers is None:
+        slide_numbers = range(start_slide_num, start_slide_num + len(image_paths))
+
     font_size = int(width * FONT_SIZE_RATIO)
     label_padding = int(font_size * LABEL_PADDING_RATIO)
 
@@ -353,7 +1116,7 @@ def create_grid(
         font = ImageFont.load_default()
 
     # Place thumbnails
-    for i, img_path in enumerate(image_paths):
+    for i, (img_path, slide_num) in enumerate(zip(image_paths, slide_numbers)):
         row, col = i // cols, i % cols
         x = col * width + (col + 1) * GRID_PADDING
         y_base = (
@@ -361,7 +1124,7 @@ def create_grid(
         )
 
         # Add label with actual slide number
-        label = f"{start_slide_num + i}"
+        label = f"{slide_num}"
         bbox = draw.textbbox((0, 0), label, font=font)
         text_w = bbox[2] - bbox[0]
         draw.text(
@@ -375,76 +1138,84 @@ def create_grid(
         y_thumbnail = y_base + label_padding + font_size + label_padding
 
         with Image.open(img_path) as img:
-            # Get original dimensions before thumbnail
+            # Get original dimensions before downsampling
             orig_w, orig_h = img.size
 
-            # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
-                # Convert to RGBA for transparency support
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get the regions for this slide
-                regions = placeholder_regions[start_slide_num + i]
-
-                # Calculate scale factors using actual slide dimensions
-                if slide_dimensions:
-                    slide_width_inches, slide_height_inches = slide_dimensions
-                else:
-                    # Fallback: estimate from image size at CONVERSION_DPI
-                    slide_width_inches = orig_w / CONVERSION_DPI
-                    slide_height_inches = orig_h / CONVERSION_DPI
-
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
-
-                # Create a highlight overlay
-                overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
-                # Highlight each placeholder region
-                for region in regions:
-                    # Convert from inches to pixels in the original image
-                    px_left = int(region["left"] * x_scale)
-                    px_top = int(region["top"] * y_scale)
-                    px_width = int(region["width"] * x_scale)
-                    px_height = int(region["height"] * y_scale)
-
-                    # Draw highlight outline with red color and thick stroke
-                    # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
-                    overlay_draw.rectangle(
-                        [(px_left, px_top), (px_left + px_width, px_top + px_height)],
-                        outline=(255, 0, 0, 255),  # Bright red, fully opaque
-                        width=stroke_width,
-                    )
+            # Let the JPEG decoder scale down by a power of two, then reduce
+            # in integer steps before the final LANCZOS pass
+            img.draft("RGB", (width, height))
+            img.thumbnail(
+                (width, height), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP
+            )
+            thumb = img.convert("RGB")
 
-                # Composite the overlay onto the image using alpha blending
-                img = Image.alpha_composite(img, overlay)
-                # Convert back to RGB for JPEG saving
-                img = img.convert("RGB")
-
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            w, h = img.size
-            tx = x + (width - w) // 2
-            ty = y_thumbnail + (height - h) // 2
-            grid.paste(img, (tx, ty))
-
-            # Add border
-            if BORDER_WIDTH > 0:
-                draw.rectangle(
-                    [
-                        (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
-                        (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
-                    ],
-                    outline="gray",
-                    width=BORDER_WIDTH,
-                )
+        # Apply placeholder outlines if enabled, at thumbnail scale
+        if placeholder_regions and slide_num in placeholder_regions:
+            draw_placeholder_outlines(
+                thumb,
+                placeholder_regions[slide_num],
+                slide_dimensions,
+                (orig_w, orig_h),
+            )
+
+        w, h = thumb.size
+        tx = x + (width - w) // 2
+        ty = y_thumbnail + (height - h) // 2
+        grid.paste(thumb, (tx, ty))
+        thumb.close()
+
+        # Add border
+        if BORDER_WIDTH > 0:
+            draw.rectangle(
+                [
+                    (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
+                    (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
+                ],
+                outline="gray",
+                width=BORDER_WIDTH,
+            )
 
     return grid
 
 
+def draw_placeholder_outlines(img, regions, slide_dimensions, source_size):
+    """Outline placeholder regions in red on a (downsampled) slide image.
+
+    source_size is the size of the rendered slide before downsampling; the
+    stroke is scaled from it so outlines look the same at any resolution.
+    """
+    orig_w, orig_h = source_size
+    w, h = img.size
+
+    # Calculate scale factors using actual slide dimensions
+    if slide_dimensions:
+        slide_width_inches, slide_height_inches = slide_dimensions
+    else:
+        # Fallback: estimate from image size at CONVERSION_DPI
+        slide_width_inches = orig_w / CONVERSION_DPI
+        slide_height_inches = orig_h / CONVERSION_DPI
+
+    x_scale = w / slide_width_inches
+    y_scale = h / slide_height_inches
+
+    # Thicker proportional stroke width, measured on the source image
+    stroke_width = max(1, round(max(5, min(orig_w, orig_h) // 150) * w / orig_w))
+
+    overlay_draw = ImageDraw.Draw(img)
+    for region in regions:
+        # Convert from inches to pixels in the thumbnail
+        px_left = int(region["left"] * x_scale)
+        px_top = int(region["top"] * y_scale)
+        px_width = int(region["width"] * x_scale)
+        px_height = int(region["height"] * y_scale)
+
+        # Draw highlight outline with bright red color instead of fill
+        overlay_draw.rectangle(
+            [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+            outline=(255, 0, 0),
+            width=stroke_width,
+        )
+
+
 if __name__ == "__main__":
     main()